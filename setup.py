@@ -13,5 +13,6 @@ setup(
         "pyarrow>=5.0.0",
         "seaborn>=0.11.0",
         "fonttools>=4.0.0",
+        "pillow>=9.1",
     ],
 )
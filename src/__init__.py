@@ -2,23 +2,56 @@
 plot_test 核心模块
 
 包含数据生成和绘图功能
+
+公开名称在首次访问时才导入对应子模块，`import src` 本身不会加载
+pandas、NumPy 和 matplotlib。
 """
 
-from .data import (
-    generate_customer_data,
-    generate_sales_data,
-    generate_time_series_data,
-    save_dataframe,
-)
-from .plot import PlotGenerator
+import importlib
 
 __version__ = "0.1.0"
 __author__ = "plot_test team"
 
-__all__ = [
-    "generate_time_series_data",
-    "generate_sales_data",
-    "generate_customer_data",
-    "save_dataframe",
-    "PlotGenerator",
-]
+# 公开名称 -> 所在子模块
+_LAZY_ATTRS = {
+    "generate_time_series_data": ".data",
+    "generate_sales_data": ".data",
+    "generate_customer_data": ".data",
+    "save_dataframe": ".data",
+    "iter_time_series_data": ".data",
+    "iter_sales_data": ".data",
+    "iter_customer_data": ".data",
+    "save_dataframe_batches": ".data",
+    "memory_report": ".data",
+    "format_customer_ids": ".data",
+    "load_dataframe": ".data",
+    "read_feather": ".data",
+    "PlotGenerator": ".plot",
+    "RenderResult": ".plot",
+    "RasterResult": ".plot",
+    "RenderProfile": ".plot",
+    "Base64Writer": ".encoding",
+    "RenderCache": ".render_cache",
+    "DatasetCache": ".dataset_cache",
+    "ParquetSink": ".writers",
+    "CsvSink": ".writers",
+    "JsonLinesSink": ".writers",
+    "ExcelSink": ".writers",
+    "FeatherSink": ".writers",
+    "render_batch": ".batch",
+    "BatchResult": ".batch",
+}
+
+__all__ = list(_LAZY_ATTRS)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRS:
+        value = getattr(importlib.import_module(_LAZY_ATTRS[name], __name__), name)
+        globals()[name] = value  # 之后的访问不再经过 __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
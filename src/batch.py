@@ -0,0 +1,189 @@
+"""
+批量渲染模块
+在进程池中并行渲染大量图表，每个工作进程启动时创建一次 PlotGenerator（完成字体查找），
+结果按完成顺序流式返回
+"""
+
+import os
+import traceback
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+try:
+    from .plot import PlotGenerator, RenderResult
+except ImportError:  # 作为脚本直接运行时
+    from plot import PlotGenerator, RenderResult
+
+# 每个工作进程最多同时排队的任务数，避免一次性把全部数据序列化到进程池
+TASKS_PER_WORKER = 4
+
+# 工作进程内的绘图生成器，由 _init_worker 创建
+_WORKER_GENERATOR: Optional[PlotGenerator] = None
+
+
+@dataclass(frozen=True)
+class BatchResult:
+    """
+    批量渲染中单个任务的结果
+
+    Attributes:
+        index: 任务在输入序列中的位置
+        spec: 任务描述
+        result: 渲染结果，失败时为 None
+        error: 失败时的异常信息（含 traceback），成功时为 None
+    """
+
+    index: int
+    spec: Dict
+    result: Optional[RenderResult] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        """是否渲染成功"""
+        return self.error is None
+
+
+def _init_worker(generator_kwargs: Dict):
+    """工作进程初始化：创建绘图生成器（字体只解析一次）"""
+    global _WORKER_GENERATOR
+    _WORKER_GENERATOR = PlotGenerator(use_pyplot=False, **generator_kwargs)
+
+
+def _render_spec(plotter: PlotGenerator, spec: Dict) -> Tuple[Optional[RenderResult], Optional[str]]:
+    """渲染单个任务，返回 (结果, 错误信息)，异常记录在错误信息中而不向外抛出"""
+    try:
+        result = plotter.render(
+            spec["chart_type"],
+            *spec.get("args", ()),
+            format=spec.get("format", "png"),
+            dpi=spec.get("dpi", 300),
+            bbox_inches=spec.get("bbox_inches", "tight"),
+            profile=spec.get("profile"),
+            **spec.get("kwargs", {}),
+        )
+    except Exception:  # pylint: disable=broad-except
+        return None, traceback.format_exc()
+    return result, None
+
+
+def _render_in_worker(index: int, spec: Dict) -> Tuple[int, Optional[RenderResult], Optional[str]]:
+    # 只返回下标和结果，任务描述（可能含大数据表）留在主进程，不再序列化回传
+    return (index, *_render_spec(_WORKER_GENERATOR, spec))
+
+
+def render_batch(
+    specs: Iterable[Dict],
+    workers: Optional[int] = None,
+    generator_kwargs: Optional[Dict] = None,
+    mp_context=None,
+) -> Iterator[BatchResult]:
+    """
+    批量渲染图表，按完成顺序逐个返回结果
+
+    每个任务是一个字典：
+        {"chart_type": "bar_chart", "args": (df,), "kwargs": {"x_col": "月份", ...},
+         "format": "png", "dpi": 300}
+    其中 args、kwargs、format（默认 'png'）、dpi（默认 300）、bbox_inches（默认 'tight'）可省略；
+    profile 为渲染配置名称（如 'web'），指定时替换 format 和 dpi。
+    单个任务出错不会中断整批，错误信息记录在对应 BatchResult.error 中。工作进程崩溃时
+    重建进程池，崩溃时已提交的任务逐个单独重试，仍使进程崩溃的任务记为失败。
+
+    Args:
+        specs: 任务序列（可以是惰性生成器）
+        workers: 工作进程数，默认 CPU 核数；1 表示在当前进程中顺序渲染
+        generator_kwargs: 创建 PlotGenerator 的参数（figsize、color_palette、style、rc_params 等）
+        mp_context: multiprocessing 上下文，默认使用平台默认的启动方式
+
+    Yields:
+        BatchResult，可通过 index 对应到输入顺序
+    """
+    generator_kwargs = dict(generator_kwargs or {})
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"不支持的工作进程数: {workers}")
+
+    if workers == 1:
+        plotter = PlotGenerator(use_pyplot=False, **generator_kwargs)
+        for index, spec in enumerate(specs):
+            result, error = _render_spec(plotter, spec)
+            yield BatchResult(index=index, spec=spec, result=result, error=error)
+        return
+
+    spec_iter = enumerate(specs)
+    max_pending = workers * TASKS_PER_WORKER
+    pending = {}
+    # 进程池崩溃时已提交的任务：无法确定是哪一个导致崩溃，之后逐个单独重试，
+    # 单独执行时仍使进程池崩溃的任务记为失败
+    suspects = deque()
+    isolating = None  # 正在单独重试的任务下标
+    # 提交时发现进程池已崩溃、尚未执行的任务，重建进程池后重新提交
+    requeued = deque()
+
+    def new_executor():
+        return ProcessPoolExecutor(
+            max_workers=workers, mp_context=mp_context, initializer=_init_worker, initargs=(generator_kwargs,)
+        )
+
+    def submit(executor, task) -> bool:
+        try:
+            pending[executor.submit(_render_in_worker, *task)] = task
+        except BrokenProcessPool:
+            return False
+        return True
+
+    executor = new_executor()
+    try:
+        while True:
+            broken = False
+            if suspects or isolating is not None:
+                if isolating is None:
+                    task = suspects.popleft()
+                    if submit(executor, task):
+                        isolating = task[0]
+                    else:
+                        suspects.appendleft(task)
+                        broken = True
+            else:
+                while len(pending) < max_pending:
+                    task = requeued.popleft() if requeued else next(spec_iter, None)
+                    if task is None:
+                        break
+                    if not submit(executor, task):
+                        requeued.appendleft(task)
+                        broken = True
+                        break
+
+            if pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, spec = task = pending.pop(future)
+                    try:
+                        _, result, error = future.result()
+                    except BrokenProcessPool:
+                        broken = True
+                        if index == isolating:
+                            yield BatchResult(index=index, spec=spec, error=traceback.format_exc())
+                        else:
+                            suspects.append(task)
+                    except Exception:  # 结果无法反序列化等  # pylint: disable=broad-except
+                        yield BatchResult(index=index, spec=spec, error=traceback.format_exc())
+                    else:
+                        yield BatchResult(index=index, spec=spec, result=result, error=error)
+                    if index == isolating:
+                        isolating = None
+            elif not broken:
+                break
+
+            if broken:
+                # 工作进程崩溃后进程池不可再用：未完成的任务转为待重试，重建进程池
+                suspects.extend(pending.values())
+                pending.clear()
+                executor.shutdown(wait=True)
+                executor = new_executor()
+    finally:
+        executor.shutdown(wait=True)
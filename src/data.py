@@ -4,168 +4,677 @@
 """
 
 import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import Optional
 
 import numpy as np
 import pandas as pd
 
+# 销售数据的品类与区域取值
+SALES_CATEGORIES = np.array(["Electronics", "Clothing", "Books", "Home"], dtype=object)
+SALES_REGIONS = np.array(["North", "South", "East", "West"], dtype=object)
 
-def generate_time_series_data(start_date="2024-01-01", days=365, freq="D"):
+# 时间序列与客户数据的分类取值
+SERIES_CATEGORIES = np.array(["A", "B", "C"], dtype=object)
+REGIONS = SALES_REGIONS
+GENDERS = np.array(["M", "F"], dtype=object)
+CITIES = np.array(["Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Hangzhou"], dtype=object)
+
+# 客户编号格式与默认注册日期窗口
+CUSTOMER_ID_PREFIX = "CUST_"
+CUSTOMER_ID_WIDTH = 6
+CUSTOMER_ID_FORMATS = ("str", "int")
+REGISTRATION_START = "2020-01-01"
+REGISTRATION_END = "2024-12-31"
+
+# 分批生成时每批的默认行数
+DEFAULT_BATCH_ROWS = 100_000
+
+# 内部块大小：每块使用由 (根种子, 块序号) 派生的独立随机流，
+# 因此结果只取决于种子，与 batch_rows 和并行进程数无关
+DATA_BLOCK_ROWS = 65_536
+
+# read_feather 估计字符串列基数时的抽样行数
+STRING_SAMPLE_ROWS = 10_000
+
+
+def _root_entropy(seed=None, rng: Optional[np.random.Generator] = None) -> int:
     """
-    生成时间序列数据
+    确定根随机种子
 
     Args:
-        start_date: 开始日期
-        days: 数据天数
-        freq: 频率 ('D'=日, 'H'=小时, 'W'=周)
+        seed: 整数种子；为 None 且未提供 rng 时使用操作系统熵
+        rng: numpy.random.Generator，提供时从中抽取根种子（会推进其状态）
 
     Returns:
-        pd.DataFrame: 包含时间序列的 DataFrame
+        根种子（SeedSequence 的 entropy）
+    """
+    if rng is not None:
+        return int(rng.integers(0, 2**63))
+    if seed is None:
+        return np.random.SeedSequence().entropy
+    return seed
+
+
+def _block_rng(entropy: int, block: int) -> np.random.Generator:
+    """第 block 块的随机数生成器（等价于 SeedSequence(entropy).spawn 的第 block 个子序列）"""
+    return np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(block,)))
+
+
+def _block_bounds(n_rows: int):
+    """按内部块大小切分行区间，返回 [(块序号, 起始行, 结束行)]"""
+    return [
+        (block, start, min(start + DATA_BLOCK_ROWS, n_rows))
+        for block, start in enumerate(range(0, n_rows, DATA_BLOCK_ROWS))
+    ]
+
+
+def _make_blocks(make_block, bounds) -> pd.DataFrame:
+    """在当前进程中生成若干连续块并拼接（也是并行模式下每个任务的执行体）"""
+    blocks = [make_block(block, start, stop) for block, start, stop in bounds]
+    return pd.concat(blocks, ignore_index=True) if len(blocks) > 1 else blocks[0]
+
+
+def _generate_frame(n_rows: int, make_block, workers: Optional[int] = 1) -> pd.DataFrame:
     """
-    # 创建时间索引
-    date_range = pd.date_range(start=start_date, periods=days, freq=freq)
+    生成完整 DataFrame
 
-    # 生成模拟数据
-    np.random.seed(42)
-    n_points = len(date_range)
+    每个内部块只依赖根种子和块序号，按块分发到多个进程后按顺序拼接，
+    结果与工作进程数无关。
 
-    # 基础趋势
-    trend = np.linspace(100, 200, n_points)
+    Args:
+        n_rows: 总行数
+        make_block: 可 pickle 的函数 (块序号, 起始行, 结束行) -> DataFrame
+        workers: 工作进程数，None 表示 CPU 核数，1 表示在当前进程中生成
+    """
+    bounds = _block_bounds(n_rows)
+    if not bounds:
+        return make_block(0, 0, 0)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError(f"不支持的工作进程数: {workers}")
+    workers = min(workers, len(bounds))
+    if workers == 1:
+        return _make_blocks(make_block, bounds)
+
+    # 每个任务包含若干连续块，任务数为进程数的数倍以平衡负载
+    n_tasks = min(len(bounds), workers * 4)
+    tasks = [list(chunk) for chunk in np.array_split(np.arange(len(bounds)), n_tasks)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        frames = list(executor.map(_make_blocks, [make_block] * n_tasks, [[bounds[i] for i in task] for task in tasks]))
+    return pd.concat(frames, ignore_index=True)
+
+
+def _iter_blocks(n_rows: int, batch_rows: int, make_block):
+    """
+    按固定内部块生成数据，再切分为 batch_rows 行一批
+
+    Args:
+        n_rows: 总行数
+        batch_rows: 每批行数
+        make_block: 函数 (块序号, 起始行, 结束行) -> DataFrame
+
+    Yields:
+        pd.DataFrame: 每批数据（最后一批可能不足 batch_rows 行）
+    """
+    if batch_rows < 1:
+        raise ValueError(f"不支持的批大小: {batch_rows}")
+    pending = []
+    pending_rows = 0
+    for block, start, stop in _block_bounds(n_rows):
+        pending.append(make_block(block, start, stop))
+        pending_rows += len(pending[-1])
+        if pending_rows < batch_rows:
+            continue
+        buffer = pd.concat(pending, ignore_index=True) if len(pending) > 1 else pending[0]
+        n_full = len(buffer) // batch_rows * batch_rows
+        for offset in range(0, n_full, batch_rows):
+            yield buffer.iloc[offset : offset + batch_rows].reset_index(drop=True)
+        pending = [buffer.iloc[n_full:]] if n_full < len(buffer) else []
+        pending_rows = len(buffer) - n_full
+    if pending_rows:
+        yield pd.concat(pending, ignore_index=True)
+
+
+@lru_cache(maxsize=16)
+def _categorical_dtype(values: tuple) -> pd.CategoricalDtype:
+    """取值固定的分类类型（各块共用同一个 dtype 对象，拼接后仍为分类列）"""
+    return pd.CategoricalDtype(list(values))
+
+
+@lru_cache(maxsize=4)
+def _product_dtype(products: int) -> pd.CategoricalDtype:
+    """产品名的分类类型"""
+    return pd.CategoricalDtype([f"Product_{i:03d}" for i in range(1, products + 1)])
+
+
+def _choice_column(values: np.ndarray, codes: np.ndarray, compact: bool):
+    """按随机下标取值：普通模式为 object 字符串数组，紧凑模式直接由下标构造 Categorical"""
+    if compact:
+        return pd.Categorical.from_codes(codes, dtype=_categorical_dtype(tuple(values)))
+    return values[codes]
+
+
+def _time_series_block(block, start, stop, entropy, start_date, days, freq, compact=False):
+    """生成时间序列数据的第 block 块（行 [start, stop)）"""
+    rng = _block_rng(entropy, block)
+    offset = pd.tseries.frequencies.to_offset(freq)
+    origin = pd.date_range(start=start_date, periods=1, freq=offset)[0]
+    n_points = stop - start
+    position = np.arange(start, stop)
+
+    # 基础趋势（100 到 200 线性增长）
+    trend = 100 + (100 / (days - 1) if days > 1 else 0.0) * position
 
     # 季节性模式
-    seasonal = 20 * np.sin(2 * np.pi * np.arange(n_points) / 365.25)
+    seasonal = 20 * np.sin(2 * np.pi * position / 365.25)
 
     # 随机噪声
-    noise = np.random.normal(0, 10, n_points)
+    noise = rng.normal(0, 10, n_points)
+
+    return pd.DataFrame(
+        {
+            "date": pd.date_range(start=origin + start * offset, periods=n_points, freq=offset),
+            "value": (trend + seasonal + noise).astype(np.float32 if compact else np.float64),
+            "category": _choice_column(SERIES_CATEGORIES, rng.integers(0, len(SERIES_CATEGORIES), n_points), compact),
+            "region": _choice_column(REGIONS, rng.integers(0, len(REGIONS), n_points), compact),
+        }
+    )
+
+
+def _sales_block(block, start, stop, entropy, products, months, compact=False):
+    """生成销售数据的第 block 块（产品 × 月份网格中的行 [start, stop)）"""
+    rng = _block_rng(entropy, block)
+    months_list = pd.date_range("2024-01-01", periods=months, freq="M")
+    n_rows = stop - start
+    product_idx, month_idx = np.divmod(np.arange(start, stop), months)
+
+    # 基础销量
+    base_sales = rng.integers(50, 500, n_rows)
 
-    # 组合数据
-    values = trend + seasonal + noise
+    # 季节性调整
+    seasonal_factor = (1 + 0.3 * np.sin(2 * np.pi * months_list.month.to_numpy() / 12))[month_idx]
 
-    # 创建 DataFrame
-    df = pd.DataFrame(
+    # 随机波动
+    random_factor = rng.uniform(0.7, 1.3, n_rows)
+
+    sales = (base_sales * seasonal_factor * random_factor).astype(np.int64)
+    price = rng.uniform(10, 100, n_rows)
+    revenue = np.round(sales * price, 2)
+    price = np.round(price, 2)
+
+    if compact:
+        # 销量不超过 500×1.3×1.3，价格与金额在 float32 精度内保留两位小数
+        product = pd.Categorical.from_codes(product_idx, dtype=_product_dtype(products))
+        sales, price, revenue = sales.astype(np.int32), price.astype(np.float32), revenue.astype(np.float32)
+    else:
+        product = pd.Index(product_idx + 1).map("Product_{:03d}".format).to_numpy(dtype=object)
+
+    return pd.DataFrame(
         {
-            "date": date_range,
-            "value": values,
-            "category": np.random.choice(["A", "B", "C"], n_points),
-            "region": np.random.choice(["North", "South", "East", "West"], n_points),
+            "product": product,
+            "month": months_list.to_numpy()[month_idx],
+            "sales": sales,
+            "price": price,
+            "revenue": revenue,
+            "category": _choice_column(SALES_CATEGORIES, rng.integers(0, len(SALES_CATEGORIES), n_rows), compact),
+            "region": _choice_column(SALES_REGIONS, rng.integers(0, len(SALES_REGIONS), n_rows), compact),
         }
     )
 
-    return df
+
+def format_customer_ids(ids) -> np.ndarray:
+    """
+    将整数客户编号格式化为 "CUST_000001" 形式的字符串
+
+    使用 pyarrow 的向量化字符串函数，id_format="int" 时可在需要展示或导出时再调用。
+
+    Args:
+        ids: 整数客户编号数组
+
+    Returns:
+        np.ndarray: object 类型的字符串数组
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    digits = pc.utf8_lpad(pc.cast(pa.array(np.asarray(ids, dtype=np.int64)), pa.string()), CUSTOMER_ID_WIDTH, "0")
+    return pc.binary_join_element_wise(CUSTOMER_ID_PREFIX, digits, "").to_numpy(zero_copy_only=False)
+
+
+def _customer_block(block, start, stop, entropy, compact=False, id_format="str", registration_window=None):
+    """生成客户数据的第 block 块（客户 [start, stop)）"""
+    rng = _block_rng(entropy, block)
+    n_rows = stop - start
+    age = rng.integers(18, 80, n_rows)
+    # 收入的长尾可达数十万，float32 无法精确保留两位小数，紧凑模式下仍用 float64
+    income = np.round(rng.lognormal(10, 0.5, n_rows), 2)
+    purchase_count = rng.poisson(5, n_rows)
+    if compact:
+        age, purchase_count = age.astype(np.int8), purchase_count.astype(np.int32)
+    gender = _choice_column(GENDERS, rng.integers(0, len(GENDERS), n_rows), compact)
+    city = _choice_column(CITIES, rng.integers(0, len(CITIES), n_rows), compact)
+
+    # 注册日期在窗口内按天均匀随机
+    first_day, n_days = registration_window
+    registration_date = (first_day + rng.integers(0, n_days, n_rows).astype("timedelta64[D]")).astype("datetime64[ns]")
+
+    ids = np.arange(start + 1, stop + 1, dtype=np.int64)
+    return pd.DataFrame(
+        {
+            "customer_id": format_customer_ids(ids) if id_format == "str" else ids,
+            "age": age,
+            "income": income,
+            "purchase_count": purchase_count,
+            "gender": gender,
+            "city": city,
+            "registration_date": registration_date,
+        }
+    )
+
+
+def _customer_block_factory(seed, rng, compact, id_format, registration_start, registration_end):
+    """校验客户数据参数并返回可 pickle 的块生成函数"""
+    if id_format not in CUSTOMER_ID_FORMATS:
+        raise ValueError(f"不支持的客户编号格式: {id_format}，可选: {CUSTOMER_ID_FORMATS}")
+    first_day = np.datetime64(pd.Timestamp(registration_start).date(), "D")
+    last_day = np.datetime64(pd.Timestamp(registration_end).date(), "D")
+    if last_day < first_day:
+        raise ValueError(f"注册日期窗口无效: {registration_start} ~ {registration_end}")
+    n_days = int((last_day - first_day).astype(np.int64)) + 1
+    return partial(
+        _customer_block,
+        entropy=_root_entropy(seed, rng),
+        compact=compact,
+        id_format=id_format,
+        registration_window=(first_day, n_days),
+    )
+
+
+def generate_time_series_data(start_date="2024-01-01", days=365, freq="D", seed=42, rng=None, workers=1, compact=False):
+    """
+    生成时间序列数据
+
+    Args:
+        start_date: 开始日期
+        days: 数据天数
+        freq: 频率 ('D'=日, 'H'=小时, 'W'=周)
+        seed: 随机种子，None 表示每次不同
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        workers: 工作进程数，None 表示 CPU 核数；结果与进程数无关
+        compact: 紧凑模式，低基数字符串列用 Categorical，数值列按取值范围降为 int32/float32 等
+
+    Returns:
+        pd.DataFrame: 包含时间序列的 DataFrame
+    """
+    make_block = partial(
+        _time_series_block,
+        entropy=_root_entropy(seed, rng),
+        start_date=start_date,
+        days=days,
+        freq=freq,
+        compact=compact,
+    )
+    return _generate_frame(days, make_block, workers)
 
 
-def generate_sales_data(products=50, months=12):
+def generate_sales_data(products=50, months=12, seed=42, rng=None, workers=1, compact=False):
     """
     生成销售数据
 
+    在产品 × 月份网格上按块生成，行顺序为按产品、再按月份。
+
     Args:
         products: 产品数量
         months: 月份数量
+        seed: 随机种子，None 表示每次不同
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        workers: 工作进程数，None 表示 CPU 核数；结果与进程数无关
+        compact: 紧凑模式，低基数字符串列用 Categorical，数值列按取值范围降为 int32/float32 等
 
     Returns:
         pd.DataFrame: 销售数据 DataFrame
     """
-    np.random.seed(42)
+    make_block = partial(
+        _sales_block, entropy=_root_entropy(seed, rng), products=products, months=months, compact=compact
+    )
+    return _generate_frame(products * months, make_block, workers)
+
+
+def generate_customer_data(
+    customers=1000,
+    seed=42,
+    rng=None,
+    workers=1,
+    compact=False,
+    id_format="str",
+    registration_start=REGISTRATION_START,
+    registration_end=REGISTRATION_END,
+):
+    """
+    生成客户数据
 
-    # 生成产品列表
-    products_list = [f"Product_{i:03d}" for i in range(1, products + 1)]
+    Args:
+        customers: 客户数量
+        seed: 随机种子，None 表示每次不同
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        workers: 工作进程数，None 表示 CPU 核数；结果与进程数无关
+        compact: 紧凑模式，低基数字符串列用 Categorical，数值列按取值范围降为 int32/float32 等
+        id_format: 客户编号格式，'str' 为 "CUST_000001" 字符串，'int' 为 int64 编号
+            （需要时再用 format_customer_ids 格式化）
+        registration_start: 注册日期窗口起点
+        registration_end: 注册日期窗口终点（含）
 
-    # 生成月份列表
-    months_list = pd.date_range("2024-01-01", periods=months, freq="M")
+    Returns:
+        pd.DataFrame: 客户数据 DataFrame
+    """
+    make_block = _customer_block_factory(seed, rng, compact, id_format, registration_start, registration_end)
+    return _generate_frame(customers, make_block, workers)
 
-    data = []
-    for product in products_list:
-        for month in months_list:
-            # 基础销量（不同产品有不同的基础销量）
-            base_sales = np.random.randint(50, 500)
 
-            # 季节性调整
-            seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * month.month / 12)
+def iter_time_series_data(
+    start_date="2024-01-01", days=365, freq="D", batch_rows=DEFAULT_BATCH_ROWS, seed=42, rng=None, compact=False
+):
+    """
+    分批生成时间序列数据，内存占用与总行数无关
 
-            # 随机波动
-            random_factor = np.random.uniform(0.7, 1.3)
+    与相同种子的 generate_time_series_data 逐行一致。
 
-            sales = int(base_sales * seasonal_factor * random_factor)
-            price = np.random.uniform(10, 100)
-            revenue = sales * price
+    Args:
+        start_date: 开始日期
+        days: 数据点数
+        freq: 频率 ('D'=日, 'H'=小时, 'W'=周)
+        batch_rows: 每批行数
+        seed: 随机种子，相同种子的输出完全一致（与 batch_rows 无关）
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        compact: 紧凑模式，与一次性生成函数的 compact 相同
+
+    Yields:
+        pd.DataFrame: 每批数据
+    """
+    make_block = partial(
+        _time_series_block,
+        entropy=_root_entropy(seed, rng),
+        start_date=start_date,
+        days=days,
+        freq=freq,
+        compact=compact,
+    )
+    return _iter_blocks(days, batch_rows, make_block)
 
-            data.append(
-                {
-                    "product": product,
-                    "month": month,
-                    "sales": sales,
-                    "price": round(price, 2),
-                    "revenue": round(revenue, 2),
-                    "category": np.random.choice(["Electronics", "Clothing", "Books", "Home"]),
-                    "region": np.random.choice(["North", "South", "East", "West"]),
-                }
-            )
 
-    return pd.DataFrame(data)
+def iter_sales_data(products=50, months=12, batch_rows=DEFAULT_BATCH_ROWS, seed=42, rng=None, compact=False):
+    """
+    分批生成销售数据，内存占用与总行数无关
+
+    与相同种子的 generate_sales_data 逐行一致。
 
+    Args:
+        products: 产品数量
+        months: 月份数量
+        batch_rows: 每批行数
+        seed: 随机种子，相同种子的输出完全一致（与 batch_rows 无关）
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        compact: 紧凑模式，与一次性生成函数的 compact 相同
 
-def generate_customer_data(customers=1000):
+    Yields:
+        pd.DataFrame: 每批数据
     """
-    生成客户数据
+    make_block = partial(
+        _sales_block, entropy=_root_entropy(seed, rng), products=products, months=months, compact=compact
+    )
+    return _iter_blocks(products * months, batch_rows, make_block)
+
+
+def iter_customer_data(
+    customers=1000,
+    batch_rows=DEFAULT_BATCH_ROWS,
+    seed=42,
+    rng=None,
+    compact=False,
+    id_format="str",
+    registration_start=REGISTRATION_START,
+    registration_end=REGISTRATION_END,
+):
+    """
+    分批生成客户数据，内存占用与总行数无关
+
+    与相同种子的 generate_customer_data 逐行一致。
 
     Args:
         customers: 客户数量
-
-    Returns:
-        pd.DataFrame: 客户数据 DataFrame
+        batch_rows: 每批行数
+        seed: 随机种子，相同种子的输出完全一致（与 batch_rows 无关）
+        rng: numpy.random.Generator，提供时从中派生随机流（优先于 seed）
+        compact: 紧凑模式，与一次性生成函数的 compact 相同
+        id_format: 客户编号格式，'str' 或 'int'
+        registration_start: 注册日期窗口起点
+        registration_end: 注册日期窗口终点（含）
+
+    Yields:
+        pd.DataFrame: 每批数据
     """
-    np.random.seed(42)
+    make_block = _customer_block_factory(seed, rng, compact, id_format, registration_start, registration_end)
+    return _iter_blocks(customers, batch_rows, make_block)
 
-    # 生成客户ID
-    customer_ids = [f"CUST_{i:06d}" for i in range(1, customers + 1)]
 
-    # 生成随机数据
-    ages = np.random.randint(18, 80, customers)
-    incomes = np.random.lognormal(10, 0.5, customers)
-    purchase_counts = np.random.poisson(5, customers)
+def memory_report(original: pd.DataFrame, compact: pd.DataFrame) -> pd.DataFrame:
+    """
+    对比两份数据的逐列内存占用（memory_usage(deep=True)）
+
+    Args:
+        original: 原始 DataFrame
+        compact: 紧凑类型的 DataFrame
 
-    # 创建 DataFrame
-    df = pd.DataFrame(
+    Returns:
+        pd.DataFrame: 每列的原始/紧凑类型与字节数、压缩比，最后一行为合计
+    """
+    before = original.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    report = pd.DataFrame(
         {
-            "customer_id": customer_ids,
-            "age": ages,
-            "income": np.round(incomes, 2),
-            "purchase_count": purchase_counts,
-            "gender": np.random.choice(["M", "F"], customers),
-            "city": np.random.choice(["Beijing", "Shanghai", "Guangzhou", "Shenzhen", "Hangzhou"], customers),
-            "registration_date": pd.date_range("2020-01-01", periods=customers, freq="D")[:customers],
+            "original_dtype": original.dtypes.astype(str),
+            "compact_dtype": compact.dtypes.astype(str),
+            "original_bytes": before,
+            "compact_bytes": after,
         }
     )
+    report.loc["total"] = ["", "", before.sum(), after.sum()]
+    report["ratio"] = report["original_bytes"] / report["compact_bytes"]
+    return report
 
-    return df
 
-
-def save_dataframe(df, filename, format="csv"):
+def _open_sink(filename, format, writer_options):
     """
-    保存 DataFrame 到文件
+    创建 format 对应的流式写入器，文件保存在 data/ 目录下
 
-    Args:
-        df: 要保存的 DataFrame
-        filename: 文件名（不含扩展名）
-        format: 保存格式 ('csv', 'excel', 'parquet', 'json')
+    excel 保存为 .xlsx；csv、jsonl 指定 compression 时文件名追加 .gz / .zst 后缀
     """
+    try:
+        from .writers import TEXT_COMPRESSION_SUFFIXES, CsvSink, ExcelSink, FeatherSink, JsonLinesSink, ParquetSink
+    except ImportError:  # 作为脚本直接运行时
+        from writers import TEXT_COMPRESSION_SUFFIXES, CsvSink, ExcelSink, FeatherSink, JsonLinesSink, ParquetSink
+
     # 确保 data 目录存在
     os.makedirs("data", exist_ok=True)
 
     filepath = f"data/{filename}.{format}"
-
-    if format == "csv":
-        df.to_csv(filepath, index=False, encoding="utf-8-sig")
+    if format == "parquet":
+        sink_class = ParquetSink
+    elif format == "feather":
+        sink_class = FeatherSink
     elif format == "excel":
-        df.to_excel(filepath, index=False)
-    elif format == "parquet":
-        df.to_parquet(filepath, index=False)
+        sink_class = ExcelSink
+        filepath = f"data/{filename}.xlsx"
+    else:
+        sink_class = CsvSink if format == "csv" else JsonLinesSink
+        filepath += TEXT_COMPRESSION_SUFFIXES.get(writer_options.get("compression", "none"), "")
+    try:
+        return sink_class(filepath, **writer_options)
+    except TypeError as e:
+        raise ValueError(f"{format} 格式不支持参数: {sorted(writer_options)}") from e
+
+
+def save_dataframe(df, filename, format="csv", **writer_options):
+    """
+    保存 DataFrame 到文件
+
+    Args:
+        df: 要保存的 DataFrame
+        filename: 文件名（不含扩展名）
+        format: 保存格式 ('csv', 'excel', 'parquet', 'feather', 'json', 'jsonl')，excel 保存为 .xlsx，
+            feather 为可内存映射读取的 Arrow IPC 文件（见 load_dataframe），
+            json 为 records 数组，jsonl 为每行一条记录的 JSON Lines
+        **writer_options: 传给写入器的参数，json 格式不支持。csv、parquet 不指定参数时
+            直接使用 pandas 的 to_csv / to_parquet 输出，指定参数时使用流式写入器。
+            parquet 见 ParquetSink（partition_cols、row_group_size、compression、
+            compression_level、max_workers、max_pending_bytes）；feather 见 FeatherSink（compression 为
+            'lz4' 或 'zstd'、compression_level）；csv、jsonl 见 CsvSink / JsonLinesSink
+            （compression 为 'gzip' 或 'zstd'、compression_level、chunk_rows、max_workers）；
+            excel 见 ExcelSink（sheet_name、max_rows，超过 max_rows 行自动拆分工作表）
+
+    Returns:
+        保存的文件路径
+    """
+    if format in ("csv", "excel", "parquet", "feather", "jsonl"):
+        if format == "csv" and not writer_options:
+            os.makedirs("data", exist_ok=True)
+            filepath = f"data/{filename}.csv"
+            df.to_csv(filepath, index=False, encoding="utf-8-sig")
+        elif format == "parquet" and not writer_options:
+            os.makedirs("data", exist_ok=True)
+            filepath = f"data/{filename}.parquet"
+            df.to_parquet(filepath, index=False)
+        else:
+            with _open_sink(filename, format, writer_options) as sink:
+                sink.write(df)
+            filepath = sink.path
     elif format == "json":
+        if writer_options:
+            raise ValueError(f"{format} 格式不支持参数: {sorted(writer_options)}")
+        os.makedirs("data", exist_ok=True)
+        filepath = f"data/{filename}.json"
         df.to_json(filepath, orient="records", date_format="iso")
     else:
         raise ValueError(f"不支持的格式: {format}")
 
     print(f"数据已保存到: {filepath}")
     print(f"数据形状: {df.shape}")
+    return filepath
+
+
+def save_dataframe_batches(batches, filename, format="csv", **writer_options):
+    """
+    流式保存分批数据到文件，同一时间只在内存中保留一批
+
+    Args:
+        batches: DataFrame 可迭代对象（如 iter_sales_data 的返回值）
+        filename: 文件名（不含扩展名）
+        format: 保存格式 ('csv', 'excel', 'parquet', 'feather', 'jsonl')，jsonl 为每行一条记录的 JSON Lines；
+            不支持 save_dataframe 的 json（records 数组）格式
+        **writer_options: 传给写入器的参数，见 save_dataframe（csv 不指定参数时同样使用 pandas 输出）；
+            parquet 指定 partition_cols
+            时输出为 hive 风格分区目录
+
+    Returns:
+        保存的文件（或分区目录）路径
+    """
+    if format == "json":
+        raise ValueError("分批保存不支持 json（records 数组）格式，请使用 jsonl")
+    if format not in ("csv", "excel", "parquet", "feather", "jsonl"):
+        raise ValueError(f"不支持的格式: {format}")
+
+    n_rows = 0
+    n_cols = 0
+    if format == "csv" and not writer_options:
+        # 与 save_dataframe 一致，不指定参数时使用 pandas 输出
+        os.makedirs("data", exist_ok=True)
+        filepath = f"data/{filename}.csv"
+        # 文件只打开一次，utf-8-sig 的 BOM 和 CSV 表头都只写一次
+        with open(filepath, "w", encoding="utf-8-sig", newline="") as f:
+            for batch in batches:
+                batch.to_csv(f, index=False, header=n_rows == 0)
+                n_rows += len(batch)
+                n_cols = batch.shape[1]
+    else:
+        with _open_sink(filename, format, writer_options) as sink:
+            for batch in batches:
+                sink.write(batch)
+                n_rows += len(batch)
+                n_cols = batch.shape[1]
+        filepath = sink.path
+
+    print(f"数据已保存到: {filepath}")
+    print(f"数据形状: {(n_rows, n_cols)}")
+    return filepath
+
+
+def read_feather(path, columns=None, memory_map=True) -> pd.DataFrame:
+    """
+    读取 Feather（Arrow IPC）文件
+
+    内存映射时无缺失值的数值列和时间列零拷贝。字符串列按基数选择转换方式：
+    低基数列去重后共享字符串对象，几乎各不相同的列（如客户编号）跳过去重，
+    省去逐个哈希的开销。
+
+    Args:
+        path: 文件路径
+        columns: 要读取的列名列表，None 表示全部列
+        memory_map: 是否内存映射
+
+    Returns:
+        DataFrame
+    """
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+    source = pa.memory_map(path) if memory_map else pa.OSFile(path)
+    table = pa.ipc.open_file(source).read_all()
+    if columns is not None:
+        table = table.select(columns)
+
+    # 按开头的连续样本估计：样本中大多数取值各不相同时认为是高基数列
+    n_sample = min(table.num_rows, STRING_SAMPLE_ROWS)
+    unique = [
+        name
+        for name, column in zip(table.column_names, table.columns)
+        if pa.types.is_string(column.type) and pc.count_distinct(column.slice(0, n_sample)).as_py() > n_sample // 2
+    ]
+    # split_blocks 避免合并为二维块时的拷贝，数值列保持零拷贝
+    df = table.select([name for name in table.column_names if name not in unique]).to_pandas(split_blocks=True)
+    for name in unique:
+        values = table.column(name).to_pandas(deduplicate_objects=False).to_numpy()
+        df.insert(table.column_names.index(name), name, values)
+    return df
+
+
+def load_dataframe(filename, format="feather", columns=None, memory_map=True):
+    """
+    读取 save_dataframe 保存在 data/ 目录下的文件
+
+    feather 格式通过内存映射读取，只转换 columns 中的列；无缺失值的数值列和时间列
+    直接引用映射的文件内容（零拷贝、只读），打开大文件几乎不耗时，数据在真正
+    访问时才读入内存，可直接传给 PlotGenerator.line_chart / bar_chart。
+
+    Args:
+        filename: 文件名（不含扩展名）
+        format: 文件格式 ('feather', 'parquet', 'csv')
+        columns: 要读取的列名列表，None 表示全部列
+        memory_map: feather 格式是否内存映射（压缩的文件仍需解压到内存）
+
+    Returns:
+        DataFrame
+    """
+    filepath = f"data/{filename}.{format}"
+    if format == "feather":
+        return read_feather(filepath, columns, memory_map)
+    if format == "parquet":
+        return pd.read_parquet(filepath, columns=columns)
+    if format == "csv":
+        return pd.read_csv(filepath, usecols=columns)
+    raise ValueError(f"不支持的格式: {format}")
 
 
 def main():
@@ -0,0 +1,207 @@
+"""
+数据集缓存模块
+按生成函数、参数、种子与库版本缓存生成的 DataFrame，以 Feather 文件保存在磁盘上，
+命中时内存映射读取，按磁盘总大小淘汰最久未访问的条目
+"""
+
+import hashlib
+import inspect
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+try:
+    from .data import read_feather
+    from .writers import FeatherSink
+except ImportError:  # 作为脚本直接运行时
+    from data import read_feather
+    from writers import FeatherSink
+
+# 缓存目录的环境变量，未设置时使用 ~/.cache/plot_test/datasets
+DATASET_CACHE_DIR_ENV = "PLOT_TEST_DATASET_CACHE_DIR"
+
+DEFAULT_DATASET_CACHE_BYTES = 4 * 1024 * 1024 * 1024
+
+# 不影响生成结果、不参与缓存键的参数（输出与进程数无关）
+IGNORED_ARGS = ("workers",)
+
+
+def dataset_cache_dir() -> str:
+    """获取数据集缓存的默认目录"""
+    if os.environ.get(DATASET_CACHE_DIR_ENV):
+        return os.environ[DATASET_CACHE_DIR_ENV]
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "plot_test", "datasets")
+
+
+def _code_version(generator: Callable) -> str:
+    """生成函数所在模块源文件的哈希，代码修改后旧缓存自动失效"""
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(inspect.getsourcefile(generator), "rb") as f:
+            digest.update(f.read())
+    except (OSError, TypeError):
+        digest.update(getattr(generator, "__qualname__", repr(generator)).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def make_dataset_key(generator: Callable, arguments: Dict) -> str:
+    """
+    由生成函数、参数与库版本生成缓存键
+
+    Args:
+        generator: 生成函数
+        arguments: 绑定并补全默认值后的参数字典
+
+    Returns:
+        十六进制缓存键
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(f"{generator.__module__}.{generator.__qualname__}".encode())
+    digest.update(f"{np.__version__}|{pd.__version__}|{pa.__version__}|{_code_version(generator)}".encode())
+    params = {name: value for name, value in arguments.items() if name not in IGNORED_ARGS}
+    digest.update(repr(sorted(params.items(), key=lambda item: item[0])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class DatasetCache:
+    """
+    生成数据集的磁盘缓存
+
+    用法:
+        cache = DatasetCache()
+        df = cache.get_or_generate(generate_sales_data, products=100_000, months=36, compact=True)
+
+    seed=None 或传入 rng 时结果不可复现，直接生成、不缓存（计入 bypasses）。
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_DATASET_CACHE_BYTES):
+        """
+        初始化数据集缓存
+
+        Args:
+            cache_dir: 缓存目录，None 表示使用 dataset_cache_dir()
+            max_bytes: 磁盘缓存的字节上限
+        """
+        self.cache_dir = cache_dir or dataset_cache_dir()
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "bypasses": 0, "evictions": 0}
+        self._index = OrderedDict()  # 键 -> 文件大小，按访问时间排序
+        self._bytes = 0
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.feather")
+
+    def _load_index(self):
+        """扫描缓存目录，按修改时间重建 LRU 顺序"""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith(".feather"):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, name[: -len(".feather")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def get_or_generate(self, generator: Callable, *args, **kwargs) -> pd.DataFrame:
+        """
+        读取缓存的数据集，未命中时调用生成函数并写入缓存
+
+        Args:
+            generator: 生成函数（如 generate_sales_data）
+            *args, **kwargs: 传给生成函数的参数
+
+        Returns:
+            DataFrame；命中时数值列为内存映射的只读数组
+        """
+        bound = inspect.signature(generator).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = bound.arguments
+        if arguments.get("rng") is not None or ("seed" in arguments and arguments["seed"] is None):
+            with self._lock:
+                self._stats["bypasses"] += 1
+            return generator(*args, **kwargs)
+
+        key = make_dataset_key(generator, arguments)
+        path = self._path(key)
+        try:
+            df = read_feather(path)
+        except (OSError, pa.ArrowInvalid):
+            pass
+        else:
+            os.utime(path)
+            with self._lock:
+                self._stats["hits"] += 1
+                if key in self._index:
+                    self._index.move_to_end(key)
+                else:
+                    # 其他进程写入的条目
+                    self._index[key] = os.path.getsize(path)
+                    self._bytes += self._index[key]
+            return df
+
+        df = generator(*args, **kwargs)
+        with self._lock:
+            self._stats["misses"] += 1
+            self._put(key, df)
+        return df
+
+    def _put(self, key: str, df: pd.DataFrame):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with FeatherSink(tmp_path) as sink:
+                sink.write(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # 含 Arrow 无法表示的列（如混合类型的 object 列），不缓存
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        if key in self._index:
+            self._bytes -= self._index.pop(key)
+        self._index[key] = size
+        self._bytes += size
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self._stats["evictions"] += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """清空磁盘缓存（统计计数保留）"""
+        with self._lock:
+            for key in list(self._index):
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._index.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计
+
+        Returns:
+            包含命中、未命中、跳过缓存、淘汰次数以及当前条目数和字节数的字典
+        """
+        with self._lock:
+            return {**self._stats, "entries": len(self._index), "bytes": self._bytes}
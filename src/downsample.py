@@ -0,0 +1,176 @@
+"""
+折线降采样模块
+按输出像素宽度对长序列做 LTTB 或 M4（每像素列最小/最大值）降采样
+"""
+
+import warnings
+from typing import Optional
+
+import numpy as np
+
+DOWNSAMPLE_METHODS = ("lttb", "m4")
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 降采样
+
+    每个桶内选取与“上一个选中点”和“下一个桶平均点”构成三角形面积最大的点。
+    桶划分与平均值用 NumPy 一次算出；由于每个桶依赖上一个桶的选择，
+    只在桶之间做一层循环，桶内计算全部向量化。
+
+    Args:
+        x: 单调递增的 X 数值（不含 NaN）
+        y: Y 数值（不含 NaN）
+        n_out: 输出点数
+
+    Returns:
+        选中点的下标数组（升序，包含首尾两点）
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # 中间 n-2 个点均分为 n_out-2 个桶
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[: edges[-1]], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[: edges[-1]], edges[:-1]) / counts
+    # 每个桶对应的“下一个桶平均点”，最后一个桶使用终点
+    next_x = np.append(avg_x[1:], x[-1])
+    next_y = np.append(avg_y[1:], y[-1])
+
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        px, py = x[prev], y[prev]
+        area = np.abs((px - next_x[i]) * (y[lo:hi] - py) - (px - x[lo:hi]) * (next_y[i] - py))
+        prev = lo + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def m4_indices(x: np.ndarray, y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """
+    M4 降采样：每个像素列保留首、尾、最小、最大四个点
+
+    按 X 值把数据等宽分到 n_buckets 个像素列，渲染后的折线与全量数据在像素上一致。
+
+    Args:
+        x: 单调递增的 X 数值（不含 NaN）
+        y: Y 数值（不含 NaN）
+        n_buckets: 像素列数
+
+    Returns:
+        选中点的下标数组（升序）
+    """
+    n = len(x)
+    if n <= 4 * n_buckets:
+        return np.arange(n)
+
+    span = x[-1] - x[0]
+    if span > 0:
+        bucket = np.minimum(((x - x[0]) * (n_buckets / span)).astype(np.intp), n_buckets - 1)
+    else:
+        bucket = np.zeros(n, dtype=np.intp)
+
+    # X 单调递增，因此同一像素列的点是连续的一段
+    starts = np.flatnonzero(np.concatenate(([True], bucket[1:] != bucket[:-1])))
+    ends = np.append(starts[1:], n) - 1
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.append(starts, n)))
+
+    def first_match(extreme: np.ndarray) -> np.ndarray:
+        # 每段中第一个等于极值的位置
+        candidates = np.flatnonzero(y == extreme[segment])
+        _, first = np.unique(segment[candidates], return_index=True)
+        return candidates[first]
+
+    min_idx = first_match(np.minimum.reduceat(y, starts))
+    max_idx = first_match(np.maximum.reduceat(y, starts))
+    return np.unique(np.concatenate([starts, ends, min_idx, max_idx]))
+
+
+def _as_numeric_x(x: np.ndarray) -> Optional[np.ndarray]:
+    """将 X 转为浮点数（日期按纳秒计）；分类等无法排序比较的类型返回 None"""
+    if np.issubdtype(x.dtype, np.datetime64) or np.issubdtype(x.dtype, np.timedelta64):
+        values = x.astype("datetime64[ns]" if x.dtype.kind == "M" else "timedelta64[ns]").view(np.int64)
+        numeric = values.astype(float)
+        numeric[values == np.iinfo(np.int64).min] = np.nan  # NaT
+        return numeric
+    if np.issubdtype(x.dtype, np.number) or x.dtype == bool:
+        return x.astype(float)
+    return None
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int, method: str = "lttb") -> np.ndarray:
+    """
+    按输出像素宽度降采样，返回用于绘图的下标
+
+    X、Y 中任一为 NaN 的点视为缺口。像素列按全部有效点的 X 范围一次划分，只在有效点上降采样；
+    缺口跨越像素列边界时在其两侧之间保留一个缺口点的下标，使绘图时折线仍在缺口处断开，
+    落在同一像素列内的缺口不足一个像素，直接忽略。
+    X 为分类等非数值类型时按位置等距处理；X 非单调递增时无法按像素分桶，返回全部下标。
+
+    Args:
+        x: X 轴数据（数值、日期或分类）
+        y: Y 轴数据
+        n_out: 输出像素宽度（LTTB 为输出点数，M4 为像素列数）
+        method: 降采样方法，'lttb' 或 'm4'
+
+    Returns:
+        升序下标数组
+    """
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError(f"不支持的降采样方法: {method}，可选: {DOWNSAMPLE_METHODS}")
+
+    n = len(y)
+    x_num = _as_numeric_x(np.asarray(x))
+    if x_num is None:
+        x_num = np.arange(n, dtype=float)
+    y = np.asarray(y, dtype=float)
+
+    valid_idx = np.flatnonzero(np.isfinite(x_num) & np.isfinite(y))
+    if np.any(np.diff(x_num[valid_idx]) < 0):
+        warnings.warn("X 轴数据非单调递增，跳过降采样", stacklevel=2)
+        return np.arange(n)
+    if len(valid_idx) <= (n_out if method == "lttb" else 4 * n_out):
+        return np.arange(n)
+
+    # 以首个有效点为原点，避免大数值（如纳秒时间戳）损失精度
+    xs = x_num[valid_idx] - x_num[valid_idx[0]]
+    ys = y[valid_idx]
+    span = xs[-1]
+    if span > 0:
+        bucket = np.minimum((xs * (n_out / span)).astype(np.intp), n_out - 1)
+    else:
+        bucket = np.zeros(len(xs), dtype=np.intp)
+
+    # 可见缺口：相邻有效点之间有 NaN 且分属不同像素列，gaps[k] 为缺口前一个有效点的位置
+    gaps = np.flatnonzero((np.diff(valid_idx) > 1) & (np.diff(bucket) != 0))
+
+    if method == "m4":
+        # 像素列与缺口都在同一全局划分上，缺口两侧的点分别是相邻像素列的首尾点，一定被选中
+        selected = m4_indices(xs, ys, n_out)
+    else:
+        # LTTB 在可见缺口处分段，按各段 X 跨度分配点数，保证缺口两侧的端点被选中
+        run_starts = np.concatenate(([0], gaps + 1))
+        run_stops = np.append(gaps + 1, len(xs))
+        if span > 0:
+            shares = (xs[run_stops - 1] - xs[run_starts]) / span
+        else:
+            shares = (run_stops - run_starts) / len(xs)
+        budgets = np.round(n_out * shares).astype(np.intp)
+        pieces = []
+        for start, stop, budget in zip(run_starts, run_stops, budgets):
+            if budget < 3:
+                # 段不足三个像素宽时只保留首尾两点
+                pieces.append(np.unique([start, stop - 1]))
+            else:
+                pieces.append(lttb_indices(xs[start:stop], ys[start:stop], budget) + start)
+        selected = np.concatenate(pieces)
+
+    # 缺口前一个有效点的下一个下标必为 NaN 点，作为断开折线的缺口标记
+    return np.sort(np.concatenate((valid_idx[selected], valid_idx[gaps] + 1)))
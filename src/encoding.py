@@ -0,0 +1,229 @@
+"""
+图片编码模块
+RGBA 像素的 Pillow 编码、base64 流式编码与 data URI 生成
+"""
+
+import binascii
+import io
+from typing import Optional
+
+import numpy as np
+from PIL import Image
+
+# 图片格式 -> MIME 类型
+IMAGE_MIME_TYPES = {
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "jpeg": "image/jpeg",
+    "webp": "image/webp",
+    "tif": "image/tiff",
+    "tiff": "image/tiff",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+    "ps": "application/postscript",
+    "eps": "application/postscript",
+}
+
+# 可由 Pillow 编码的位图格式 -> Pillow 格式名
+PIL_FORMATS = {
+    "png": "PNG",
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "webp": "WEBP",
+    "tif": "TIFF",
+    "tiff": "TIFF",
+}
+
+# 流式编码时单次编码的最大原始字节数（3 的倍数，中间块不产生填充）
+BASE64_CHUNK_BYTES = 3 * 64 * 1024
+
+
+def data_uri_prefix(format: str) -> str:
+    """
+    获取 data URI 的前缀，如 "data:image/png;base64,"
+
+    Args:
+        format: 图片格式
+
+    Returns:
+        前缀字符串
+    """
+    mime_type = IMAGE_MIME_TYPES.get(format.lower())
+    if mime_type is None:
+        raise ValueError(f"不支持的图片格式: {format}，可选: {tuple(IMAGE_MIME_TYPES)}")
+    return f"data:{mime_type};base64,"
+
+
+def chart_palette(colors: np.ndarray, levels: int = 16, grays: int = 16) -> np.ndarray:
+    """
+    由图表配色生成 8 位调色板
+
+    图表由少量纯色和白色背景组成，抗锯齿边缘是颜色与背景的混合，文字和坐标轴是灰度。
+    调色板包含每种颜色与白色按 levels 级混合的结果（含纯色）以及 grays 级灰度，
+    颜色较多时自动减少混合级数，保证总数不超过 256。
+
+    Args:
+        colors: (N, 3) 的 RGB 数组（0-255）
+        levels: 每种颜色与白色的混合级数
+        grays: 灰度级数（含黑白）
+
+    Returns:
+        (K, 3) 的 uint8 调色板，K <= 256
+    """
+    colors = np.unique(np.asarray(colors, dtype=np.float64).reshape(-1, 3), axis=0)[: 256 - grays]
+    levels = max(1, min(levels, (256 - grays) // max(len(colors), 1)))
+    weights = np.arange(1, levels + 1)[None, :, None] / levels
+    blends = (255 * (1 - weights) + colors[:, None, :] * weights).reshape(-1, 3)
+    gray = np.repeat(np.linspace(0, 255, grays)[:, None], 3, axis=1)
+    return np.unique(np.rint(np.vstack([blends, gray])).astype(np.uint8), axis=0)
+
+
+def _palette_image(palette: np.ndarray) -> Image.Image:
+    """把调色板数组转换为 Image.quantize 需要的 P 模式图片"""
+    image = Image.new("P", (1, 1))
+    image.putpalette(palette.astype(np.uint8).tobytes(), rawmode="RGB")
+    return image
+
+
+def encode_image(
+    pixels: np.ndarray,
+    stream,
+    format: str = "png",
+    dpi: Optional[float] = None,
+    compress_level: Optional[int] = None,
+    quantize_colors: Optional[int] = None,
+    palette: Optional[np.ndarray] = None,
+    quality: Optional[int] = None,
+    lossless: bool = False,
+):
+    """
+    用 Pillow 把 RGBA 像素编码为图片写入 stream
+
+    Args:
+        pixels: (H, W, 4) 的 uint8 数组
+        stream: 目标文件对象（BytesIO、文件或 Base64Writer）
+        format: 图片格式
+        dpi: 写入图片元数据的分辨率
+        compress_level: PNG 的 zlib 压缩级别（0-9），None 表示 Pillow 默认值 6
+        quantize_colors: 自适应量化为 8 位调色板图片的颜色数（2-256），None 表示不量化
+        palette: 固定调色板（(K, 3) 的 RGB 数组，见 chart_palette），指定时按最近颜色映射、
+            不抖动，透明像素先合成到白色背景；优先于 quantize_colors
+        quality: JPEG / 有损 WebP 的质量（1-100），None 表示 Pillow 默认值
+        lossless: WebP 是否无损压缩
+    """
+    pil_format = PIL_FORMATS.get(format.lower())
+    if pil_format is None:
+        raise ValueError(f"不支持的位图格式: {format}，可选: {tuple(PIL_FORMATS)}")
+    if pil_format == "JPEG" and (quantize_colors or palette is not None):
+        raise ValueError("JPEG 不支持调色板量化")
+    height, width = pixels.shape[:2]
+    image = Image.frombuffer("RGBA", (width, height), np.ascontiguousarray(pixels), "raw", "RGBA", 0, 1)
+
+    params = {}
+    if dpi:
+        params["dpi"] = (dpi, dpi)
+    if pil_format == "PNG" and compress_level is not None:
+        params["compress_level"] = compress_level
+    if pil_format in ("JPEG", "WEBP") and quality is not None:
+        params["quality"] = quality
+    if pil_format == "WEBP":
+        params["lossless"] = lossless
+
+    if pil_format == "JPEG" or palette is not None:
+        # JPEG 没有透明通道，固定调色板不含透明色，先合成到白色背景上
+        if image.getextrema()[3][0] < 255:
+            image = Image.alpha_composite(Image.new("RGBA", image.size, "white"), image)
+        image = image.convert("RGB")
+    if palette is not None:
+        image = image.quantize(palette=_palette_image(palette), dither=Image.Dither.NONE)
+    elif quantize_colors:
+        image = image.quantize(colors=quantize_colors, method=Image.Quantize.FASTOCTREE)
+    image.save(stream, format=pil_format, **params)
+
+
+class Base64Writer:
+    """
+    把写入的字节实时编码为 base64 并写到目标流的文件对象
+
+    可直接作为 savefig 的输出目标：图片边生成边编码写出，不在内存中保留完整图片。
+    目标可以是文件、BytesIO 等有 write 方法的对象，或只有 sendall 方法的 socket。
+    close() 写出末尾的填充，但不关闭目标流。
+
+    用法:
+        with Base64Writer(sock, prefix=data_uri_prefix("png")) as writer:
+            fig.savefig(writer, format="png")
+    """
+
+    def __init__(self, stream, prefix: Optional[str] = None):
+        """
+        初始化编码器
+
+        Args:
+            stream: 目标流（有 write 或 sendall 方法）
+            prefix: 编码内容前写出的前缀（如 data URI 前缀）
+        """
+        self._stream = stream
+        self._write = getattr(stream, "write", None) or stream.sendall
+        self._pending = bytearray()
+        self._raw_bytes = 0
+        self.bytes_written = 0
+        self.closed = False
+        if prefix:
+            self._emit(prefix.encode("ascii"))
+
+    def _emit(self, data: bytes):
+        self._write(data)
+        self.bytes_written += len(data)
+
+    def write(self, data) -> int:
+        """写入原始字节，按 3 字节的整数倍立即编码写出，不足 3 字节的尾部留到下次"""
+        if self.closed:
+            raise ValueError("Base64Writer 已关闭")
+        view = memoryview(data).cast("B")
+        n_bytes = len(view)
+        self._raw_bytes += n_bytes
+        if self._pending:
+            # 先补齐上次剩下的不足 3 字节
+            n_fill = min(3 - len(self._pending), n_bytes)
+            self._pending += view[:n_fill]
+            view = view[n_fill:]
+            if len(self._pending) == 3:
+                self._emit(binascii.b2a_base64(self._pending, newline=False))
+                self._pending.clear()
+        n_ready = len(view) // 3 * 3
+        for start in range(0, n_ready, BASE64_CHUNK_BYTES):
+            self._emit(binascii.b2a_base64(view[start : min(start + BASE64_CHUNK_BYTES, n_ready)], newline=False))
+        self._pending += view[n_ready:]
+        return n_bytes
+
+    def tell(self) -> int:
+        """已写入的原始字节数（PDF 后端据此记录对象偏移）"""
+        return self._raw_bytes
+
+    def seekable(self) -> bool:
+        return False
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        """只写流，不支持定位（matplotlib 以是否有 seek 方法判断文件对象）"""
+        raise io.UnsupportedOperation("Base64Writer 不支持 seek")
+
+    def flush(self):
+        """刷新目标流（不足 3 字节的尾部留到 close 时编码）"""
+        if hasattr(self._stream, "flush"):
+            self._stream.flush()
+
+    def close(self):
+        """编码并写出剩余字节（含末尾填充）"""
+        if self.closed:
+            return
+        if self._pending:
+            self._emit(binascii.b2a_base64(bytes(self._pending), newline=False))
+            self._pending.clear()
+        self.closed = True
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
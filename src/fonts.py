@@ -0,0 +1,152 @@
+"""
+字体解析模块
+解析可用的中文字体并把结果持久化到磁盘，后续进程在 matplotlib 字体列表未变化时直接复用
+"""
+
+import hashlib
+import json
+import os
+import platform
+from typing import Dict, Optional, Sequence
+
+import matplotlib as mpl
+import matplotlib.font_manager as fm
+
+# 各系统的中文字体候选（按优先级排列）
+CHINESE_FONT_CANDIDATES = {
+    "linux": [
+        "WenQuanYi Micro Hei",
+        "WenQuanYi Zen Hei",
+        "Noto Sans CJK SC",
+        "Source Han Sans SC",
+        "Droid Sans Fallback",
+        "AR PL UMing CN",
+        "AR PL UKai CN",
+    ],
+    "windows": ["Microsoft YaHei", "SimHei", "SimSun"],
+    "darwin": [
+        "PingFang SC",
+        "Hiragino Sans GB",
+        "STHeiti",
+        "Arial Unicode MS",
+    ],
+    "other": [
+        "WenQuanYi Micro Hei",
+        "Noto Sans CJK SC",
+        "Source Han Sans SC",
+        "DejaVu Sans",
+    ],
+}
+
+# 字体索引缓存目录的环境变量，未设置时使用 matplotlib 的缓存目录
+FONT_CACHE_DIR_ENV = "PLOT_TEST_FONT_CACHE_DIR"
+
+FONT_INDEX_FILENAME = "plot_test_font_index.json"
+
+# 进程内缓存：候选列表 -> 解析结果（matplotlib 的 fontManager 在进程内同样不会重新扫描）
+_RESOLVED: Dict[str, Optional[str]] = {}
+
+
+def font_cache_dir() -> str:
+    """获取字体索引的缓存目录"""
+    return os.environ.get(FONT_CACHE_DIR_ENV) or mpl.get_cachedir()
+
+
+def _fontlist_path() -> str:
+    """matplotlib 的字体列表缓存文件，fontManager 启动时从这里加载"""
+    return os.path.join(mpl.get_cachedir(), f"fontlist-v{fm.FontManager.__version__}.json")
+
+
+def font_index_key() -> str:
+    """
+    计算字体索引键
+
+    由系统、matplotlib 版本以及 matplotlib 字体列表缓存文件的修改时间组成。fontManager
+    启动时从该文件加载字体列表，字体目录变化后只有重建该文件才会看到新字体，
+    因此只需一次 stat，无需遍历字体目录。
+
+    Returns:
+        十六进制索引键
+    """
+    path = _fontlist_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        mtime = None
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{platform.system()}|{platform.release()}|{mpl.__version__}|{path}|{mtime}".encode())
+    return digest.hexdigest()
+
+
+def _load_index(path: str) -> Dict:
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_index(path: str, index: Dict):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"✗ 字体索引写入失败: {path}, 错误: {e}")
+
+
+def resolve_chinese_font(candidates: Optional[Sequence[str]] = None) -> Optional[str]:
+    """
+    解析可用的中文字体
+
+    依次查找进程内缓存、磁盘索引，都未命中时才遍历 fontManager 中的全部字体，
+    并把结果写回磁盘索引供其他进程复用。
+
+    Args:
+        candidates: 候选字体名（按优先级），默认按当前系统选择
+
+    Returns:
+        第一个可用的候选字体名，没有可用字体时返回 None
+    """
+    if candidates is None:
+        system = platform.system().lower()
+        candidates = CHINESE_FONT_CANDIDATES.get(system, CHINESE_FONT_CANDIDATES["other"])
+    candidates_key = "|".join(candidates)
+
+    if candidates_key in _RESOLVED:
+        return _RESOLVED[candidates_key]
+
+    key = font_index_key()
+    path = os.path.join(font_cache_dir(), FONT_INDEX_FILENAME)
+    index = _load_index(path)
+    if index.get("key") == key and candidates_key in index.get("fonts", {}):
+        _RESOLVED[candidates_key] = index["fonts"][candidates_key]
+        return _RESOLVED[candidates_key]
+
+    available_fonts = {f.name for f in fm.fontManager.ttflist}
+    print(f"扫描系统字体: 共 {len(available_fonts)} 种")
+    font = next((name for name in candidates if name in available_fonts), None)
+
+    fonts = index.get("fonts", {}) if index.get("key") == key else {}
+    fonts[candidates_key] = font
+    _save_index(path, {"key": key, "fonts": fonts})
+    _RESOLVED[candidates_key] = font
+    return font
+
+
+def register_font_file(font_path: str) -> str:
+    """
+    注册字体文件（如项目自带的字体），无需扫描系统字体
+
+    Args:
+        font_path: 字体文件路径（.ttf / .otf / .ttc）
+
+    Returns:
+        字体名，可直接用于 rcParams['font.sans-serif']
+    """
+    if not os.path.isfile(font_path):
+        raise ValueError(f"字体文件不存在: {font_path}")
+    fm.fontManager.addfont(font_path)
+    return fm.FontProperties(fname=font_path).get_name()
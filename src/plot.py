@@ -7,15 +7,43 @@
 # pylint: disable=line-too-long
 
 import base64
+import contextlib
+import dataclasses
+import functools
+import inspect
 import io
-import platform
-from typing import Dict, List, Optional, Union
+import os
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-import matplotlib.font_manager as fm
+import matplotlib as mpl
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg, RendererAgg
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgba_array
+from matplotlib.figure import Figure
+from matplotlib.image import imsave
 from matplotlib.lines import Line2D
+from matplotlib.patches import Circle, Patch
+from matplotlib.style.core import STYLE_BLACKLIST
+from matplotlib.transforms import Bbox
+from PIL import Image
+
+try:
+    from .downsample import downsample_indices
+    from .encoding import Base64Writer, chart_palette, data_uri_prefix, encode_image
+    from .fonts import register_font_file, resolve_chinese_font
+    from .raster import downscale_area
+    from .render_cache import RenderCache, fingerprint_data, make_cache_key, used_columns
+except ImportError:  # 作为脚本直接运行（python src/plot.py）时
+    from downsample import downsample_indices
+    from encoding import Base64Writer, chart_palette, data_uri_prefix, encode_image
+    from fonts import register_font_file, resolve_chinese_font
+    from raster import downscale_area
+    from render_cache import RenderCache, fingerprint_data, make_cache_key, used_columns
 
 # import platform  # 暂时未使用
 # import matplotlib
@@ -36,88 +64,352 @@ COLOR_PALETTE = [
     "#ea7ccc",
 ]
 
-plt.style.use(DEFAULT_STYLE)
+# 柱子总数超过该阈值时，柱状图自动改用单个 PolyCollection 绘制
+BAR_COLLECTION_THRESHOLD = 2000
+
+# 系列数超过该阈值时，折线图自动改用单个 LineCollection 绘制
+LINE_COLLECTION_THRESHOLD = 20
+
+# render() 支持的图表方法
+CHART_TYPES = ("donut_chart", "line_chart", "bar_chart")
+
+# 可读取像素尺寸的位图格式
+RASTER_FORMATS = ("png", "jpg", "jpeg", "tif", "tiff", "webp")
+
+# SVG 中元素 id 的固定哈希盐，保证相同图表输出相同字节
+SVG_HASH_SALT = "plot_test"
+
+# 默认样式是否已应用到全局 rcParams（推迟到首次创建 pyplot 模式的生成器时）
+_default_style_applied = False
+
+
+def _apply_default_style():
+    """首次创建 pyplot 模式的生成器时应用默认样式，导入模块本身不修改全局 rcParams"""
+    global _default_style_applied
+    if not _default_style_applied:
+        plt.style.use(DEFAULT_STYLE)
+        _default_style_applied = True
+
+
+def _style_rc_params(style: str) -> Dict:
+    """获取样式对应的 rcParams（与 plt.style.use 一样排除后端等全局设置）"""
+    params = mpl.rcParamsDefault if style == "default" else mpl.style.library[style]
+    return {key: value for key, value in params.items() if key not in STYLE_BLACKLIST}
+
+
+class _SharedRcContext:
+    """
+    线程间共享的 rcParams 上下文
+
+    rcParams 是进程级全局字典，rc_context 并发进出时会把其他线程正在使用的设置恢复掉。
+    这里按参数集合做引用计数：同一组参数可以被任意多个线程同时进入，第一个进入时应用，
+    最后一个退出时恢复。锁只保护进出时的计数，但不同参数集合需等待前一组全部退出，
+    因此 rcParams 不同的生成器之间是串行的：一个生成器的建图或导出方法执行期间，
+    其他参数集合的生成器在方法入口等待。
+
+    同一线程在一个参数集合的上下文中进入另一个参数集合（如在生成器 A 的方法中调用
+    rcParams 不同的生成器 B）会永远等待自己退出，这里直接抛出 RuntimeError。
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._active_key = None
+        self._count = 0
+        self._saved = None
+        self._local = threading.local()  # 当前线程已进入的参数集合与嵌套层数
+
+    @contextlib.contextmanager
+    def apply(self, key: str, params: Dict):
+        depth = getattr(self._local, "depth", 0)
+        if depth and self._local.key != key:
+            raise RuntimeError("不能在一个绘图生成器的渲染过程中调用 rcParams 不同的另一个生成器")
+        with self._condition:
+            while self._count and self._active_key != key:
+                self._condition.wait()
+            if self._count == 0:
+                self._saved = {name: mpl.rcParams[name] for name in params}
+                mpl.rcParams.update(params)
+                self._active_key = key
+            self._count += 1
+        self._local.key = key
+        self._local.depth = depth + 1
+        try:
+            yield
+        finally:
+            self._local.depth = depth
+            with self._condition:
+                self._count -= 1
+                if self._count == 0:
+                    mpl.rcParams.update(self._saved)
+                    self._saved = None
+                    self._active_key = None
+                    self._condition.notify_all()
+
+
+_SHARED_RC_CONTEXT = _SharedRcContext()
+
+
+def _savefig_kwargs(format: str) -> Dict:
+    """获取保证输出字节稳定的 savefig 参数（去掉随时间变化的元数据）"""
+    format = format.lower()
+    if format == "svg":
+        return {"metadata": {"Date": None}}
+    if format in ("pdf", "ps", "eps"):
+        return {"metadata": {"CreationDate": None}}
+    return {}
+
+
+def _in_render_context(method):
+    """让方法在生成器的 rcParams 上下文中执行"""
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._render_context():
+            return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+@dataclass(frozen=True)
+class RenderProfile:
+    """
+    渲染配置：分辨率、格式与位图编码参数
+
+    Attributes:
+        dpi: 渲染分辨率
+        format: 图片格式
+        compress_level: PNG 的 zlib 压缩级别（0-9），None 表示默认值 6
+        quantize_colors: 自适应量化为 8 位调色板 PNG 的颜色数（2-256），None 表示不量化
+        quantize_palette: 是否量化到由生成器配色派生的固定调色板（见 PlotGenerator.chart_palette），
+            优先于 quantize_colors
+        quality: JPEG / 有损 WebP 的质量（1-100），None 表示 Pillow 默认值
+        lossless: WebP 是否无损压缩
+    """
+
+    dpi: int
+    format: str = "png"
+    compress_level: Optional[int] = None
+    quantize_colors: Optional[int] = None
+    quantize_palette: bool = False
+    quality: Optional[int] = None
+    lossless: bool = False
+
+    @property
+    def uses_pillow(self) -> bool:
+        """是否需要先取 RGBA 像素再用 Pillow 编码（savefig 不支持这些编码参数）"""
+        return self.format.lower() in RASTER_FORMATS and (
+            self.compress_level is not None
+            or self.quantize_colors is not None
+            or self.quantize_palette
+            or self.quality is not None
+            or self.lossless
+        )
+
+
+# 预置渲染配置（10×6 英寸的图片在 web 配置下约 800 像素宽）
+RENDER_PROFILES = {
+    "thumbnail": RenderProfile(dpi=30, compress_level=9, quantize_colors=64),
+    "web": RenderProfile(dpi=80, quantize_palette=True),
+    "retina": RenderProfile(dpi=160),
+    "print": RenderProfile(dpi=300),
+}
+
+
+@dataclass(frozen=True)
+class RenderResult:
+    """
+    渲染结果：编码后的图片字节与元数据，不持有 Figure
+
+    Attributes:
+        data: 编码后的图片字节
+        format: 图片格式
+        dpi: 渲染分辨率
+        width: 像素宽度（矢量格式为 None）
+        height: 像素高度（矢量格式为 None）
+        chart_type: 图表类型
+    """
+
+    data: bytes
+    format: str
+    dpi: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    chart_type: Optional[str] = None
+
+    @property
+    def nbytes(self) -> int:
+        """编码后字节数"""
+        return len(self.data)
+
+    def to_base64(self) -> str:
+        """转换为 base64 字符串"""
+        return base64.b64encode(self.data).decode("ascii")
+
+    def to_data_uri(self) -> str:
+        """转换为 data URI（如 "data:image/png;base64,..."），可直接用于 <img src>"""
+        return data_uri_prefix(self.format) + self.to_base64()
+
+    def write_base64(self, stream, data_uri: bool = False) -> int:
+        """
+        分块编码为 base64 写入文件或 socket
+
+        Args:
+            stream: 目标流（有 write 或 sendall 方法）
+            data_uri: 是否先写出 data URI 前缀
+
+        Returns:
+            写出的字节数
+        """
+        with Base64Writer(stream, data_uri_prefix(self.format) if data_uri else None) as writer:
+            writer.write(self.data)
+        return writer.bytes_written
+
+
+@dataclass(frozen=True, eq=False)
+class RasterResult:
+    """
+    位图渲染结果：未编码的 RGBA 像素数组与元数据
+
+    Attributes:
+        pixels: (H, W, 4) 的只读 uint8 数组
+        dpi: 渲染分辨率
+        chart_type: 图表类型
+    """
+
+    pixels: np.ndarray
+    dpi: int
+    chart_type: Optional[str] = None
+
+    @property
+    def width(self) -> int:
+        """像素宽度"""
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        """像素高度"""
+        return self.pixels.shape[0]
+
+    @property
+    def shape(self) -> tuple:
+        """数组形状 (H, W, 4)"""
+        return self.pixels.shape
+
+    def to_image(self) -> Image.Image:
+        """转换为 PIL 图片（共享像素内存）"""
+        return Image.frombuffer("RGBA", (self.width, self.height), self.pixels, "raw", "RGBA", 0, 1)
 
 
 class PlotGenerator:
     """绘图生成器类"""
 
-    def __init__(self, figsize=(10, 6), color_palette=COLOR_PALETTE):
+    def __init__(
+        self,
+        figsize=(10, 6),
+        color_palette=COLOR_PALETTE,
+        use_pyplot=True,
+        style=DEFAULT_STYLE,
+        rc_params=None,
+        render_cache: Optional[RenderCache] = None,
+        font_path: Optional[str] = None,
+        render_profiles: Optional[Dict[str, RenderProfile]] = None,
+    ):
         """
         初始化绘图生成器
 
         Args:
-            style: matplotlib 样式
             figsize: 图片尺寸
+            color_palette: 颜色序列
+            use_pyplot: 是否通过 pyplot 创建图形。False 时直接构建 Figure + FigureCanvasAgg，
+                图形不注册到 pyplot，字体和样式只在本生成器的 rcParams 上下文中生效，
+                可在多个线程中并发建图和导出；rcParams（含样式、字体）不同的生成器之间串行执行
+            style: matplotlib 样式
+            rc_params: 额外的 rcParams 设置
+            render_cache: 渲染缓存，render() 对相同数据和参数直接返回缓存的结果
+            font_path: 中文字体文件路径（如项目自带字体），指定时跳过系统字体查找
+            render_profiles: 额外的或覆盖预置的渲染配置（名称 -> RenderProfile），
+                导出方法通过 profile 参数按名称选用
         """
+        self.use_pyplot = use_pyplot
+        self.rc_params = {"svg.hashsalt": SVG_HASH_SALT}
+        if use_pyplot:
+            _apply_default_style()
+            if style != DEFAULT_STYLE:
+                plt.style.use(style)
+            # 在样式之后设置，plt.style.use("default") 会把它重置为 None
+            plt.rcParams["svg.hashsalt"] = SVG_HASH_SALT
+
         # 设置中文字体
-        self._setup_chinese_font()
+        self._setup_chinese_font(font_path)
+
+        if rc_params:
+            self.rc_params.update(rc_params)
+            if use_pyplot:
+                plt.rcParams.update(rc_params)
+        if not use_pyplot:
+            self.rc_params = {**_style_rc_params(style), **self.rc_params}
+        self._rc_key = repr(sorted(self.rc_params.items()))
 
         self.figsize = figsize
         self.current_fig = None
         self.current_ax = None
         self.color_palette = color_palette
+        self.render_cache = render_cache
+        self.render_profiles = {**RENDER_PROFILES, **(render_profiles or {})}
+        self._chart_palette = None  # (color_palette, 调色板)
 
-    def _setup_chinese_font(self):
-        """设置中文字体"""
-
-        # 根据系统选择字体
-        system = platform.system().lower()
-
-        if system == "linux":
-            chinese_fonts = [
-                "WenQuanYi Micro Hei",
-                "WenQuanYi Zen Hei",
-                "Noto Sans CJK SC",
-                "Source Han Sans SC",
-                "Droid Sans Fallback",
-                "AR PL UMing CN",
-                "AR PL UKai CN",
-            ]
-        elif system == "windows":
-            print("正在为 Windows 系统设置字体...")
-            chinese_fonts = ["Microsoft YaHei", "SimHei", "SimSun"]
-        elif system == "darwin":  # macOS
-            chinese_fonts = [
-                "PingFang SC",
-                "Hiragino Sans GB",
-                "STHeiti",
-                "Arial Unicode MS",
-            ]
-        else:
-            chinese_fonts = [
-                "WenQuanYi Micro Hei",
-                "Noto Sans CJK SC",
-                "Source Han Sans SC",
-                "DejaVu Sans",
-            ]
+    def _render_context(self):
+        """
+        获取本生成器的 rcParams 上下文
 
-        # 获取所有可用字体
-        available_fonts = [f.name for f in fm.fontManager.ttflist]
-        print(f"系统中共有 {len(available_fonts)} 个字体")
-
-        # 尝试设置字体
-        for font in chinese_fonts:
-            if font in available_fonts:
-                try:
-                    plt.rcParams["font.sans-serif"] = [font]
-                    plt.rcParams["axes.unicode_minus"] = False
-                    print(f"✓ 使用中文字体: {font}")
-                    break
-                except Exception as e:
-                    print(f"✗ 字体设置失败: {font}, 错误: {e}")
-                    continue
+        pyplot 模式下字体已写入全局 rcParams，返回空上下文。
+        """
+        if self.use_pyplot:
+            return contextlib.nullcontext()
+        return _SHARED_RC_CONTEXT.apply(self._rc_key, self.rc_params)
+
+    def _setup_chinese_font(self, font_path: Optional[str] = None):
+        """
+        设置中文字体
+
+        字体解析结果缓存在磁盘字体索引中，matplotlib 字体列表未变化时不再遍历系统字体。
+
+        Args:
+            font_path: 字体文件路径，指定时直接注册该字体，跳过系统字体查找
+        """
+        if font_path is not None:
+            font = register_font_file(font_path)
+        else:
+            font = resolve_chinese_font()
+        if font is None:
+            print("✗ 未找到可用的中文字体")
+            return
+
+        # 非 pyplot 模式只记录到本生成器的 rcParams
+        font_params = {"font.sans-serif": [font], "axes.unicode_minus": False}
+        self.rc_params.update(font_params)
+        if self.use_pyplot:
+            plt.rcParams.update(font_params)
+        print(f"✓ 使用中文字体: {font}")
 
     def _setup_figure(self, figsize: Optional[tuple] = None):
         """设置图形"""
         if figsize is None:
             figsize = self.figsize
-        self.current_fig, self.current_ax = plt.subplots(figsize=figsize)
+        if self.use_pyplot:
+            fig, ax = plt.subplots(figsize=figsize)
+        else:
+            # 直接构建 Figure 与 Agg 画布，不经过 pyplot 的全局图形管理器
+            fig = Figure(figsize=figsize)
+            FigureCanvasAgg(fig)
+            ax = fig.add_subplot()
         # 统一白底
-        self.current_fig.patch.set_facecolor("white")
-        self.current_ax.set_facecolor("white")
+        fig.patch.set_facecolor("white")
+        ax.set_facecolor("white")
 
-        return self.current_fig, self.current_ax
+        # 先在局部变量上完成构建，多线程共用同一生成器时不会互相覆盖
+        self.current_fig, self.current_ax = fig, ax
+        return fig, ax
 
     def _get_colors(self, n_colors: int) -> List[str]:
         """获取指定数量的颜色"""
@@ -130,6 +422,170 @@ class PlotGenerator:
                 colors.append(self.color_palette[i % len(self.color_palette)])
             return colors
 
+    @staticmethod
+    def _pivot_bar_data(
+        df: pd.DataFrame,
+        x_col: str,
+        y_col: str,
+        group_col: Optional[str] = None,
+        stack_col: Optional[str] = None,
+    ):
+        """
+        将长表数据一次性聚合为 (x × group × stack) 稠密矩阵
+
+        只对数据做一次编码和一次 bincount，代价只随行数增长，与系列数量无关。
+
+        Args:
+            df: 长格式数据
+            x_col: X 轴列名
+            y_col: 数值列名
+            group_col: 分组列名（可选）
+            stack_col: 堆叠列名（可选）
+
+        Returns:
+            (x_values, group_values, stack_values, matrix)，各维度的唯一值保持首次出现的顺序；
+            matrix 形状为 (len(x_values), len(group_values), len(stack_values))，
+            未指定的分组/堆叠维度长度为 1，对应唯一值为 [None]
+        """
+        n_rows = len(df)
+        x_codes, x_values = pd.factorize(df[x_col])
+        if group_col:
+            group_codes, group_values = pd.factorize(df[group_col])
+        else:
+            group_codes, group_values = np.zeros(n_rows, dtype=np.intp), [None]
+        if stack_col:
+            stack_codes, stack_values = pd.factorize(df[stack_col])
+        else:
+            stack_codes, stack_values = np.zeros(n_rows, dtype=np.intp), [None]
+
+        shape = (len(x_values), len(group_values), len(stack_values))
+
+        # 缺失键（编码为 -1）与 groupby 一致，不参与聚合；缺失数值按 0 处理
+        valid = (x_codes >= 0) & (group_codes >= 0) & (stack_codes >= 0)
+        flat_index = np.ravel_multi_index((x_codes[valid], group_codes[valid], stack_codes[valid]), shape)
+        weights = df[y_col].to_numpy(dtype=float, na_value=0.0)[valid]
+        matrix = np.bincount(flat_index, weights=weights, minlength=int(np.prod(shape))).reshape(shape)
+
+        return x_values, group_values, stack_values, matrix
+
+    @staticmethod
+    def _format_bar_value(value: float) -> str:
+        """格式化柱子数值标签，避免科学计数法"""
+        if value >= 1000000:
+            return f"{value/1000000:.1f}M"
+        elif value >= 1000:
+            return f"{value/1000:.1f}K"
+        return f"{value:.0f}"
+
+    @staticmethod
+    def _draw_line_collection(
+        ax,
+        x: pd.Series,
+        y: pd.DataFrame,
+        colors: List[str],
+        line_styles: List[str],
+        linewidth: float,
+        series_idx: Optional[List[np.ndarray]] = None,
+    ) -> LineCollection:
+        """
+        用单个 LineCollection 绘制全部折线
+
+        Args:
+            ax: 目标坐标轴
+            x: X 轴数据（支持数值、日期和分类）
+            y: 各系列数据，每列一个系列
+            colors: 每个系列的颜色
+            line_styles: 每个系列的线型
+            linewidth: 线宽
+            series_idx: 每个系列降采样后保留的下标（None 表示全部数据点）
+
+        Returns:
+            添加到坐标轴上的 LineCollection
+        """
+        x_values = x.to_numpy()
+        # 与 ax.plot 一致地注册单位转换器（日期/分类坐标轴）
+        ax.xaxis.update_units(x_values)
+        x_num = np.asarray(ax.xaxis.convert_units(x_values), dtype=float)
+
+        n_series = y.shape[1]
+        y_values = y.to_numpy(dtype=float, na_value=np.nan)
+        if series_idx is not None:
+            # 降采样后各系列点数不同，逐系列组装
+            segments = [np.column_stack([x_num[idx], y_values[idx, k]]) for k, idx in enumerate(series_idx)]
+        else:
+            segments = np.empty((n_series, len(x_num), 2))
+            segments[:, :, 0] = x_num
+            segments[:, :, 1] = y_values.T
+
+        collection = LineCollection(
+            segments,
+            colors=colors[:n_series],
+            linestyles=line_styles[:n_series],
+            linewidths=linewidth,
+        )
+        ax.add_collection(collection, autolim=True)
+        ax.autoscale_view()
+        return collection
+
+    @staticmethod
+    def _draw_bar_collection(
+        ax,
+        x_pos: np.ndarray,
+        width: float,
+        offsets: np.ndarray,
+        values: np.ndarray,
+        bottoms: np.ndarray,
+        colors: List[str],
+        labels: List,
+    ) -> Optional[List[Patch]]:
+        """
+        用单个 PolyCollection 绘制全部柱子
+
+        Args:
+            ax: 目标坐标轴
+            x_pos: X 轴位置
+            width: 柱子宽度
+            offsets: 每个系列相对 X 位置的偏移
+            values: 柱子高度，形状为 (系列数, X 值数)
+            bottoms: 柱子底部，形状同 values
+            colors: 每个系列的颜色
+            labels: 每个系列的图例标签（None 表示不加入图例）
+
+        Returns:
+            图例代理句柄列表；所有系列都无标签时返回 None
+        """
+        lefts = x_pos[np.newaxis, :] + offsets[:, np.newaxis] - width / 2
+        rights = lefts + width
+        tops = bottoms + values
+
+        # 高度为 0 的柱子不可见，直接跳过
+        visible = values != 0
+        lefts, rights, bottoms, tops = lefts[visible], rights[visible], bottoms[visible], tops[visible]
+        verts = np.stack(
+            [
+                np.column_stack([lefts, bottoms]),
+                np.column_stack([lefts, tops]),
+                np.column_stack([rights, tops]),
+                np.column_stack([rights, bottoms]),
+            ],
+            axis=1,
+        )
+
+        series_rgba = to_rgba_array(colors, alpha=0.8)
+        series_idx = np.broadcast_to(np.arange(len(colors))[:, np.newaxis], values.shape)[visible]
+        collection = PolyCollection(verts, facecolors=series_rgba[series_idx], edgecolors="none")
+        # 与 ax.bar 一致，柱子底部作为自动缩放的粘性边界
+        collection.sticky_edges.y.append(0)
+        ax.add_collection(collection, autolim=True)
+        ax.autoscale_view()
+
+        if all(label is None for label in labels):
+            return None
+        return [
+            Patch(facecolor=color, alpha=0.8, label=label) for color, label in zip(colors, labels) if label is not None
+        ]
+
+    @_in_render_context
     def donut_chart(
         self,
         data: Union[Dict, pd.Series, pd.DataFrame],
@@ -215,7 +671,7 @@ class PlotGenerator:
         autotexts = pie_result[2] if len(pie_result) > 2 else []
 
         # 绘制内圆（创建环形效果）
-        centre_circle = plt.Circle((0, 0), 0.50, fc="white")
+        centre_circle = Circle((0, 0), 0.50, fc="white")
         ax.add_artist(centre_circle)
 
         # 设置标题
@@ -246,6 +702,7 @@ class PlotGenerator:
 
         return fig
 
+    @_in_render_context
     def line_chart(
         self,
         data: Union[pd.DataFrame, Dict],
@@ -258,6 +715,9 @@ class PlotGenerator:
         colors: Optional[List[str]] = None,
         line_styles: Optional[List[str]] = None,
         show_values: bool = False,  # 是否显示数值标签
+        fast_render: Optional[bool] = None,  # 是否合并为单个集合绘制
+        downsample: Optional[str] = None,  # 降采样方法 'lttb' / 'm4'
+        downsample_dpi: int = 300,  # 降采样目标分辨率
     ) -> plt.Figure:
         """
         绘制折线图
@@ -273,17 +733,18 @@ class PlotGenerator:
             colors: 颜色列表
             line_styles: 线型列表
             show_values: 是否在数据点上显示数值标签
+            fast_render: 是否将所有折线合并为单个 LineCollection 绘制（不绘制数据点标记），
+                None 时系列数超过 LINE_COLLECTION_THRESHOLD 自动启用
+            downsample: 按像素宽度降采样的方法（'lttb' 或 'm4'），None 表示绘制全部数据点
+            downsample_dpi: 降采样时假定的输出分辨率，目标宽度为 图宽(英寸) × downsample_dpi 像素
 
         Returns:
             matplotlib Figure 对象
         """
         fig, ax = self._setup_figure(figsize)
 
-        # 处理数据
-        if isinstance(data, dict):
-            df = pd.DataFrame(data)
-        else:
-            df = data.copy()
+        # 处理数据（只读访问，不拷贝，内存映射的数据保持零拷贝）
+        df = pd.DataFrame(data) if isinstance(data, dict) else data
 
         # 设置默认值
         if x_col is None:
@@ -302,22 +763,43 @@ class PlotGenerator:
                 line_styles = ["-", "--", "-.", ":"] * ((len(y_cols) // 4) + 1)
                 line_styles = line_styles[: len(y_cols)]
 
+        # 按输出像素宽度降采样，每个系列单独选点
+        series_idx = None
+        if downsample is not None:
+            target_width = int(fig.get_figwidth() * downsample_dpi)
+            x_data = df[x_col].to_numpy()
+            series_idx = [
+                downsample_indices(x_data, df[y_col].to_numpy(dtype=float, na_value=np.nan), target_width, downsample)
+                for y_col in y_cols
+            ]
+
         # 绘制折线
-        use_markers = len(y_cols) <= 20
-        for i, y_col in enumerate(y_cols):
-            ax.plot(
-                df[x_col],
-                df[y_col],
-                color=colors[i],
-                linestyle=line_styles[i],
-                linewidth=1.5 if len(y_cols) > 20 else 2.5,
-                marker="o" if use_markers else None,
-                markersize=4 if use_markers else 0,
-                label=y_col,
-            )
+        linewidth = 1.5 if len(y_cols) > 20 else 2.5
+        if fast_render is None:
+            fast_render = len(y_cols) > LINE_COLLECTION_THRESHOLD
+        if fast_render:
+            # 所有系列堆叠为二维数组，一次性绘制
+            self._draw_line_collection(ax, df[x_col], df[y_cols], colors, line_styles, linewidth, series_idx)
+        else:
+            use_markers = len(y_cols) <= 20
+            for i, y_col in enumerate(y_cols):
+                x_series, y_series = df[x_col], df[y_col]
+                if series_idx is not None:
+                    x_series, y_series = x_series.iloc[series_idx[i]], y_series.iloc[series_idx[i]]
+                ax.plot(
+                    x_series,
+                    y_series,
+                    color=colors[i],
+                    linestyle=line_styles[i],
+                    linewidth=linewidth,
+                    marker="o" if use_markers else None,
+                    markersize=4 if use_markers else 0,
+                    label=y_col,
+                )
 
-            # 添加数值标签（数据点过多时自动隐藏）
-            if show_values and len(df) <= 20:  # 最多显示20个数据点
+        # 添加数值标签（数据点过多时自动隐藏）
+        if show_values and len(df) <= 20:  # 最多显示20个数据点
+            for i, y_col in enumerate(y_cols):
                 x_data = df[x_col].values
                 y_data = df[y_col].values
                 for j, (x_val, y_val) in enumerate(zip(x_data, y_data)):
@@ -352,7 +834,10 @@ class PlotGenerator:
             ax.set_ylabel("数值", fontsize=12)
 
         # 设置X轴标签旋转（根据标签长度自动调整）
-        x_labels = df[x_col].astype(str).tolist()
+        if series_idx is not None:
+            x_labels = df[x_col].iloc[np.unique(np.concatenate(series_idx))].astype(str).tolist()
+        else:
+            x_labels = df[x_col].astype(str).tolist()
         max_label_length = max(len(str(label)) for label in x_labels)
         if max_label_length > 8:  # 标签较长时旋转
             rotation_angle = 45 if max_label_length > 15 else 30
@@ -361,7 +846,12 @@ class PlotGenerator:
             ax.tick_params(axis="x", rotation=0)
 
         # 添加图例（简洁样式；系列很多时仅抽样展示）
-        if len(y_cols) <= 10:
+        if len(y_cols) <= 10 and fast_render:
+            handles = [
+                Line2D([0], [0], color=colors[i], linestyle=line_styles[i], lw=linewidth) for i in range(len(y_cols))
+            ]
+            ax.legend(handles, y_cols, loc="best", frameon=False)
+        elif len(y_cols) <= 10:
             ax.legend(loc="best", frameon=False)
         else:
             # 抽样展示最多 10 条图例项，均匀抽样
@@ -376,6 +866,7 @@ class PlotGenerator:
 
         return fig
 
+    @_in_render_context
     def bar_chart(
         self,
         data: Union[pd.DataFrame, Dict],
@@ -389,6 +880,7 @@ class PlotGenerator:
         figsize: Optional[tuple] = None,
         colors: Optional[List[str]] = None,
         show_values: bool = False,  # 是否显示数值标签
+        fast_render: Optional[bool] = None,  # 是否合并为单个集合绘制
     ) -> plt.Figure:
         """
         绘制柱状图（支持分组、堆叠和分组+堆叠组合）
@@ -405,17 +897,16 @@ class PlotGenerator:
             figsize: 图片尺寸
             colors: 颜色列表
             show_values: 是否在柱子上显示数值标签
+            fast_render: 是否将所有柱子合并为单个 PolyCollection 绘制，
+                None 时柱子总数超过 BAR_COLLECTION_THRESHOLD 自动启用
 
         Returns:
             matplotlib Figure 对象
         """
         fig, ax = self._setup_figure(figsize)
 
-        # 处理数据
-        if isinstance(data, dict):
-            df = pd.DataFrame(data)
-        else:
-            df = data.copy()
+        # 处理数据（只读访问，不拷贝，内存映射的数据保持零拷贝）
+        df = pd.DataFrame(data) if isinstance(data, dict) else data
 
         # 设置默认值
         if x_col is None:
@@ -423,10 +914,8 @@ class PlotGenerator:
         if y_col is None:
             y_col = df.columns[1]  # 假设第二列是数值列
 
-        # 获取唯一值用于分组和堆叠
-        x_values = df[x_col].unique()
-        group_values = df[group_col].unique() if group_col else [None]
-        stack_values = df[stack_col].unique() if stack_col else [None]
+        # 一次性聚合为 (x × group × stack) 稠密矩阵，所有模式共用
+        x_values, group_values, stack_values, matrix = self._pivot_bar_data(df, x_col, y_col, group_col, stack_col)
 
         # 设置颜色
         if group_col and stack_col:
@@ -438,8 +927,13 @@ class PlotGenerator:
 
         # 设置 x 轴位置
         x_pos = np.arange(len(x_values))
+        n_x = len(x_values)
 
-        # 绘制柱状图 - 根据参数自动判断类型
+        # 根据参数自动判断类型，计算每个系列的偏移、数值和底部（形状均为 系列数 × X 值数）
+        # 堆叠底部为堆叠维度上的前缀和（不含自身）
+        stack_bottoms = np.concatenate(
+            [np.zeros((n_x, matrix.shape[1], 1)), np.cumsum(matrix, axis=2)[:, :, :-1]], axis=2
+        )
         if group_col and stack_col:
             # 分组+堆叠组合
             # 根据系列数量动态调整宽度
@@ -450,52 +944,12 @@ class PlotGenerator:
                 base_width = 0.7
             else:
                 base_width = 0.8
-            group_width = base_width / len(group_values)
-            color_idx = 0
-
-            for group_idx, group_val in enumerate(group_values):
-                offset = (group_idx - len(group_values) / 2 + 0.5) * group_width
-                bottom = np.zeros(len(x_values))
-
-                for stack_val in stack_values:
-                    # 获取特定分组和堆叠组合的数据
-                    subset = df[(df[group_col] == group_val) & (df[stack_col] == stack_val)]
-                    aggregated = subset.groupby(x_col)[y_col].sum()
-                    values = [aggregated.get(x_val, 0) for x_val in x_values]
-
-                    bars = ax.bar(
-                        x_pos + offset,
-                        values,
-                        group_width,
-                        bottom=bottom,
-                        label=f"{group_val}-{stack_val}",
-                        color=colors[color_idx % len(colors)],
-                        alpha=0.8,
-                    )
-
-                    # 添加数值标签（数据点过多时自动隐藏）
-                    if show_values and len(x_values) <= 15:  # 最多显示15个X轴值
-                        for i, (bar, value) in enumerate(zip(bars, values)):
-                            if value > 0:
-                                height = bar.get_height()
-                                y_pos = bar.get_y() + height / 2
-                                # 格式化数值，避免科学计数法
-                                if value >= 1000000:
-                                    value_str = f"{value/1000000:.1f}M"
-                                elif value >= 1000:
-                                    value_str = f"{value/1000:.1f}K"
-                                else:
-                                    value_str = f"{value:.0f}"
-                                ax.text(
-                                    bar.get_x() + bar.get_width() / 2,
-                                    y_pos,
-                                    value_str,
-                                    ha="center",
-                                    va="center",
-                                    fontsize=8,
-                                )
-                    bottom = bottom + values
-                    color_idx += 1
+            width = base_width / len(group_values)
+            group_offsets = (np.arange(len(group_values)) - len(group_values) / 2 + 0.5) * width
+            offsets = np.repeat(group_offsets, len(stack_values))
+            series_labels = [f"{group_val}-{stack_val}" for group_val in group_values for stack_val in stack_values]
+            series_values = matrix.reshape(n_x, -1).T
+            series_bottoms = stack_bottoms.reshape(n_x, -1).T
         elif group_col:
             # 分组柱状图
             # 根据系列数量动态调整宽度
@@ -506,46 +960,10 @@ class PlotGenerator:
             else:
                 base_width = 0.8
             width = base_width / len(group_values)
-            color_idx = 0
-            for group_val in group_values:
-                group_data = df[df[group_col] == group_val]
-                # 按 x 轴值聚合数据
-                aggregated = group_data.groupby(x_col)[y_col].sum()
-                values = [aggregated.get(x_val, 0) for x_val in x_values]
-
-                offset = (color_idx - len(group_values) / 2 + 0.5) * width
-                bars = ax.bar(
-                    x_pos + offset,
-                    values,
-                    width,
-                    label=group_val,
-                    color=colors[color_idx],
-                    alpha=0.8,
-                )
-
-                # 添加数值标签（数据点过多时自动隐藏）
-                if show_values and len(x_values) <= 15:  # 最多显示15个X轴值
-                    for i, (bar, value) in enumerate(zip(bars, values)):
-                        if value > 0:
-                            height = bar.get_height()
-                            y_pos = bar.get_y() + height / 2
-                            # 格式化数值，避免科学计数法
-                            if value >= 1000000:
-                                value_str = f"{value/1000000:.1f}M"
-                            elif value >= 1000:
-                                value_str = f"{value/1000:.1f}K"
-                            else:
-                                value_str = f"{value:.0f}"
-                            ax.text(
-                                bar.get_x() + bar.get_width() / 2,
-                                y_pos,
-                                value_str,
-                                ha="center",
-                                va="center",
-                                fontsize=8,
-                            )
-
-                color_idx += 1
+            offsets = (np.arange(len(group_values)) - len(group_values) / 2 + 0.5) * width
+            series_labels = list(group_values)
+            series_values = matrix[:, :, 0].T
+            series_bottoms = np.zeros_like(series_values)
         elif stack_col:
             # 堆叠柱状图
             # 根据系列数量动态调整宽度
@@ -555,47 +973,10 @@ class PlotGenerator:
                 width = 0.7
             else:
                 width = 0.8
-            bottom = np.zeros(len(x_values))
-            color_idx = 0
-            for stack_val in stack_values:
-                stack_data = df[df[stack_col] == stack_val]
-                aggregated = stack_data.groupby(x_col)[y_col].sum()
-                values = [aggregated.get(x_val, 0) for x_val in x_values]
-
-                bars = ax.bar(
-                    x_pos,
-                    values,
-                    width,
-                    bottom=bottom,
-                    label=stack_val,
-                    color=colors[color_idx],
-                    alpha=0.8,
-                )
-
-                # 添加数值标签（数据点过多时自动隐藏）
-                if show_values and len(x_values) <= 15:  # 最多显示15个X轴值
-                    for i, (bar, value) in enumerate(zip(bars, values)):
-                        if value > 0:
-                            height = bar.get_height()
-                            y_pos = bar.get_y() + height / 2
-                            # 格式化数值，避免科学计数法
-                            if value >= 1000000:
-                                value_str = f"{value/1000000:.1f}M"
-                            elif value >= 1000:
-                                value_str = f"{value/1000:.1f}K"
-                            else:
-                                value_str = f"{value:.0f}"
-                            ax.text(
-                                bar.get_x() + bar.get_width() / 2,
-                                y_pos,
-                                value_str,
-                                ha="center",
-                                va="center",
-                                fontsize=8,
-                            )
-
-                bottom = bottom + values
-                color_idx += 1
+            offsets = np.zeros(len(stack_values))
+            series_labels = list(stack_values)
+            series_values = matrix[:, 0, :].T
+            series_bottoms = stack_bottoms[:, 0, :].T
         else:
             # 简单柱状图
             # 根据数据点数量动态调整宽度
@@ -605,27 +986,43 @@ class PlotGenerator:
                 width = 0.7
             else:
                 width = 0.8
-            aggregated = df.groupby(x_col)[y_col].sum()
-            values = [aggregated.get(x_val, 0) for x_val in x_values]
-            bars = ax.bar(x_pos, values, width, color=colors[0], alpha=0.8)
+            offsets = np.zeros(1)
+            series_labels = [None]
+            series_values = matrix[:, 0, 0][np.newaxis, :]
+            series_bottoms = np.zeros_like(series_values)
+
+        series_colors = [colors[i % len(colors)] for i in range(len(series_labels))]
+
+        # 柱子数量较多时合并为单个集合绘制，避免逐个创建 Rectangle
+        if fast_render is None:
+            fast_render = series_values.size > BAR_COLLECTION_THRESHOLD
+        if fast_render:
+            legend_proxies = self._draw_bar_collection(
+                ax, x_pos, width, offsets, series_values, series_bottoms, series_colors, series_labels
+            )
+        else:
+            legend_proxies = None
+            for i, label in enumerate(series_labels):
+                bar_kwargs = {"label": label} if label is not None else {}
+                ax.bar(
+                    x_pos + offsets[i],
+                    series_values[i],
+                    width,
+                    bottom=series_bottoms[i],
+                    color=series_colors[i],
+                    alpha=0.8,
+                    **bar_kwargs,
+                )
 
-            # 添加数值标签（数据点过多时自动隐藏）
-            if show_values and len(x_values) <= 15:  # 最多显示15个X轴值
-                for i, (bar, value) in enumerate(zip(bars, values)):
+        # 添加数值标签（数据点过多时自动隐藏）
+        if show_values and len(x_values) <= 15:  # 最多显示15个X轴值
+            for i in range(len(series_labels)):
+                for x, value, bottom in zip(x_pos + offsets[i], series_values[i], series_bottoms[i]):
                     if value > 0:
-                        height = bar.get_height()
-                        y_pos = bar.get_y() + height / 2
-                        # 格式化数值，避免科学计数法
-                        if value >= 1000000:
-                            value_str = f"{value/1000000:.1f}M"
-                        elif value >= 1000:
-                            value_str = f"{value/1000:.1f}K"
-                        else:
-                            value_str = f"{value:.0f}"
                         ax.text(
-                            bar.get_x() + bar.get_width() / 2,
-                            y_pos,
-                            value_str,
+                            x,
+                            bottom + value / 2,
+                            self._format_bar_value(value),
                             ha="center",
                             va="center",
                             fontsize=8,
@@ -652,7 +1049,11 @@ class PlotGenerator:
             ax.set_xticklabels(x_values, rotation=0, ha="center")
 
         # 添加图例（限制最大显示10个）
-        handles, labels = ax.get_legend_handles_labels()
+        if legend_proxies is not None:
+            handles = legend_proxies
+            labels = [handle.get_label() for handle in handles]
+        else:
+            handles, labels = ax.get_legend_handles_labels()
         if len(labels) > 10:
             # 只显示前10个图例项
             handles = handles[:10]
@@ -660,19 +1061,101 @@ class PlotGenerator:
             # 添加省略号提示
             labels.append("...")
             handles.append(plt.Rectangle((0, 0), 1, 1, color="white", alpha=0))
-        ax.legend(handles, labels, loc="best", frameon=False)
+        if fast_render:
+            # loc="best" 需要逐个柱子计算遮挡，高基数时放到坐标轴外侧
+            ax.legend(handles, labels, loc="center left", bbox_to_anchor=(1, 0.5), frameon=False)
+        else:
+            ax.legend(handles, labels, loc="best", frameon=False)
 
         # 不显示网格
         ax.grid(False)
 
         return fig
 
+    def get_profile(self, profile: Union[str, RenderProfile]) -> RenderProfile:
+        """
+        获取渲染配置
+
+        Args:
+            profile: 配置名称（'thumbnail'、'web'、'retina'、'print' 或 render_profiles 中的名称），
+                或 RenderProfile 对象
+
+        Returns:
+            RenderProfile
+        """
+        if isinstance(profile, RenderProfile):
+            return profile
+        if profile not in self.render_profiles:
+            raise ValueError(f"不支持的渲染配置: {profile}，可选: {tuple(self.render_profiles)}")
+        return self.render_profiles[profile]
+
+    def _resolve_output(
+        self, format: str, dpi: int, profile: Union[str, RenderProfile, None]
+    ) -> Tuple[str, int, Optional[RenderProfile]]:
+        """指定 profile 时用配置中的格式和分辨率替换 format、dpi"""
+        if profile is None:
+            return format, dpi, None
+        profile = self.get_profile(profile)
+        return profile.format, profile.dpi, profile
+
+    def chart_palette(self) -> np.ndarray:
+        """
+        获取由本生成器配色派生的 8 位调色板（配色与白色背景的混合色加灰度）
+
+        Returns:
+            (K, 3) 的 uint8 RGB 数组，K <= 256
+        """
+        key = tuple(self.color_palette)
+        if self._chart_palette is None or self._chart_palette[0] != key:
+            colors = np.rint(to_rgba_array(list(key))[:, :3] * 255)
+            self._chart_palette = (key, chart_palette(colors))
+        return self._chart_palette[1]
+
+    def _encode_pixels(self, pixels: np.ndarray, stream, format: str, dpi: int, profile: RenderProfile):
+        """按配置的编码参数用 Pillow 编码 RGBA 像素"""
+        encode_image(
+            pixels,
+            stream,
+            format,
+            dpi,
+            compress_level=profile.compress_level,
+            quantize_colors=profile.quantize_colors,
+            palette=self.chart_palette() if profile.quantize_palette else None,
+            quality=profile.quality,
+            lossless=profile.lossless,
+        )
+
+    def _write_figure(
+        self, fig: plt.Figure, stream, format: str, dpi: int, bbox_inches, profile: Optional[RenderProfile] = None
+    ):
+        """
+        把图片编码写入 stream
+
+        配置中有 savefig 不支持的编码参数（压缩级别、调色板量化、质量等）时，先绘制为 RGBA 像素
+        再用 Pillow 编码，否则直接 savefig。
+        """
+        if profile is not None and profile.uses_pillow:
+            self._encode_pixels(self._rgba_pixels(fig, dpi, bbox_inches), stream, format, dpi, profile)
+        else:
+            fig.savefig(stream, format=format, dpi=dpi, bbox_inches=bbox_inches, **_savefig_kwargs(format))
+
+    def _savefig_buffer(
+        self, fig: plt.Figure, format: str, dpi: int, bbox_inches, profile: Optional[RenderProfile] = None
+    ) -> io.BytesIO:
+        """把图片保存到内存缓冲区"""
+        buffer = io.BytesIO()
+        self._write_figure(fig, buffer, format, dpi, bbox_inches, profile)
+        return buffer
+
+    @_in_render_context
     def figure_to_base64(
         self,
         fig: plt.Figure,
         format: str = "png",
         dpi: int = 300,
         bbox_inches: str = "tight",
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
     ) -> str:
         """
         将 matplotlib Figure 转换为 base64 字符串
@@ -682,26 +1165,436 @@ class PlotGenerator:
             format: 图片格式 ('png', 'jpg', 'svg')
             dpi: 图片分辨率
             bbox_inches: 边界框设置
+            close_after_render: 编码后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
 
         Returns:
             base64 编码的图片字符串
         """
-        # 创建内存缓冲区
-        buffer = io.BytesIO()
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        buffer = self._savefig_buffer(fig, format, dpi, bbox_inches, profile)
+        if close_after_render:
+            self.close_figure(fig)
+
+        # 直接编码缓冲区的视图，不复制图片字节；转为 str 前先释放图片
+        with buffer.getbuffer() as view:
+            encoded = base64.b64encode(view)
+        buffer.close()
+        return encoded.decode("ascii")
 
-        # 保存图片到缓冲区
-        fig.savefig(buffer, format=format, dpi=dpi, bbox_inches=bbox_inches)
-        buffer.seek(0)
+    @_in_render_context
+    def figure_to_bytes(
+        self,
+        fig: plt.Figure,
+        format: str = "png",
+        dpi: int = 300,
+        bbox_inches: str = "tight",
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
+    ) -> bytes:
+        """
+        将 matplotlib Figure 编码为图片字节
 
-        # 转换为 base64
-        image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+        Args:
+            fig: matplotlib Figure 对象
+            format: 图片格式
+            dpi: 图片分辨率
+            bbox_inches: 边界框设置
+            close_after_render: 编码后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
 
-        # 关闭缓冲区
-        buffer.close()
+        Returns:
+            图片字节
+        """
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        buffer = self._savefig_buffer(fig, format, dpi, bbox_inches, profile)
+        if close_after_render:
+            self.close_figure(fig)
+        return buffer.getvalue()
+
+    @_in_render_context
+    def figure_to_buffer(
+        self,
+        fig: plt.Figure,
+        format: str = "png",
+        dpi: int = 300,
+        bbox_inches: str = "tight",
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
+    ) -> memoryview:
+        """
+        将 matplotlib Figure 编码为图片，返回缓冲区的只读视图（零拷贝）
+
+        视图直接引用编码缓冲区，可传给 socket.sendall、file.write 等接受
+        bytes-like 对象的接口；需要 bytes 时用 figure_to_bytes。
+
+        Args:
+            fig: matplotlib Figure 对象
+            format: 图片格式
+            dpi: 图片分辨率
+            bbox_inches: 边界框设置
+            close_after_render: 编码后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
+
+        Returns:
+            图片字节的 memoryview
+        """
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        buffer = self._savefig_buffer(fig, format, dpi, bbox_inches, profile)
+        if close_after_render:
+            self.close_figure(fig)
+        return buffer.getbuffer().toreadonly()
+
+    def figure_to_data_uri(
+        self,
+        fig: plt.Figure,
+        format: str = "png",
+        dpi: int = 300,
+        bbox_inches: str = "tight",
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
+    ) -> str:
+        """
+        将 matplotlib Figure 转换为 data URI（如 "data:image/png;base64,..."）
+
+        Args:
+            fig: matplotlib Figure 对象
+            format: 图片格式
+            dpi: 图片分辨率
+            bbox_inches: 边界框设置
+            close_after_render: 编码后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
+
+        Returns:
+            data URI 字符串
+        """
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        prefix = data_uri_prefix(format)
+        return prefix + self.figure_to_base64(fig, format, dpi, bbox_inches, close_after_render, profile)
+
+    @_in_render_context
+    def write_base64(
+        self,
+        fig: plt.Figure,
+        stream,
+        format: str = "png",
+        dpi: int = 300,
+        bbox_inches: str = "tight",
+        data_uri: bool = False,
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
+    ) -> int:
+        """
+        将 matplotlib Figure 边编码边以 base64 写入文件或 socket，不在内存中保留完整图片
+
+        Args:
+            fig: matplotlib Figure 对象
+            stream: 目标流（有 write 或 sendall 方法）
+            format: 图片格式
+            dpi: 图片分辨率
+            bbox_inches: 边界框设置
+            data_uri: 是否先写出 data URI 前缀
+            close_after_render: 编码后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
+
+        Returns:
+            写出的字节数
+        """
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        prefix = data_uri_prefix(format) if data_uri else None
+        with Base64Writer(stream, prefix) as writer:
+            self._write_figure(fig, writer, format, dpi, bbox_inches, profile)
+        if close_after_render:
+            self.close_figure(fig)
+        return writer.bytes_written
+
+    @staticmethod
+    def _tight_bbox(fig: plt.Figure, dpi: float, pad_inches: Optional[float] = None) -> Bbox:
+        """
+        按 savefig(bbox_inches="tight") 的方式计算紧凑边界框（单位：英寸）
+
+        Args:
+            fig: matplotlib Figure 对象
+            dpi: 计算所用的分辨率（文字尺寸按该分辨率测量）
+            pad_inches: 留白，None 表示使用 rcParams["savefig.pad_inches"]
+
+        Returns:
+            加上留白后的边界框
+        """
+        if pad_inches is None:
+            pad_inches = mpl.rcParams["savefig.pad_inches"]
+        original_dpi = fig.dpi
+        fig.set_dpi(dpi)
+        try:
+            # 与 savefig 相同：先不输出地绘制一次完成布局，再测量
+            fig.draw_without_rendering()
+            bbox = fig.get_tightbbox()
+        finally:
+            fig.set_dpi(original_dpi)
+        return bbox.padded(pad_inches)
+
+    @staticmethod
+    def _raster_size(size_inches: tuple, dpi: float) -> tuple:
+        """与 Agg 画布相同的取整方式计算像素尺寸"""
+        return max(1, int(size_inches[0] * dpi)), max(1, int(size_inches[1] * dpi))
+
+    def _rgba_pixels(self, fig: plt.Figure, dpi: float, bbox_inches=None) -> np.ndarray:
+        """
+        绘制 Figure 并返回 (H, W, 4) 的 RGBA 像素
+
+        不裁剪且画布为 Agg 时直接返回画布缓冲区的视图（零拷贝）；
+        指定边界框时经 savefig 输出原始 RGBA 字节（复制一次，不编码）。
+
+        Args:
+            fig: matplotlib Figure 对象
+            dpi: 渲染分辨率
+            bbox_inches: None、'tight' 或 Bbox
+
+        Returns:
+            只读的 uint8 数组
+        """
+        if bbox_inches is None and isinstance(fig.canvas, FigureCanvasAgg):
+            original_dpi = fig.dpi
+            fig.set_dpi(dpi)
+            try:
+                fig.canvas.draw()
+            finally:
+                fig.set_dpi(original_dpi)
+            pixels = np.asarray(fig.canvas.buffer_rgba())
+        else:
+            if bbox_inches == "tight":
+                bbox_inches = self._tight_bbox(fig, dpi)
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format="rgba", dpi=dpi, bbox_inches=bbox_inches)
+            size_inches = (
+                tuple(fig.get_size_inches()) if bbox_inches is None else (bbox_inches.width, bbox_inches.height)
+            )
+            height = self._raster_size(size_inches, dpi)[1]
+            pixels = np.frombuffer(buffer.getbuffer(), dtype=np.uint8).reshape(height, -1, 4)
+        pixels.flags.writeable = False
+        return pixels
+
+    @_in_render_context
+    def figure_to_array(
+        self,
+        fig: plt.Figure,
+        dpi: int = 300,
+        bbox_inches: Optional[str] = None,
+        close_after_render: bool = False,
+    ) -> RasterResult:
+        """
+        将 matplotlib Figure 绘制为 RGBA 像素数组，不经过 PNG 编码和解码
+
+        默认（bbox_inches=None）返回 Agg 画布 buffer_rgba() 的零拷贝视图：之后再次以相同
+        分辨率绘制该 Figure 会覆盖数组内容，需要长期保留时请 copy()。
+
+        Args:
+            fig: matplotlib Figure 对象
+            dpi: 渲染分辨率
+            bbox_inches: 边界框设置，'tight' 时裁剪到紧凑边界框（复制一次）
+            close_after_render: 绘制后是否立即关闭并释放 Figure（像素数组仍然有效）
+
+        Returns:
+            RasterResult，pixels 为 (H, W, 4) 的只读 uint8 数组
+        """
+        pixels = self._rgba_pixels(fig, dpi, bbox_inches)
+        if close_after_render:
+            self.close_figure(fig)
+        return RasterResult(pixels=pixels, dpi=dpi)
+
+    def _draw_into(self, figures: Iterable, dpi: int, out: np.ndarray, close_after_render: bool) -> int:
+        """
+        把 Figure 依次绘制到 out[i]，所有 Figure 共用一个 Agg 渲染器
+
+        Args:
+            figures: Figure 序列（可以是惰性生成器）
+            dpi: 渲染分辨率
+            out: (N, H, W, 4) 的 uint8 数组
+            close_after_render: 每个 Figure 绘制后是否立即关闭
+
+        Returns:
+            绘制的 Figure 数量
+        """
+        renderer = None
+        count = 0
+        for index, fig in enumerate(figures):
+            original_dpi = fig.dpi
+            fig.set_dpi(dpi)
+            try:
+                if index >= len(out):
+                    raise ValueError(f"out 只能容纳 {len(out)} 张图片")
+                width, height = (int(size) for size in fig.bbox.size)
+                if out.shape[1:] != (height, width, 4):
+                    raise ValueError(f"图片尺寸 {(height, width, 4)} 与 out 的形状 {out.shape[1:]} 不一致")
+                if renderer is None:
+                    renderer = RendererAgg(width, height, dpi)
+                renderer.clear()
+                fig.draw(renderer)
+                out[index] = np.asarray(renderer.buffer_rgba())
+            finally:
+                fig.set_dpi(original_dpi)
+                if close_after_render:
+                    self.close_figure(fig)
+            count += 1
+        return count
+
+    def _batch_array(self, n_images: int, dpi: int, out: Optional[np.ndarray]) -> np.ndarray:
+        """按生成器的 figsize 预分配 (N, H, W, 4) 数组，或检查传入的 out"""
+        if out is None:
+            width, height = self._raster_size(self.figsize, dpi)
+            return np.empty((n_images, height, width, 4), dtype=np.uint8)
+        if out.dtype != np.uint8 or out.ndim != 4 or out.shape[3] != 4:
+            raise ValueError(f"out 必须是 (N, H, W, 4) 的 uint8 数组，实际为 {out.dtype} {out.shape}")
+        return out
+
+    @_in_render_context
+    def figures_to_array(
+        self,
+        figures: Sequence[plt.Figure],
+        dpi: int = 300,
+        out: Optional[np.ndarray] = None,
+        close_after_render: bool = False,
+    ) -> np.ndarray:
+        """
+        把多个 Figure 绘制到一个 (N, H, W, 4) 的 RGBA 数组
+
+        所有 Figure 共用一个渲染器，逐个绘制后复制到 out[i]，临时内存只有一张图的缓冲区。
+        各 Figure 的像素尺寸必须相同（相同的 figsize 和 dpi），不做边界框裁剪。
+
+        Args:
+            figures: Figure 序列
+            dpi: 渲染分辨率
+            out: 预分配的 (N, H, W, 4) uint8 数组，None 表示按本生成器的 figsize 分配
+            close_after_render: 每个 Figure 绘制后是否立即关闭
+
+        Returns:
+            out[:绘制的数量]
+        """
+        out = self._batch_array(len(figures), dpi, out)
+        return out[: self._draw_into(figures, dpi, out, close_after_render)]
+
+    @_in_render_context
+    def render_array_batch(
+        self,
+        specs: Iterable[Dict],
+        dpi: int = 300,
+        out: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        逐个创建图表并绘制到一个 (N, H, W, 4) 的 RGBA 数组，每个 Figure 绘制后立即关闭
+
+        任务格式与 render_batch 相同：{"chart_type": ..., "args": (...), "kwargs": {...}}，
+        其中的 format、dpi 等导出参数被忽略。
 
-        return image_base64
+        Args:
+            specs: 任务序列；传入 out 时可以是惰性生成器
+            dpi: 渲染分辨率
+            out: 预分配的 (N, H, W, 4) uint8 数组，None 表示按本生成器的 figsize 分配
+
+        Returns:
+            out[:任务数]
+        """
+        if out is None:
+            specs = list(specs)
+        out = self._batch_array(len(specs) if out is None else len(out), dpi, out)
+
+        def figures():
+            for spec in specs:
+                if spec["chart_type"] not in CHART_TYPES:
+                    raise ValueError(f"不支持的图表类型: {spec['chart_type']}，可选: {CHART_TYPES}")
+                yield getattr(self, spec["chart_type"])(*spec.get("args", ()), **spec.get("kwargs", {}))
+
+        return out[: self._draw_into(figures(), dpi, out, close_after_render=True)]
+
+    @_in_render_context
+    def export(
+        self,
+        fig: plt.Figure,
+        outputs: Dict[str, Dict],
+        bbox_inches: str = "tight",
+        pad_inches: Optional[float] = None,
+        close_after_render: bool = False,
+    ) -> Dict[str, RenderResult]:
+        """
+        绘制一次，导出多种格式和分辨率
+
+        "tight" 边界框只计算一次，所有输出共用；位图只按最高分辨率绘制一次，
+        较低分辨率由该 RGBA 像素按面积平均缩小得到，不再重新绘制；矢量格式各绘制一次。
+        最高分辨率的位图与 savefig 的输出逐字节一致。
+
+        用法:
+            results = plotter.export(fig, {
+                "thumb": {"dpi": 30},
+                "full": {"dpi": 300},
+                "vector": {"format": "svg"},
+                "page": {"profile": "web"},
+            })
+            html = f'<img src="{results["full"].to_data_uri()}">'
+
+        Args:
+            fig: matplotlib Figure 对象
+            outputs: 输出名 -> 导出参数（format 默认 'png'，dpi 默认 300；
+                profile 为渲染配置名称或 RenderProfile，指定时替换 format 和 dpi）
+            bbox_inches: 边界框设置（'tight'、Bbox 或 None）
+            pad_inches: 'tight' 边界框的留白，None 表示使用 rcParams["savefig.pad_inches"]
+            close_after_render: 编码后是否立即关闭并释放 Figure
 
-    def save_figure(self, fig: plt.Figure, filename: str, format: str = "png", dpi: int = 300) -> str:
+        Returns:
+            输出名 -> RenderResult
+        """
+        specs = {}
+        for name, spec in outputs.items():
+            unknown = set(spec) - {"format", "dpi", "profile"}
+            if unknown:
+                raise ValueError(f"不支持的导出参数: {sorted(unknown)}，可选: ('format', 'dpi', 'profile')")
+            format, dpi, profile = self._resolve_output(
+                spec.get("format", "png"), spec.get("dpi", 300), spec.get("profile")
+            )
+            specs[name] = (format.lower(), dpi, profile)
+        raster_dpi = max((dpi for format, dpi, _ in specs.values() if format in RASTER_FORMATS), default=None)
+
+        if bbox_inches == "tight":
+            bbox_inches = self._tight_bbox(fig, raster_dpi or fig.dpi, pad_inches)
+        size_inches = tuple(fig.get_size_inches()) if bbox_inches is None else (bbox_inches.width, bbox_inches.height)
+
+        pixels = {}
+        if raster_dpi is not None:
+            pixels[raster_dpi] = self._rgba_pixels(fig, raster_dpi, bbox_inches)
+
+        results = {}
+        for name, (format, dpi, profile) in specs.items():
+            if format not in RASTER_FORMATS:
+                buffer = self._savefig_buffer(fig, format, dpi, bbox_inches)
+                results[name] = RenderResult(data=buffer.getvalue(), format=format, dpi=dpi)
+                continue
+            if dpi not in pixels:
+                width, height = self._raster_size(size_inches, dpi)
+                pixels[dpi] = downscale_area(pixels[raster_dpi], width, height)
+            rgba = pixels[dpi]
+            buffer = io.BytesIO()
+            if profile is not None and profile.uses_pillow:
+                self._encode_pixels(rgba, buffer, format, dpi, profile)
+            else:
+                # 与 savefig 的位图后端相同的编码路径（含元数据与 JPEG 的背景合成）
+                imsave(buffer, rgba, format=format, dpi=dpi)
+            results[name] = RenderResult(
+                data=buffer.getvalue(), format=format, dpi=dpi, width=rgba.shape[1], height=rgba.shape[0]
+            )
+
+        if close_after_render:
+            self.close_figure(fig)
+        return results
+
+    @_in_render_context
+    def save_figure(
+        self,
+        fig: plt.Figure,
+        filename: str,
+        format: str = "png",
+        dpi: int = 300,
+        close_after_render: bool = False,
+        profile: Union[str, RenderProfile, None] = None,
+    ) -> str:
         """
         保存图片到文件
 
@@ -710,17 +1603,183 @@ class PlotGenerator:
             filename: 文件名（不含扩展名）
             format: 图片格式
             dpi: 图片分辨率
+            close_after_render: 保存后是否立即关闭并释放 Figure
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
 
         Returns:
             保存的文件路径
         """
-        import os
-
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
         os.makedirs("output", exist_ok=True)
         filepath = f"output/{filename}.{format}"
-        fig.savefig(filepath, format=format, dpi=dpi, bbox_inches="tight")
+        with open(filepath, "wb") as f:
+            self._write_figure(fig, f, format, dpi, "tight", profile)
+        if close_after_render:
+            self.close_figure(fig)
         return filepath
 
+    def close_figure(self, fig: plt.Figure):
+        """
+        关闭并释放 Figure
+
+        pyplot 模式下从 pyplot 的图形管理器中移除；同时清空图形内容并解除
+        current_fig/current_ax 对它的引用，使其可以被立即回收。
+
+        Args:
+            fig: matplotlib Figure 对象
+        """
+        if self.use_pyplot:
+            plt.close(fig)
+        fig.clear()
+        if self.current_fig is fig:
+            self.current_fig = None
+            self.current_ax = None
+
+    @contextlib.contextmanager
+    def chart_context(self, chart_type: str, *args, **kwargs):
+        """
+        以上下文管理器方式创建图表，退出时自动关闭 Figure
+
+        用法:
+            with plotter.chart_context("line_chart", df, "date", ["value"]) as fig:
+                plotter.save_figure(fig, "trend")
+
+        Args:
+            chart_type: 图表方法名（'donut_chart'、'line_chart'、'bar_chart'）
+            *args, **kwargs: 传给图表方法的参数
+
+        Yields:
+            matplotlib Figure 对象
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"不支持的图表类型: {chart_type}，可选: {CHART_TYPES}")
+        fig = getattr(self, chart_type)(*args, **kwargs)
+        try:
+            yield fig
+        finally:
+            self.close_figure(fig)
+
+    @_in_render_context
+    def render(
+        self,
+        chart_type: str,
+        *args,
+        format: str = "png",
+        dpi: int = 300,
+        bbox_inches: str = "tight",
+        profile: Union[str, RenderProfile, None] = None,
+        **kwargs,
+    ) -> RenderResult:
+        """
+        绘制图表并编码，返回不持有 Figure 的渲染结果
+
+        Figure 在编码后立即关闭，适合长时间运行、反复渲染的服务进程。
+        配置了 render_cache 时，相同数据（只计算实际用到的列）、图表参数、格式和分辨率
+        直接返回缓存结果，不再建图和编码。
+
+        Args:
+            chart_type: 图表方法名（'donut_chart'、'line_chart'、'bar_chart'）
+            *args: 传给图表方法的位置参数
+            format: 图片格式
+            dpi: 图片分辨率
+            bbox_inches: 边界框设置
+            profile: 渲染配置名称或 RenderProfile，指定时替换 format 和 dpi
+            **kwargs: 传给图表方法的关键字参数
+
+        Returns:
+            RenderResult 渲染结果
+        """
+        format, dpi, profile = self._resolve_output(format, dpi, profile)
+        cache_key = None
+        if self.render_cache is not None:
+            cache_key = self._render_cache_key(chart_type, args, kwargs, format, dpi, bbox_inches, profile)
+            cached = self.render_cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        with self.chart_context(chart_type, *args, **kwargs) as fig:
+            buffer = self._savefig_buffer(fig, format, dpi, bbox_inches, profile)
+
+        data = buffer.getvalue()
+        width = height = None
+        if format.lower() in RASTER_FORMATS:
+            # 只解析图片头部获取尺寸
+            with Image.open(io.BytesIO(data)) as image:
+                width, height = image.size
+        result = RenderResult(data=data, format=format, dpi=dpi, width=width, height=height, chart_type=chart_type)
+        if cache_key is not None:
+            self.render_cache.put(cache_key, result)
+        return result
+
+    @_in_render_context
+    def render_many(
+        self,
+        chart_type: str,
+        *args,
+        outputs: Dict[str, Dict],
+        bbox_inches: str = "tight",
+        **kwargs,
+    ) -> Dict[str, RenderResult]:
+        """
+        绘制图表并一次导出多种格式和分辨率（见 export），Figure 在编码后立即关闭
+
+        不经过 render_cache。
+
+        Args:
+            chart_type: 图表方法名（'donut_chart'、'line_chart'、'bar_chart'）
+            *args: 传给图表方法的位置参数
+            outputs: 输出名 -> 导出参数（format 默认 'png'，dpi 默认 300）
+            bbox_inches: 边界框设置
+            **kwargs: 传给图表方法的关键字参数
+
+        Returns:
+            输出名 -> RenderResult
+        """
+        with self.chart_context(chart_type, *args, **kwargs) as fig:
+            results = self.export(fig, outputs, bbox_inches)
+        return {name: dataclasses.replace(result, chart_type=chart_type) for name, result in results.items()}
+
+    def _render_cache_key(
+        self,
+        chart_type: str,
+        args: tuple,
+        kwargs: Dict,
+        format: str,
+        dpi: int,
+        bbox_inches,
+        profile: Optional[RenderProfile] = None,
+    ) -> str:
+        """
+        计算 render() 的缓存键
+
+        Args:
+            chart_type: 图表方法名
+            args, kwargs: 传给图表方法的参数
+            format, dpi, bbox_inches, profile: 导出参数
+
+        Returns:
+            缓存键
+        """
+        if chart_type not in CHART_TYPES:
+            raise ValueError(f"不支持的图表类型: {chart_type}，可选: {CHART_TYPES}")
+        bound = inspect.signature(getattr(self, chart_type)).bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = dict(bound.arguments)
+        data = arguments.pop("data")
+
+        params = {name: repr(value) for name, value in arguments.items()}
+        params.update(
+            chart_type=chart_type,
+            format=format.lower(),
+            dpi=dpi,
+            bbox_inches=repr(bbox_inches),
+            profile=repr(profile),
+            figsize=repr(self.figsize),
+            color_palette=repr(self.color_palette),
+            rc_params=self._rc_key if not self.use_pyplot else repr(sorted(plt.rcParams.items())),
+        )
+        return make_cache_key(fingerprint_data(data, used_columns(arguments)), params)
+
 
 def demo():
     """演示函数"""
@@ -0,0 +1,255 @@
+"""
+渲染缓存模块
+按输入数据指纹与图表参数缓存编码后的图片，支持内存 LRU 与可选的磁盘二级缓存
+"""
+
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+# 图表方法中会从数据里取列的参数名
+DATA_COLUMN_ARGS = ("x_col", "y_col", "y_cols", "group_col", "stack_col", "label_col", "value_col")
+
+# 为 None 时由数据列推断默认值的参数名（此时需要对全部列做指纹）
+DEFAULTED_COLUMN_ARGS = ("x_col", "y_col", "y_cols")
+
+
+def fingerprint_data(data, columns: Optional[Iterable] = None) -> str:
+    """
+    计算输入数据的指纹
+
+    DataFrame 只对实际用到的列做逐行哈希（pd.util.hash_pandas_object），
+    并带上列名与 dtype；Series 连同索引一起哈希；字典按键值顺序哈希。
+
+    Args:
+        data: 字典、pandas Series 或 DataFrame
+        columns: DataFrame 中参与绘图的列，None 表示全部列
+
+    Returns:
+        十六进制指纹字符串
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(data, pd.DataFrame):
+        if columns is not None:
+            columns = [col for col in dict.fromkeys(columns) if col in data.columns]
+            data = data[columns]
+        digest.update(repr([(str(col), str(dtype)) for col, dtype in data.dtypes.items()]).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(data, index=False).to_numpy().tobytes())
+    elif isinstance(data, pd.Series):
+        digest.update(repr((data.name, str(data.dtype))).encode("utf-8"))
+        digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    elif isinstance(data, dict):
+        digest.update(repr([(key, np.asarray(value).tolist()) for key, value in data.items()]).encode("utf-8"))
+    else:
+        digest.update(repr(data).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def used_columns(arguments: Dict) -> Optional[list]:
+    """
+    根据图表参数找出 DataFrame 中实际用到的列
+
+    Args:
+        arguments: 图表方法绑定后的参数字典
+
+    Returns:
+        列名列表；存在需要从数据推断的默认列时返回 None（表示全部列）
+    """
+    columns = []
+    for name in DATA_COLUMN_ARGS:
+        if name not in arguments:
+            continue
+        value = arguments[name]
+        if value is None:
+            if name in DEFAULTED_COLUMN_ARGS:
+                return None
+            continue
+        if isinstance(value, (list, tuple)):
+            columns.extend(value)
+        else:
+            columns.append(value)
+    return columns
+
+
+def make_cache_key(data_fingerprint: str, params: Dict) -> str:
+    """
+    由数据指纹与其余参数生成缓存键
+
+    Args:
+        data_fingerprint: 数据指纹
+        params: 图表参数、输出格式、分辨率以及生成器设置
+
+    Returns:
+        十六进制缓存键
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(data_fingerprint.encode("utf-8"))
+    digest.update(repr(sorted(params.items(), key=lambda item: item[0])).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """
+    渲染结果缓存
+
+    一级为内存 LRU，按编码字节数控制容量；可选二级为磁盘目录，按文件总大小淘汰
+    最久未访问的条目。内存淘汰的结果仍保留在磁盘上，磁盘命中后会回填内存。
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: int = 1024 * 1024 * 1024,
+    ):
+        """
+        初始化渲染缓存
+
+        Args:
+            max_bytes: 内存缓存的字节上限
+            disk_dir: 磁盘缓存目录，None 表示不启用磁盘缓存
+            disk_max_bytes: 磁盘缓存的字节上限
+        """
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict()
+        self._memory_bytes = 0
+        self._stats = {"hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0, "disk_evictions": 0}
+
+        self._disk_index = OrderedDict()  # 键 -> 文件大小，按访问时间排序
+        self._disk_bytes = 0
+        if disk_dir is not None:
+            os.makedirs(disk_dir, exist_ok=True)
+            self._load_disk_index()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, f"{key}.render")
+
+    def _load_disk_index(self):
+        """扫描磁盘目录，按修改时间重建 LRU 顺序"""
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if name.endswith(".render"):
+                stat = os.stat(os.path.join(self.disk_dir, name))
+                entries.append((stat.st_mtime, name[: -len(".render")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._disk_index[key] = size
+            self._disk_bytes += size
+        self._evict_disk()
+
+    def get(self, key: str):
+        """
+        查询缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            缓存的渲染结果，未命中返回 None
+        """
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                return self._memory[key]
+
+            if key in self._disk_index:
+                path = self._disk_path(key)
+                try:
+                    with open(path, "rb") as f:
+                        result = pickle.load(f)
+                except (OSError, pickle.UnpicklingError, EOFError):
+                    self._disk_bytes -= self._disk_index.pop(key)
+                else:
+                    os.utime(path)
+                    self._disk_index.move_to_end(key)
+                    self._stats["disk_hits"] += 1
+                    self._put_memory(key, result)
+                    return result
+
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, result):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            result: 渲染结果（需有 nbytes 属性）
+        """
+        with self._lock:
+            self._put_memory(key, result)
+            if self.disk_dir is not None and key not in self._disk_index:
+                self._put_disk(key, result)
+
+    def _put_memory(self, key: str, result):
+        if result.nbytes > self.max_bytes:
+            return
+        if key in self._memory:
+            self._memory_bytes -= self._memory.pop(key).nbytes
+        self._memory[key] = result
+        self._memory_bytes += result.nbytes
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.nbytes
+            self._stats["evictions"] += 1
+
+    def _put_disk(self, key: str, result):
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        size = os.path.getsize(path)
+        self._disk_index[key] = size
+        self._disk_bytes += size
+        self._evict_disk()
+
+    def _evict_disk(self):
+        while self._disk_bytes > self.disk_max_bytes and self._disk_index:
+            key, size = self._disk_index.popitem(last=False)
+            self._disk_bytes -= size
+            self._stats["disk_evictions"] += 1
+            try:
+                os.remove(self._disk_path(key))
+            except FileNotFoundError:
+                pass
+
+    def clear(self):
+        """清空内存与磁盘缓存（统计计数保留）"""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            for key in list(self._disk_index):
+                try:
+                    os.remove(self._disk_path(key))
+                except FileNotFoundError:
+                    pass
+            self._disk_index.clear()
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict:
+        """
+        获取缓存统计
+
+        Returns:
+            包含命中、未命中、淘汰次数以及当前条目数和字节数的字典
+        """
+        with self._lock:
+            return {
+                **self._stats,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_entries": len(self._disk_index),
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,655 @@
+"""
+流式写入模块
+把分批生成的 DataFrame 写入 Parquet、Feather、CSV、JSON Lines 和 Excel，内存占用与总行数无关
+"""
+
+import codecs
+import os
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from openpyxl import Workbook
+
+# 每个行组的默认行数
+DEFAULT_ROW_GROUP_SIZE = 1_000_000
+
+# 所有分区待写出数据的默认总字节数上限
+DEFAULT_MAX_PENDING_BYTES = 256 * 1024 * 1024
+
+PARQUET_COMPRESSIONS = ("none", "snappy", "gzip", "brotli", "lz4", "zstd")
+
+FEATHER_COMPRESSIONS = ("none", "lz4", "zstd")
+
+# 文本格式（CSV、JSON Lines）的压缩算法及对应的文件扩展名
+TEXT_COMPRESSIONS = ("none", "gzip", "zstd")
+TEXT_COMPRESSION_SUFFIXES = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+# 文本格式每个编码块的行数
+DEFAULT_CHUNK_ROWS = 100_000
+
+# Excel 单个工作表的最大行数（含表头）
+EXCEL_MAX_ROWS = 1_048_576
+
+_NS_PER_SECOND = 1_000_000_000
+_NS_PER_DAY = 86_400 * _NS_PER_SECOND
+
+
+def _partition_dirname(col: str, value) -> str:
+    """hive 风格的分区目录名，如 region=North、month=2024-01-31"""
+    if isinstance(value, pd.Timestamp):
+        value = value.strftime("%Y-%m-%d") if value == value.normalize() else value.isoformat()
+    return f"{col}={quote(str(value), safe='')}"
+
+
+def _pending_nbytes(table: pa.Table) -> int:
+    """
+    表在缓冲中占用的字节数
+
+    字典列只计索引：各分区 take 出的表共享同一批数据的字典，
+    按 nbytes 计算会把字典在每个分区重复计入
+    """
+    total = 0
+    for column in table.columns:
+        for chunk in column.chunks:
+            total += chunk.indices.nbytes if pa.types.is_dictionary(chunk.type) else chunk.nbytes
+    return total
+
+
+class _PartitionWriter:
+    """单个分区（或未分区时的整个数据集）的缓冲写入器，攒满一个行组再写出"""
+
+    def __init__(self, path: str, schema: pa.Schema, writer_kwargs: Dict):
+        self.path = path
+        self._schema = schema
+        self._writer_kwargs = writer_kwargs
+        self._writer = None
+        self._pending: List[pa.Table] = []
+        self.pending_rows = 0
+        self.pending_bytes = 0
+        self.rows_written = 0
+
+    def append(self, table: pa.Table):
+        self._pending.append(table)
+        self.pending_rows += table.num_rows
+        self.pending_bytes += _pending_nbytes(table)
+
+    def flush(self, row_group_size: int, final: bool = False):
+        """写出已攒满的行组；final=True 时把剩余行也写出"""
+        if self.pending_rows < row_group_size and not (final and self.pending_rows):
+            return
+        table = pa.concat_tables(self._pending) if len(self._pending) > 1 else self._pending[0]
+        n_write = table.num_rows if final else table.num_rows // row_group_size * row_group_size
+        if self._writer is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self._schema, **self._writer_kwargs)
+        self._writer.write_table(table.slice(0, n_write), row_group_size=row_group_size)
+        self.rows_written += n_write
+        rest = table.slice(n_write)
+        self._pending = [rest] if rest.num_rows else []
+        self.pending_rows = rest.num_rows
+        self.pending_bytes = _pending_nbytes(rest) if rest.num_rows else 0
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ParquetSink:
+    """
+    流式 Parquet 写入器
+
+    逐批接收 DataFrame，按 partition_cols 拆分为 hive 风格的分区目录
+    （root/region=North/month=2024-01-31/part-0.parquet），每个分区攒满
+    row_group_size 行写出一个行组，多个分区的编码与压缩在线程池中并发执行。
+    所有分区待写出的数据超过 max_pending_bytes 时，把缓冲最多的分区提前写成
+    较小的行组，直到待写出数据不超过上限的一半，内存占用约为 max_pending_bytes 加一批数据，
+    另加每个已打开分区文件的少量写入器状态。
+
+    用法:
+        with ParquetSink("data/sales", partition_cols=["region"]) as sink:
+            for batch in iter_sales_data(products=100_000, months=36):
+                sink.write(batch)
+        pd.read_parquet("data/sales", filters=[("region", "=", "North")])
+    """
+
+    def __init__(
+        self,
+        path: str,
+        partition_cols: Optional[Sequence[str]] = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "snappy",
+        compression_level: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        max_pending_bytes: Optional[int] = DEFAULT_MAX_PENDING_BYTES,
+    ):
+        """
+        初始化 Parquet 写入器
+
+        Args:
+            path: 未分区时为输出文件路径，分区时为数据集根目录
+            partition_cols: 分区列名列表，None 表示不分区
+            row_group_size: 每个行组的行数
+            compression: 压缩算法 ('none', 'snappy', 'gzip', 'brotli', 'lz4', 'zstd')
+            compression_level: 压缩级别，None 表示使用算法默认值
+            max_workers: 并发写入分区的线程数，默认 min(8, CPU 核数)
+            max_pending_bytes: 所有分区待写出数据（Arrow 内存）的总字节数上限，None 表示不限制，
+                只在攒满 row_group_size 行时写出
+        """
+        if compression not in PARQUET_COMPRESSIONS:
+            raise ValueError(f"不支持的压缩算法: {compression}，可选: {PARQUET_COMPRESSIONS}")
+        if row_group_size < 1:
+            raise ValueError(f"不支持的行组大小: {row_group_size}")
+        if max_pending_bytes is not None and max_pending_bytes < 1:
+            raise ValueError(f"不支持的待写出字节数上限: {max_pending_bytes}")
+
+        self.path = path
+        self.partition_cols = list(partition_cols or [])
+        self.row_group_size = row_group_size
+        self.max_pending_bytes = max_pending_bytes
+        self._writer_kwargs = {"compression": compression, "compression_level": compression_level}
+        self._max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._executor = None
+        self._schema = None
+        self._partitions: Dict[tuple, _PartitionWriter] = {}
+        self._dictionaries: Dict[int, pa.Array] = {}  # 列序号 -> 上一批的字典
+        self._closed = False
+
+    def _partition(self, key: tuple) -> _PartitionWriter:
+        partition = self._partitions.get(key)
+        if partition is None:
+            if self.partition_cols:
+                dirs = [_partition_dirname(col, value) for col, value in zip(self.partition_cols, key)]
+                path = os.path.join(self.path, *dirs, "part-0.parquet")
+            else:
+                path = self.path
+            partition = _PartitionWriter(path, self._schema, self._writer_kwargs)
+            self._partitions[key] = partition
+        return partition
+
+    def _flush(self, partitions: List[_PartitionWriter], final: bool = False):
+        """并发写出各分区（同一分区在一次调用中只由一个线程写入）"""
+        if len(partitions) <= 1 or self._max_workers == 1:
+            for partition in partitions:
+                partition.flush(self.row_group_size, final)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+        # list() 等待全部完成并传播异常
+        list(self._executor.map(lambda partition: partition.flush(self.row_group_size, final), partitions))
+
+    def write(self, batch: pd.DataFrame):
+        """
+        写入一批数据
+
+        Args:
+            batch: DataFrame，各批的列与类型需一致
+        """
+        if self._closed:
+            raise ValueError("ParquetSink 已关闭")
+        if len(batch) == 0:
+            return
+        missing = [col for col in self.partition_cols if col not in batch.columns]
+        if missing:
+            raise ValueError(f"分区列不存在: {missing}")
+
+        data = batch.drop(columns=self.partition_cols) if self.partition_cols else batch
+        if self._schema is None:
+            self._schema = pa.Schema.from_pandas(data, preserve_index=False)
+
+        # 整批只转换一次 Arrow 表，分区用 take 取行，类别列的字典在各分区间共享
+        table = self._share_dictionaries(pa.Table.from_pandas(data, schema=self._schema, preserve_index=False))
+        if not self.partition_cols:
+            self._partition(()).append(table)
+        else:
+            keys = batch[self.partition_cols]
+            for key, index in keys.groupby(
+                self.partition_cols, sort=False, observed=True, dropna=False
+            ).indices.items():
+                key = key if isinstance(key, tuple) else (key,)
+                self._partition(key).append(table.take(index))
+
+        spill = self._over_budget()
+        self._flush(spill, final=True)
+        ready = [p for p in self._partitions.values() if p.pending_rows >= self.row_group_size and p not in spill]
+        self._flush(ready)
+
+    def _share_dictionaries(self, table: pa.Table) -> pa.Table:
+        """
+        字典内容与之前的批相同时改用同一个字典数组
+
+        每批转换都会新建字典，缓冲中只要还有某一批的行，这一批的字典就不会释放；
+        复用后所有批只保留一份字典
+        """
+        for i, column in enumerate(table.columns):
+            if not pa.types.is_dictionary(column.type):
+                continue
+            chunks = []
+            for chunk in column.chunks:
+                cached = self._dictionaries.get(i)
+                if cached is not None and chunk.dictionary.equals(cached):
+                    chunk = pa.DictionaryArray.from_arrays(chunk.indices, cached)
+                else:
+                    self._dictionaries[i] = chunk.dictionary
+                chunks.append(chunk)
+            table = table.set_column(i, table.field(i), pa.chunked_array(chunks, column.type))
+        return table
+
+    def _over_budget(self) -> List[_PartitionWriter]:
+        """待写出数据超过上限时，按缓冲字节数从大到小选出需要提前写出的分区"""
+        if self.max_pending_bytes is None:
+            return []
+        total = self.pending_bytes
+        if total <= self.max_pending_bytes:
+            return []
+        # 降到上限的一半，避免之后每批都只写出很小的行组
+        spill = []
+        for partition in sorted(self._partitions.values(), key=lambda p: p.pending_bytes, reverse=True):
+            if total <= self.max_pending_bytes // 2 or not partition.pending_rows:
+                break
+            spill.append(partition)
+            total -= partition.pending_bytes
+        return spill
+
+    def close(self) -> List[str]:
+        """
+        写出剩余数据并关闭所有文件
+
+        Returns:
+            写出的文件路径列表
+        """
+        if self._closed:
+            return self.files
+        try:
+            self._flush([p for p in self._partitions.values() if p.pending_rows], final=True)
+        finally:
+            for partition in self._partitions.values():
+                partition.close()
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._closed = True
+        return self.files
+
+    @property
+    def files(self) -> List[str]:
+        """已写出数据的文件路径"""
+        return [p.path for p in self._partitions.values() if p.rows_written]
+
+    @property
+    def rows_written(self) -> int:
+        """已写出的总行数"""
+        return sum(p.rows_written for p in self._partitions.values())
+
+    @property
+    def pending_bytes(self) -> int:
+        """尚未写出的数据字节数"""
+        return sum(p.pending_bytes for p in self._partitions.values())
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class FeatherSink:
+    """
+    流式 Feather（Arrow IPC 文件格式）写入器，每批写出一个 record batch
+
+    默认不压缩：读取时可以内存映射，数值列和时间列零拷贝（见 data.load_dataframe）；
+    压缩后文件更小，但读取时需要解压到内存。
+    类别列各批的类别需一致（IPC 文件格式不支持替换字典），compact 生成器满足这一点。
+
+    用法:
+        with FeatherSink("data/sales.feather") as sink:
+            for batch in iter_sales_data(products=100_000, months=36, compact=True):
+                sink.write(batch)
+    """
+
+    def __init__(self, path: str, compression: str = "none", compression_level: Optional[int] = None):
+        """
+        初始化 Feather 写入器
+
+        Args:
+            path: 输出文件路径
+            compression: 压缩算法 ('none', 'lz4', 'zstd')
+            compression_level: 压缩级别，None 表示使用算法默认值
+        """
+        if compression not in FEATHER_COMPRESSIONS:
+            raise ValueError(f"不支持的压缩算法: {compression}，可选: {FEATHER_COMPRESSIONS}")
+
+        self.path = path
+        codec = None if compression == "none" else pa.Codec(compression, compression_level=compression_level)
+        self._options = pa.ipc.IpcWriteOptions(compression=codec)
+        self._file = None
+        self._writer = None
+        self._schema = None
+        self.rows_written = 0
+        self._closed = False
+
+    def write(self, batch: pd.DataFrame):
+        """
+        写入一批数据
+
+        Args:
+            batch: DataFrame，各批的列与类型需一致
+        """
+        if self._closed:
+            raise ValueError("FeatherSink 已关闭")
+        table = pa.Table.from_pandas(batch, schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._schema = table.schema
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._file = pa.OSFile(self.path, "wb")
+            self._writer = pa.ipc.new_file(self._file, self._schema, options=self._options)
+        self._writer.write_table(table)
+        self.rows_written += len(batch)
+
+    def close(self) -> str:
+        """
+        写出文件尾并关闭文件
+
+        Returns:
+            输出文件路径
+        """
+        if self._closed:
+            return self.path
+        try:
+            if self._writer is not None:
+                self._writer.close()
+        finally:
+            if self._file is not None:
+                self._file.close()
+            self._closed = True
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _TextSink(ABC):
+    """
+    文本格式写入器的公共部分
+
+    每 chunk_rows 行为一块，编码与压缩在线程池中并发执行（Arrow 的 CSV 编码和
+    压缩都会释放 GIL），写出顺序与输入顺序一致。压缩时每块是一个独立的
+    gzip member / zstd frame，拼接后仍是合法的 .gz / .zst 文件。
+    """
+
+    def __init__(
+        self,
+        path: str,
+        compression: str = "none",
+        compression_level: Optional[int] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        max_workers: Optional[int] = None,
+    ):
+        """
+        初始化写入器
+
+        Args:
+            path: 输出文件路径（压缩时建议带 .gz / .zst 后缀）
+            compression: 压缩算法 ('none', 'gzip', 'zstd')
+            compression_level: 压缩级别，None 表示使用算法默认值
+            chunk_rows: 每个编码块的行数
+            max_workers: 并发编码、压缩的线程数，默认 min(8, CPU 核数)
+        """
+        if compression not in TEXT_COMPRESSIONS:
+            raise ValueError(f"不支持的压缩算法: {compression}，可选: {TEXT_COMPRESSIONS}")
+        if chunk_rows < 1:
+            raise ValueError(f"不支持的块大小: {chunk_rows}")
+
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self._compression = compression
+        self._compression_level = compression_level
+        self._max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self._executor = None
+        self._futures = deque()
+        self._n_chunks = 0
+        self.rows_written = 0
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._file = open(path, "wb")
+        self._closed = False
+
+    @abstractmethod
+    def _encode(self, frame: pd.DataFrame, first: bool):
+        """把一块数据编码为字节（bytes 或 pa.Buffer），first 表示文件的第一块"""
+
+    def _encode_chunk(self, frame: pd.DataFrame, first: bool):
+        data = self._encode(frame, first)
+        if self._compression == "none":
+            return data
+        # Codec 对象不是线程安全的，每块新建一个
+        return pa.Codec(self._compression, compression_level=self._compression_level).compress(data)
+
+    def write(self, batch: pd.DataFrame):
+        """
+        写入一批数据
+
+        Args:
+            batch: DataFrame，各批的列需一致
+        """
+        if self._closed:
+            raise ValueError(f"{type(self).__name__} 已关闭")
+        for start in range(0, len(batch), self.chunk_rows):
+            chunk = batch.iloc[start : start + self.chunk_rows]
+            first = self._n_chunks == 0
+            self._n_chunks += 1
+            if self._max_workers == 1:
+                self._file.write(self._encode_chunk(chunk, first))
+            else:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
+                self._futures.append(self._executor.submit(self._encode_chunk, chunk, first))
+                # 限制排队的块数，内存占用与总行数无关
+                while len(self._futures) > 2 * self._max_workers:
+                    self._file.write(self._futures.popleft().result())
+            self.rows_written += len(chunk)
+
+    def close(self) -> str:
+        """
+        写出剩余数据并关闭文件
+
+        Returns:
+            输出文件路径
+        """
+        if self._closed:
+            return self.path
+        try:
+            while self._futures:
+                self._file.write(self._futures.popleft().result())
+        finally:
+            self._file.close()
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+            self._closed = True
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def _csv_table(frame: pd.DataFrame) -> pa.Table:
+    """
+    转为 Arrow 表，时间列按 pandas to_csv 的习惯输出：
+    全为零点时只写日期，全为整秒时不写小数部分
+    """
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    for i, name in enumerate(table.column_names):
+        column = frame.iloc[:, i]
+        if not pd.api.types.is_datetime64_dtype(column) or table.schema.field(i).type.tz is not None:
+            continue
+        values = column.to_numpy("M8[ns]")
+        ticks = values[~np.isnat(values)].view("i8")
+        if (ticks % _NS_PER_DAY == 0).all():
+            target = pa.date32()
+        elif (ticks % _NS_PER_SECOND == 0).all():
+            target = pa.timestamp("s")
+        else:
+            continue
+        table = table.set_column(i, name, table.column(i).cast(target))
+    return table
+
+
+class CsvSink(_TextSink):
+    """
+    流式 CSV 写入器，使用 pyarrow 的 CSV 编码器（字符串列统一加引号，读取结果与 to_csv 相同）
+
+    用法:
+        with CsvSink("data/sales.csv.gz", compression="gzip") as sink:
+            for batch in iter_sales_data(products=100_000, months=36):
+                sink.write(batch)
+    """
+
+    def __init__(self, path: str, bom: bool = True, **options):
+        """
+        初始化 CSV 写入器
+
+        Args:
+            path: 输出文件路径
+            bom: 是否在文件开头写入 UTF-8 BOM（与 to_csv(encoding="utf-8-sig") 一致，便于 Excel 识别）
+            **options: 见 _TextSink（compression、compression_level、chunk_rows、max_workers）
+        """
+        super().__init__(path, **options)
+        self.bom = bom
+
+    def _encode(self, frame: pd.DataFrame, first: bool):
+        prefix = codecs.BOM_UTF8 if first and self.bom else b""
+        try:
+            table = _csv_table(frame)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            # 混合类型的 object 列等 Arrow 无法转换的数据，回退到 pandas
+            return prefix + frame.to_csv(index=False, header=first).encode("utf-8")
+        buffer = pa.BufferOutputStream()
+        buffer.write(prefix)
+        pa_csv.write_csv(table, buffer, pa_csv.WriteOptions(include_header=first))
+        return buffer.getvalue()
+
+
+class JsonLinesSink(_TextSink):
+    """
+    流式 JSON Lines（NDJSON）写入器，每行一条记录
+
+    用法:
+        with JsonLinesSink("data/sales.jsonl.zst", compression="zstd") as sink:
+            for batch in iter_sales_data(products=100_000, months=36):
+                sink.write(batch)
+        pd.read_json("data/sales.jsonl.zst", lines=True)
+    """
+
+    def _encode(self, frame: pd.DataFrame, first: bool):
+        text = frame.to_json(orient="records", lines=True, date_format="iso")
+        # 旧版 pandas 的 lines=True 输出末尾没有换行
+        return (text if text.endswith("\n") else text + "\n").encode("utf-8")
+
+
+def _excel_values(column: pd.Series) -> list:
+    """转为 openpyxl 可写入的 Python 对象列表，缺失值为 None（空单元格）"""
+    return column.astype(object).where(column.notna(), None).tolist()
+
+
+class ExcelSink:
+    """
+    流式 Excel 写入器，使用 openpyxl 的 write-only 模式
+
+    行数据直接写入临时文件，不构建完整的工作簿对象模型，内存占用与总行数无关。
+    超过单表行数上限时自动新建工作表（Sheet1、Sheet1_2、Sheet1_3……），
+    每个工作表都带表头。
+
+    用法:
+        with ExcelSink("data/sales.xlsx") as sink:
+            for batch in iter_sales_data(products=100_000, months=36):
+                sink.write(batch)
+    """
+
+    def __init__(self, path: str, sheet_name: str = "Sheet1", max_rows: int = EXCEL_MAX_ROWS):
+        """
+        初始化 Excel 写入器
+
+        Args:
+            path: 输出文件路径（.xlsx）
+            sheet_name: 工作表名，后续工作表依次追加 _2、_3 后缀
+            max_rows: 每个工作表的最大行数（含表头），不能超过 Excel 的上限 1048576
+        """
+        if not 2 <= max_rows <= EXCEL_MAX_ROWS:
+            raise ValueError(f"不支持的工作表行数: {max_rows}，范围: 2 ~ {EXCEL_MAX_ROWS}")
+
+        self.path = path
+        self.sheet_name = sheet_name
+        self.max_rows = max_rows
+        self.sheet_names: List[str] = []
+        self.rows_written = 0
+        self._workbook = Workbook(write_only=True)
+        self._sheet = None
+        self._sheet_rows = 0
+        self._header = None
+        self._closed = False
+
+    def _new_sheet(self):
+        n = len(self.sheet_names) + 1
+        title = self.sheet_name if n == 1 else f"{self.sheet_name}_{n}"
+        self._sheet = self._workbook.create_sheet(title)
+        self.sheet_names.append(title)
+        self._sheet_rows = 0
+        if self._header is not None:
+            self._sheet.append(self._header)
+            self._sheet_rows = 1
+
+    def write(self, batch: pd.DataFrame):
+        """
+        写入一批数据
+
+        Args:
+            batch: DataFrame，各批的列需一致
+        """
+        if self._closed:
+            raise ValueError("ExcelSink 已关闭")
+        if self._header is None:
+            self._header = [str(col) for col in batch.columns]
+        columns = [_excel_values(batch.iloc[:, i]) for i in range(batch.shape[1])]
+        for row in zip(*columns):
+            if self._sheet is None or self._sheet_rows >= self.max_rows:
+                self._new_sheet()
+            self._sheet.append(row)
+            self._sheet_rows += 1
+        self.rows_written += len(batch)
+
+    def close(self) -> str:
+        """
+        保存并关闭工作簿
+
+        Returns:
+            输出文件路径
+        """
+        if self._closed:
+            return self.path
+        if self._sheet is None:
+            # 没有数据时仍输出一个（只有表头的）工作表
+            self._new_sheet()
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        self._workbook.save(self.path)
+        self._closed = True
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,63 @@
+"""
+柱状图绘制性能基准：逐系列 ax.bar 与单个 PolyCollection 的对比
+
+运行: python test/benchmark_bar_render.py
+"""
+
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.plot import PlotGenerator  # noqa: E402
+
+N_SERIES = 40  # 4 组 × 10 层堆叠
+BAR_COUNTS = [400, 2000, 8000, 20000]
+
+
+def make_data(n_x, n_groups=4, n_stacks=10):
+    """构造分组+堆叠长表"""
+    rng = np.random.default_rng(42)
+    index = pd.MultiIndex.from_product(
+        [np.arange(n_x), [f"G{g}" for g in range(n_groups)], [f"S{s}" for s in range(n_stacks)]],
+        names=["x", "group", "stack"],
+    )
+    df = index.to_frame(index=False)
+    df["value"] = rng.integers(1, 100, len(df))
+    return df
+
+
+def time_render(plotter, df, fast_render):
+    """返回 (建图耗时, 绘制+tight 保存耗时)，单位秒"""
+    start = time.perf_counter()
+    fig = plotter.bar_chart(df, x_col="x", y_col="value", group_col="group", stack_col="stack", fast_render=fast_render)
+    built = time.perf_counter()
+    fig.savefig(io.BytesIO(), format="png", dpi=100, bbox_inches="tight")
+    done = time.perf_counter()
+    plt.close(fig)
+    return built - start, done - built
+
+
+def main():
+    plotter = PlotGenerator()
+    print(
+        f"{'柱子数':>8} | {'ax.bar 建图':>10} {'ax.bar 绘制':>10} | {'集合 建图':>9} {'集合 绘制':>9} | {'加速比':>6}"
+    )
+    for n_bars in BAR_COUNTS:
+        df = make_data(n_bars // N_SERIES)
+        patch_build, patch_draw = time_render(plotter, df, fast_render=False)
+        fast_build, fast_draw = time_render(plotter, df, fast_render=True)
+        speedup = (patch_build + patch_draw) / (fast_build + fast_draw)
+        print(
+            f"{n_bars:>8} | {patch_build:>10.3f} {patch_draw:>10.3f} | {fast_build:>9.3f} {fast_draw:>9.3f} | {speedup:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
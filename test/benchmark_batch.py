@@ -0,0 +1,64 @@
+"""
+批量渲染扩展性基准：不同工作进程数下的吞吐量
+
+运行: python test/benchmark_batch.py [--charts 200] [--dpi 150]
+"""
+
+import argparse
+import os
+import time
+
+from src.batch import render_batch
+from src.data import generate_sales_data, generate_time_series_data
+
+
+def make_specs(n_charts, dpi):
+    """构造轮流覆盖环形图、折线图、分组和堆叠柱状图的任务"""
+    ts_data = generate_time_series_data(days=365)
+    sales_data = generate_sales_data(products=20, months=12)
+    sales_data["月份"] = sales_data["month"].dt.strftime("%Y-%m")
+    templates = [
+        {"chart_type": "donut_chart", "args": (sales_data["category"].value_counts(),)},
+        {"chart_type": "line_chart", "args": (ts_data, "date", ["value"])},
+        {
+            "chart_type": "bar_chart",
+            "args": (sales_data,),
+            "kwargs": {"x_col": "月份", "y_col": "sales", "group_col": "region"},
+        },
+        {
+            "chart_type": "bar_chart",
+            "args": (sales_data,),
+            "kwargs": {"x_col": "月份", "y_col": "sales", "stack_col": "category"},
+        },
+    ]
+    return [{**templates[i % len(templates)], "dpi": dpi} for i in range(n_charts)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="批量渲染扩展性基准")
+    parser.add_argument("--charts", type=int, default=200, help="图表数量")
+    parser.add_argument("--dpi", type=int, default=150, help="渲染分辨率")
+    args = parser.parse_args()
+
+    specs = make_specs(args.charts, args.dpi)
+    n_cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, n_cpus} & set(range(1, n_cpus + 1)))
+    print(f"CPU 核数: {n_cpus}，图表数: {args.charts}")
+    print(f"{'进程数':>6} | {'耗时(s)':>8} | {'图表/s':>8} | {'加速比':>6} | {'效率':>6}")
+
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        failed = sum(not r.ok for r in render_batch(specs, workers=workers))
+        elapsed = time.perf_counter() - start
+        if failed:
+            print(f"   {failed} 个任务失败")
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(
+            f"{workers:>6} | {elapsed:>8.2f} | {args.charts / elapsed:>8.1f} | {speedup:>5.2f}x | {speedup / workers:>6.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
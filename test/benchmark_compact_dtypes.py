@@ -0,0 +1,67 @@
+"""
+紧凑类型基准：内存占用与 Parquet 文件大小、写入耗时
+
+运行: python test/benchmark_compact_dtypes.py [--customers 2000000] [--products 50000] [--points 2000000]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from src.data import generate_customer_data, generate_sales_data, generate_time_series_data, memory_report
+
+
+def parquet_stats(df, directory, name):
+    """返回 (写入耗时 s, 文件字节数)"""
+    path = os.path.join(directory, f"{name}.parquet")
+    start = time.perf_counter()
+    df.to_parquet(path, index=False)
+    return time.perf_counter() - start, os.path.getsize(path)
+
+
+def compare(name, original, compact, directory):
+    print(f"\n===== {name}（{len(original):,} 行）=====")
+    with pd.option_context("display.width", 120, "display.max_columns", None):
+        report = memory_report(original, compact)
+        report[["original_bytes", "compact_bytes"]] = (report[["original_bytes", "compact_bytes"]] / 1e6).round(1)
+        print(report.rename(columns={"original_bytes": "original_MB", "compact_bytes": "compact_MB"}).round(2))
+
+    write_before, size_before = parquet_stats(original, directory, f"{name}_original")
+    write_after, size_after = parquet_stats(compact, directory, f"{name}_compact")
+    print(f"Parquet 大小: {size_before / 1e6:.1f} MB -> {size_after / 1e6:.1f} MB")
+    print(f"Parquet 写入: {write_before:.2f} s -> {write_after:.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="紧凑类型基准")
+    parser.add_argument("--customers", type=int, default=2_000_000, help="客户数量")
+    parser.add_argument("--products", type=int, default=50_000, help="产品数量（× 36 个月）")
+    parser.add_argument("--points", type=int, default=2_000_000, help="时间序列点数（按分钟）")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        compare(
+            "customers",
+            generate_customer_data(customers=args.customers),
+            generate_customer_data(customers=args.customers, compact=True),
+            directory,
+        )
+        compare(
+            "sales",
+            generate_sales_data(products=args.products, months=36),
+            generate_sales_data(products=args.products, months=36, compact=True),
+            directory,
+        )
+        compare(
+            "time_series",
+            generate_time_series_data(days=args.points, freq="min"),
+            generate_time_series_data(days=args.points, freq="min", compact=True),
+            directory,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+紧凑位图编码基准：环形图、折线图、柱状图在各编码方式下的大小、编码耗时和像素误差
+
+编码前的 RGBA 像素只绘制一次，耗时只统计编码（savefig 一行为绘制 + 编码的参照）。
+
+运行: python test/benchmark_compact_encoding.py [--dpi 80] [--repeat 5]
+"""
+
+import argparse
+import io
+import statistics
+import time
+
+import numpy as np
+from PIL import Image
+
+from src.encoding import encode_image
+from src.plot import PlotGenerator
+from test.benchmark_render_profiles import build_figures
+
+
+def encodings(plotter):
+    """编码方式名称 -> encode_image 参数"""
+    palette = plotter.chart_palette()
+    return {
+        "PNG RGBA (zlib 6)": {},
+        "PNG RGBA (zlib 1)": {"compress_level": 1},
+        "PNG RGBA (zlib 9)": {"compress_level": 9},
+        "PNG 自适应 256 色": {"quantize_colors": 256},
+        "PNG 配色调色板": {"palette": palette},
+        "PNG 配色调色板 (zlib 9)": {"palette": palette, "compress_level": 9},
+        "WebP 无损": {"format": "webp", "lossless": True},
+        "WebP 有损 q80": {"format": "webp", "quality": 80},
+        "JPEG q85": {"format": "jpg", "quality": 85},
+    }
+
+
+def measure(func, repeat):
+    """返回 (耗时中位数 s, 最后一次的返回值)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def encode(pixels, options):
+    stream = io.BytesIO()
+    encode_image(pixels, stream, **options)
+    return stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="紧凑位图编码基准")
+    parser.add_argument("--dpi", type=int, default=80, help="渲染分辨率")
+    parser.add_argument("--series", type=int, default=10, help="折线条数")
+    parser.add_argument("--points", type=int, default=365, help="每条折线的点数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取中位数）")
+    args = parser.parse_args()
+
+    plotter = PlotGenerator(use_pyplot=False)
+    figures = build_figures(plotter, args.series, args.points)
+    for chart, fig in figures.items():
+        savefig_time, savefig_png = measure(lambda: plotter.figure_to_bytes(fig, dpi=args.dpi), args.repeat)
+        pixels = plotter.figure_to_array(fig, dpi=args.dpi, bbox_inches="tight").pixels.copy()
+        baseline = len(savefig_png)
+        print(f"\n{chart}: {pixels.shape[1]}x{pixels.shape[0]} @ {args.dpi} dpi")
+        print(f"{'编码':<24} | {'大小(KB)':>9} | {'相对':>6} | {'耗时(ms)':>9} | {'平均误差':>8}")
+        print(
+            f"{'savefig PNG（绘制+编码）':<24} | {baseline / 1024:>9.1f} | {1:>6.2f} | {savefig_time * 1000:>9.1f} | {0:>8.2f}"
+        )
+        for label, options in encodings(plotter).items():
+            elapsed, data = measure(lambda: encode(pixels, options), args.repeat)
+            decoded = np.asarray(Image.open(io.BytesIO(data)).convert("RGB"), dtype=np.int16)
+            error = np.abs(decoded - pixels[..., :3]).mean()
+            print(
+                f"{label:<24} | {len(data) / 1024:>9.1f} | {len(data) / baseline:>6.2f} | {elapsed * 1000:>9.1f} | {error:>8.2f}"
+            )
+        plotter.close_figure(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+并行数据生成基准：不同工作进程数下的吞吐量（结果逐位一致）
+
+运行: python test/benchmark_data_parallel.py [--products 200000] [--months 36]
+"""
+
+import argparse
+import os
+import time
+
+from src.data import generate_sales_data
+
+
+def main():
+    parser = argparse.ArgumentParser(description="并行数据生成基准")
+    parser.add_argument("--products", type=int, default=200_000, help="产品数量")
+    parser.add_argument("--months", type=int, default=36, help="月份数量")
+    args = parser.parse_args()
+
+    n_rows = args.products * args.months
+    n_cpus = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, 8, n_cpus} & set(range(1, n_cpus + 1)))
+    print(f"CPU 核数: {n_cpus}，行数: {n_rows:,}")
+    print(f"{'进程数':>6} | {'耗时(s)':>8} | {'行/秒':>12} | {'加速比':>6} | 结果一致")
+
+    baseline = None
+    for workers in worker_counts:
+        start = time.perf_counter()
+        df = generate_sales_data(products=args.products, months=args.months, workers=workers)
+        elapsed = time.perf_counter() - start
+        if baseline is None:
+            baseline, reference = elapsed, df
+        print(
+            f"{workers:>6} | {elapsed:>8.2f} | {n_rows / elapsed:>12,.0f} | {baseline / elapsed:>5.2f}x | {df.equals(reference)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
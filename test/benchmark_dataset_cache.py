@@ -0,0 +1,48 @@
+"""
+数据集缓存基准：直接生成、缓存未命中（生成并写入）与命中（内存映射读取）的耗时
+
+运行: python test/benchmark_dataset_cache.py [--products 100000] [--months 36] [--customers 5000000]
+"""
+
+import argparse
+import tempfile
+import time
+
+from src.data import generate_customer_data, generate_sales_data
+from src.dataset_cache import DatasetCache
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="数据集缓存基准")
+    parser.add_argument("--products", type=int, default=100_000, help="产品数量")
+    parser.add_argument("--months", type=int, default=36, help="月份数量")
+    parser.add_argument("--customers", type=int, default=5_000_000, help="客户数量")
+    args = parser.parse_args()
+
+    cases = [
+        ("sales", generate_sales_data, {"products": args.products, "months": args.months}),
+        ("sales compact", generate_sales_data, {"products": args.products, "months": args.months, "compact": True}),
+        ("customers compact", generate_customer_data, {"customers": args.customers, "compact": True}),
+    ]
+    print(f"{'数据集':<18} | {'行数':>11} | {'直接生成(s)':>11} | {'未命中(s)':>9} | {'命中(s)':>8} | {'加速比':>7}")
+    with tempfile.TemporaryDirectory() as directory:
+        cache = DatasetCache(directory)
+        for label, generator, kwargs in cases:
+            generate_time, df = timed(lambda: generator(**kwargs))
+            miss_time, _ = timed(lambda: cache.get_or_generate(generator, **kwargs))
+            hit_time, _ = timed(lambda: cache.get_or_generate(generator, **kwargs))
+            print(
+                f"{label:<18} | {len(df):>11,} | {generate_time:>11.2f} | {miss_time:>9.2f} | "
+                f"{hit_time:>8.3f} | {generate_time / hit_time:>6.0f}x"
+            )
+        print(f"\n缓存统计: {cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
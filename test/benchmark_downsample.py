@@ -0,0 +1,61 @@
+"""
+折线降采样基准：全量绘制与 LTTB / M4 降采样的耗时、PNG 大小和视觉误差对比
+
+运行: python test/benchmark_downsample.py
+"""
+
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.plot import PlotGenerator  # noqa: E402
+
+DPI = 100
+N_POINTS = [100_000, 1_000_000]
+
+
+def make_data(n):
+    """构造带缺口的百万级传感器序列"""
+    rng = np.random.default_rng(42)
+    values = rng.normal(0, 1, n).cumsum() + 5 * np.sin(np.arange(n) / 2000)
+    values[n // 3 : n // 3 + n // 100] = np.nan
+    return pd.DataFrame({"time": pd.date_range("2024-01-01", periods=n, freq="s"), "sensor": values})
+
+
+def render(plotter, df, downsample):
+    """返回 (耗时秒, PNG 字节数, RGBA 数组)"""
+    start = time.perf_counter()
+    fig = plotter.line_chart(df, "time", ["sensor"], downsample=downsample, downsample_dpi=DPI)
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=DPI)
+    elapsed = time.perf_counter() - start
+    fig.canvas.draw()
+    rgba = np.asarray(fig.canvas.buffer_rgba())[..., :3].astype(np.int16)
+    plt.close(fig)
+    return elapsed, buffer.getbuffer().nbytes, rgba
+
+
+def main():
+    plotter = PlotGenerator()
+    print(f"{'点数':>9} {'方法':>5} | {'耗时(s)':>8} {'PNG(KB)':>8} | {'平均像素误差':>10} {'差异像素占比':>10}")
+    for n in N_POINTS:
+        df = make_data(n)
+        full_time, full_size, full_rgba = render(plotter, df, None)
+        print(f"{n:>9} {'全量':>5} | {full_time:>8.3f} {full_size / 1024:>8.1f} | {'-':>10} {'-':>10}")
+        for method in ("lttb", "m4"):
+            elapsed, size, rgba = render(plotter, df, method)
+            diff = np.abs(rgba - full_rgba)
+            mean_error = diff.mean()
+            changed = (diff.max(axis=2) > 32).mean()
+            print(f"{n:>9} {method:>5} | {elapsed:>8.3f} {size / 1024:>8.1f} | {mean_error:>10.3f} {changed:>10.2%}")
+
+
+if __name__ == "__main__":
+    main()
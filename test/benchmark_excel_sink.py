@@ -0,0 +1,82 @@
+"""
+Excel 写入基准：pandas to_excel 与 ExcelSink（write-only 模式）的耗时和峰值 RSS 对比
+
+每种方式在独立子进程中运行，峰值 RSS 取自 resource.getrusage
+
+运行: python test/benchmark_excel_sink.py [--products 10000] [--months 36]
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODES = {
+    "to_excel": "pandas to_excel（整表）",
+    "sink": "ExcelSink（整表）",
+    "stream": "ExcelSink（分批生成）",
+}
+
+
+def peak_rss_mb():
+    """当前进程的峰值 RSS（MB），Linux 上 ru_maxrss 单位为 KB，macOS 上为字节"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def child(mode, products, months, path):
+    """在子进程中执行一种写入方式，以 JSON 输出耗时与 RSS"""
+    from src.data import generate_sales_data, iter_sales_data
+    from src.writers import ExcelSink
+
+    df = None if mode == "stream" else generate_sales_data(products=products, months=months)
+    baseline = peak_rss_mb()
+    start = time.perf_counter()
+    if mode == "to_excel":
+        df.to_excel(path, index=False)
+    else:
+        with ExcelSink(path) as sink:
+            for batch in iter_sales_data(products=products, months=months) if df is None else [df]:
+                sink.write(batch)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"time": elapsed, "baseline": baseline, "peak": peak_rss_mb(), "size": os.path.getsize(path)}))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Excel 写入基准")
+    parser.add_argument("--products", type=int, default=10_000, help="产品数量")
+    parser.add_argument("--months", type=int, default=36, help="月份数量")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES), help="要运行的写入方式")
+    parser.add_argument("--child", choices=list(MODES), help=argparse.SUPPRESS)
+    parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child, args.products, args.months, args.path)
+        return
+
+    print(f"行数: {args.products * args.months:,}")
+    print(f"{'方式':<24} | {'耗时(s)':>8} | {'峰值 RSS(MB)':>12} | {'写入增量(MB)':>12} | {'文件(MB)':>8}")
+    with tempfile.TemporaryDirectory() as directory:
+        for mode in args.modes:
+            path = os.path.join(directory, f"{mode}.xlsx")
+            command = [sys.executable, os.path.abspath(__file__), "--child", mode, "--path", path]
+            command += ["--products", str(args.products), "--months", str(args.months)]
+            proc = subprocess.run(
+                command, cwd=ROOT, capture_output=True, text=True, check=True, env={**os.environ, "PYTHONPATH": ROOT}
+            )
+            result = json.loads(proc.stdout.strip().splitlines()[-1])
+            print(
+                f"{MODES[mode]:<24} | {result['time']:>8.2f} | {result['peak']:>12.1f} | "
+                f"{result['peak'] - result['baseline']:>12.1f} | {result['size'] / 1e6:>8.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+图片输出基准：原 figure_to_base64 与字节、memoryview、data URI、流式 base64 输出的
+耗时与 Python 堆峰值（tracemalloc）对比
+
+运行: python test/benchmark_image_output.py [--series 200] [--points 500] [--dpi 300] [--repeat 5]
+"""
+
+import argparse
+import base64
+import io
+import os
+import statistics
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.plot import PlotGenerator, _savefig_kwargs
+
+
+def original_figure_to_base64(fig, format="png", dpi=300, bbox_inches="tight"):
+    """改动前的实现：getvalue 复制一次，编码后再解码为 str"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format=format, dpi=dpi, bbox_inches=bbox_inches, **_savefig_kwargs(format))
+    buffer.seek(0)
+    image_base64 = base64.b64encode(buffer.getvalue()).decode("utf-8")
+    buffer.close()
+    return image_base64
+
+
+class _Discard:
+    """丢弃写入内容的文件对象，用于测量 savefig 本身的开销"""
+
+    def __init__(self):
+        self._position = 0
+
+    def write(self, data):
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        raise io.UnsupportedOperation("不支持 seek")
+
+
+def measure(func, repeat):
+    """返回 (耗时中位数 s, Python 堆峰值 bytes)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return statistics.median(times), peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="图片输出基准")
+    parser.add_argument("--series", type=int, default=200, help="折线条数（线条越密，PNG 越大）")
+    parser.add_argument("--points", type=int, default=500, help="每条折线的点数")
+    parser.add_argument("--dpi", type=int, default=300, help="输出分辨率")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取中位数）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {"x": np.arange(args.points), **{f"s{i}": rng.normal(size=args.points).cumsum() for i in range(args.series)}}
+    )
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = plotter.line_chart(df, x_col="x")
+    dpi = args.dpi
+    png_bytes = len(plotter.figure_to_bytes(fig, dpi=dpi))
+    print(f"PNG 大小: {png_bytes / 1e6:.2f} MB（{dpi} dpi）")
+
+    with open(os.devnull, "wb") as devnull:
+        cases = {
+            "savefig 基线（丢弃输出）": lambda: fig.savefig(_Discard(), format="png", dpi=dpi, bbox_inches="tight"),
+            "原 figure_to_base64": lambda: original_figure_to_base64(fig, dpi=dpi),
+            "figure_to_base64": lambda: plotter.figure_to_base64(fig, dpi=dpi),
+            "figure_to_bytes": lambda: plotter.figure_to_bytes(fig, dpi=dpi),
+            "figure_to_buffer": lambda: plotter.figure_to_buffer(fig, dpi=dpi),
+            "figure_to_data_uri": lambda: plotter.figure_to_data_uri(fig, dpi=dpi),
+            "write_base64 (文件)": lambda: plotter.write_base64(fig, devnull, dpi=dpi, data_uri=True),
+        }
+        print(f"{'方式':<22} | {'耗时(ms)':>9} | {'峰值(MB)':>9} | {'峰值/PNG':>8}")
+        for label, func in cases.items():
+            elapsed, peak = measure(func, args.repeat)
+            print(f"{label:<22} | {elapsed * 1000:>9.1f} | {peak / 1e6:>9.2f} | {peak / png_bytes:>8.2f}")
+    plotter.close_figure(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+导入耗时基准：在全新进程中用 python -X importtime 统计 src、src.data、src.plot 的冷启动导入时间
+
+运行: python test/benchmark_import_time.py [--repeat 5] [--top 8]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+MODULES = ["src", "src.data", "src.plot"]
+
+# 导入 src 后不应被加载的重量级依赖
+HEAVY_MODULES = ["matplotlib", "pandas", "numpy"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_profile(statement):
+    """
+    在新进程中执行导入语句并解析 -X importtime 输出
+
+    Returns:
+        (总耗时 us, {模块名: (自身耗时 us, 累计耗时 us)}, 已加载的重量级依赖)
+    """
+    code = f"{statement}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "MPLBACKEND": "Agg"},
+    )
+    timings = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # 输出格式为 "| " + 每层两个空格的缩进 + 模块名，顶层模块的累计耗时之和即整条语句的耗时
+        if not name[1:].startswith(" "):
+            total += int(cumulative_us)
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    loaded = [m for m in proc.stdout.strip().splitlines()[-1].split(",") if m] if proc.stdout.strip() else []
+    return total, timings, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="导入耗时基准")
+    parser.add_argument("--repeat", type=int, default=5, help="每个模块重复次数（取最小值）")
+    parser.add_argument("--top", type=int, default=8, help="列出自身耗时最多的模块数")
+    args = parser.parse_args()
+
+    statements = {module: f"import {module}" for module in MODULES}
+    statements["src.__version__"] = "import src; src.__version__"
+    statements["src.generate_sales_data"] = "import src; src.generate_sales_data"
+
+    print(f"{'导入语句':<28} | {'耗时(ms)':>9} | 已加载的重量级依赖")
+    profiles = {}
+    for label, statement in statements.items():
+        runs = [import_profile(statement) for _ in range(args.repeat)]
+        total, timings, loaded = min(runs, key=lambda run: run[0])
+        profiles[label] = timings
+        print(f"{label:<28} | {total / 1000:>9.1f} | {', '.join(loaded) or '-'}")
+
+    for module in MODULES:
+        timings = profiles[module]
+        heaviest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[: args.top]
+        print(f"\n{module} 自身耗时最多的模块:")
+        for name, (self_us, cumulative_us) in heaviest:
+            print(f"   {name:<40} 自身 {self_us / 1000:>7.1f} ms   累计 {cumulative_us / 1000:>7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
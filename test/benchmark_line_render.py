@@ -0,0 +1,61 @@
+"""
+折线图绘制性能基准：逐系列 ax.plot 与单个 LineCollection 的对比
+
+运行: python test/benchmark_line_render.py
+"""
+
+import io
+import time
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from src.plot import PlotGenerator  # noqa: E402
+
+N_POINTS = 100
+SERIES_COUNTS = [100, 500, 2000, 5000]
+
+
+def make_data(n_series, n_points=N_POINTS):
+    """构造多系列时间序列宽表"""
+    rng = np.random.default_rng(42)
+    values = rng.normal(0, 1, size=(n_points, n_series)).cumsum(axis=0)
+    y_cols = [f"s{i:04d}" for i in range(n_series)]
+    df = pd.DataFrame(values, columns=y_cols)
+    df.insert(0, "date", pd.date_range("2024-01-01", periods=n_points, freq="D"))
+    return df, y_cols
+
+
+def time_render(plotter, df, y_cols, fast_render):
+    """返回 (建图耗时, 绘制保存耗时)，单位秒"""
+    start = time.perf_counter()
+    fig = plotter.line_chart(df, "date", y_cols, fast_render=fast_render)
+    built = time.perf_counter()
+    fig.savefig(io.BytesIO(), format="png", dpi=100, bbox_inches="tight")
+    done = time.perf_counter()
+    plt.close(fig)
+    return built - start, done - built
+
+
+def main():
+    plotter = PlotGenerator()
+    print(
+        f"{'系列数':>6} | {'ax.plot 建图':>11} {'ax.plot 绘制':>11} | {'集合 建图':>9} {'集合 绘制':>9} | {'加速比':>6}"
+    )
+    for n_series in SERIES_COUNTS:
+        df, y_cols = make_data(n_series)
+        plot_build, plot_draw = time_render(plotter, df, y_cols, fast_render=False)
+        fast_build, fast_draw = time_render(plotter, df, y_cols, fast_render=True)
+        speedup = (plot_build + plot_draw) / (fast_build + fast_draw)
+        print(
+            f"{n_series:>6} | {plot_build:>11.3f} {plot_draw:>11.3f} | {fast_build:>9.3f} {fast_draw:>9.3f} | {speedup:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+读取基准：load_dataframe 读取 feather（内存映射）、parquet、csv 的耗时，
+以及从读取到画出第一张折线图的总耗时
+
+运行: python test/benchmark_load_dataframe.py [--points 10000000]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+from src.data import generate_time_series_data, load_dataframe, save_dataframe
+from src.plot import PlotGenerator
+
+FORMATS = ["feather", "parquet", "csv"]
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="load_dataframe 读取基准")
+    parser.add_argument("--points", type=int, default=10_000_000, help="时间序列点数（分钟频率）")
+    args = parser.parse_args()
+
+    df = generate_time_series_data(days=args.points, freq="min", compact=True)
+    plotter = PlotGenerator(use_pyplot=False)
+    columns = ["date", "value"]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # save_dataframe / load_dataframe 使用当前目录下的 data/
+        os.chdir(directory)
+        for format in FORMATS:
+            with contextlib.redirect_stdout(io.StringIO()):
+                save_dataframe(df, "series", format)
+        print(f"行数: {len(df):,}")
+        print(f"{'格式':<8} | {'文件(MB)':>9} | {'全部列(s)':>9} | {'两列(s)':>8} | {'两列+折线图(s)':>14}")
+        for format in FORMATS:
+            size = os.path.getsize(f"data/series.{format}")
+            load_all, _ = timed(lambda: load_dataframe("series", format=format))
+            load_two, _ = timed(lambda: load_dataframe("series", format=format, columns=columns))
+
+            def first_plot():
+                data = load_dataframe("series", format=format, columns=columns)
+                plotter.render("line_chart", data, x_col="date", y_cols=["value"], downsample="m4", dpi=72)
+
+            # csv 的日期列读回为字符串，折线图会退化为数百万个分类刻度，不计时
+            plot_time = f"{timed(first_plot)[0]:.2f}" if format != "csv" else "-"
+            print(f"{format:<8} | {size / 1e6:>9.1f} | {load_all:>9.3f} | {load_two:>8.3f} | {plot_time:>14}")
+        os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
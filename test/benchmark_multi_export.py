@@ -0,0 +1,94 @@
+"""
+多输出导出基准：逐个 save_figure / figure_to_base64 与一次 export 的耗时和绘制次数对比
+
+典型需求：PNG 缩略图、完整 PNG、SVG 和完整 PNG 的 base64 字符串。
+
+运行: python test/benchmark_multi_export.py [--series 50] [--points 2000] [--dpi 300] [--thumb-dpi 40] [--repeat 3]
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.plot import PlotGenerator
+
+
+def count_draws(fig):
+    """统计 Figure.draw 的调用次数（包括 tight 边界框计算时不输出的绘制）"""
+    counter = [0]
+    original_draw = fig.draw
+
+    def draw(renderer):
+        counter[0] += 1
+        return original_draw(renderer)
+
+    fig.draw = draw
+    return counter
+
+
+def measure(func, repeat):
+    """返回耗时中位数 s"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="多输出导出基准")
+    parser.add_argument("--series", type=int, default=50, help="折线条数")
+    parser.add_argument("--points", type=int, default=2000, help="每条折线的点数")
+    parser.add_argument("--dpi", type=int, default=300, help="完整图片的分辨率")
+    parser.add_argument("--thumb-dpi", type=int, default=40, help="缩略图的分辨率")
+    parser.add_argument("--repeat", type=int, default=3, help="重复次数（取中位数）")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {"x": np.arange(args.points), **{f"s{i}": rng.normal(size=args.points).cumsum() for i in range(args.series)}}
+    )
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = plotter.line_chart(df, x_col="x")
+    draws = count_draws(fig)
+
+    def separate():
+        plotter.save_figure(fig, "bench_thumb", dpi=args.thumb_dpi)
+        plotter.save_figure(fig, "bench_full", dpi=args.dpi)
+        plotter.save_figure(fig, "bench_full", format="svg")
+        plotter.figure_to_base64(fig, dpi=args.dpi)
+
+    def single():
+        results = plotter.export(
+            fig, {"thumb": {"dpi": args.thumb_dpi}, "full": {"dpi": args.dpi}, "vector": {"format": "svg"}}
+        )
+        for name, result in results.items():
+            with open(f"output/bench_{name}.{result.format}", "wb") as f:
+                f.write(result.data)
+        results["full"].to_base64()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cwd = os.getcwd()
+        os.chdir(tmp_dir)
+        os.makedirs("output", exist_ok=True)
+        try:
+            print(f"{'方式':<30} | {'耗时(s)':>8} | {'绘制次数':>8}")
+            for label, func in (("逐个 save_figure + base64", separate), ("export 一次导出", single)):
+                draws[0] = 0
+                func()
+                n_draws = draws[0]
+                elapsed = measure(func, args.repeat)
+                print(f"{label:<30} | {elapsed:>8.2f} | {n_draws:>8}")
+        finally:
+            os.chdir(cwd)
+    plotter.close_figure(fig)
+
+
+if __name__ == "__main__":
+    main()
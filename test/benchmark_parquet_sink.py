@@ -0,0 +1,129 @@
+"""
+流式 Parquet 写入基准：整表 to_parquet、流式单文件与按 region/month 分区的对比
+
+峰值内存分两列：tracemalloc 统计的 Python 堆，以及后台线程采样的 Arrow 内存池已分配字节数
+（pa.total_allocated_bytes，分区缓冲的数据都在这里）。
+
+运行: python test/benchmark_parquet_sink.py [--products 100000] [--months 36] [--max-pending-mb 32]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+import pyarrow as pa
+
+from src.data import generate_sales_data, iter_sales_data
+from src.writers import ParquetSink
+
+
+def dir_size(path):
+    """文件或目录的总字节数"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+
+def measure_arrow_peak(func, interval=0.005):
+    """执行 func，返回执行期间 Arrow 内存池已分配字节数的峰值（相对开始时）"""
+    baseline = pa.total_allocated_bytes()
+    peak = [baseline]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(interval):
+            peak[0] = max(peak[0], pa.total_allocated_bytes())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    try:
+        func()
+    finally:
+        done.set()
+        sampler.join()
+    return max(peak[0], pa.total_allocated_bytes()) - baseline
+
+
+def run(label, write, path, read_filters=None):
+    """执行写入并打印耗时、Python 堆与 Arrow 内存峰值、文件大小与按分区读取耗时"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    arrow_peak = measure_arrow_peak(lambda: write(path))
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    n_read = len(pd.read_parquet(path, columns=["sales"], filters=read_filters))
+    read_time = time.perf_counter() - start
+    print(
+        f"{label:<26} | {elapsed:>8.2f} | {peak / 1e6:>10.1f} | {arrow_peak / 1e6:>11.1f} | "
+        f"{dir_size(path) / 1e6:>8.1f} | {read_time:>8.3f} ({n_read:,} 行)"
+    )
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="流式 Parquet 写入基准")
+    parser.add_argument("--products", type=int, default=100_000, help="产品数量")
+    parser.add_argument("--months", type=int, default=36, help="月份数量")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并发写入分区的线程数")
+    parser.add_argument("--max-pending-mb", type=int, default=32, help="分区写入时待写出数据的上限（MB）")
+    args = parser.parse_args()
+
+    products, months = args.products, args.months
+    north = [("region", "=", "North")]
+    print(f"行数: {products * months:,}")
+    print(f"{'方式':<26} | {'写入(s)':>8} | {'Python(MB)':>10} | {'Arrow(MB)':>11} | {'大小(MB)':>8} | 读取 North(s)")
+
+    with tempfile.TemporaryDirectory() as directory:
+        run(
+            "整表 to_parquet",
+            lambda path: generate_sales_data(products=products, months=months, compact=True).to_parquet(
+                path, index=False
+            ),
+            os.path.join(directory, "full.parquet"),
+            north,
+        )
+
+        def stream(path, **options):
+            with ParquetSink(path, row_group_size=250_000, **options) as sink:
+                for batch in iter_sales_data(products=products, months=months, batch_rows=200_000, compact=True):
+                    sink.write(batch)
+
+        run("流式单文件", lambda path: stream(path), os.path.join(directory, "stream.parquet"), north)
+        run(
+            "流式单文件 zstd-3",
+            lambda path: stream(path, compression="zstd", compression_level=3),
+            os.path.join(directory, "zstd.parquet"),
+            north,
+        )
+        for workers in sorted({1, args.workers}):
+            run(
+                f"分区 region/month ×{workers} ({args.max_pending_mb}MB)",
+                lambda path, workers=workers: stream(
+                    path,
+                    partition_cols=["region", "month"],
+                    max_workers=workers,
+                    max_pending_bytes=args.max_pending_mb * 1024 * 1024,
+                ),
+                os.path.join(directory, f"partitioned_{workers}"),
+                north,
+            )
+        # 不限制待写出字节数：分区攒不满行组，全部数据留在 Arrow 内存中直到关闭
+        run(
+            "分区 region/month 不限缓冲",
+            lambda path: stream(path, partition_cols=["region", "month"], max_pending_bytes=None),
+            os.path.join(directory, "partitioned_unbounded"),
+            north,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+渲染配置基准：各配置（thumbnail / web / retina / print）导出环形图、折线图、柱状图的
+耗时、字节数和像素数对比
+
+运行: python test/benchmark_render_profiles.py [--series 10] [--points 365] [--repeat 5]
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.plot import RENDER_PROFILES, PlotGenerator
+
+
+def build_figures(plotter, series, points):
+    """构造三种图表"""
+    rng = np.random.default_rng(0)
+    line_df = pd.DataFrame(
+        {"day": np.arange(points), **{f"s{i}": rng.normal(size=points).cumsum() for i in range(series)}}
+    )
+    bar_df = pd.DataFrame(
+        {
+            "月份": np.repeat([f"{m}月" for m in range(1, 13)], 4),
+            "产品": np.tile(list("ABCD"), 12),
+            "销量": rng.integers(50, 500, size=48),
+        }
+    )
+    return {
+        "donut": plotter.donut_chart({f"类别{i}": int(v) for i, v in enumerate(rng.integers(10, 100, size=6))}),
+        "line": plotter.line_chart(line_df, x_col="day"),
+        "bar": plotter.bar_chart(bar_df, x_col="月份", y_col="销量", group_col="产品"),
+    }
+
+
+def measure(func, repeat):
+    """返回 (耗时中位数 s, 最后一次的返回值)"""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="渲染配置基准")
+    parser.add_argument("--series", type=int, default=10, help="折线条数")
+    parser.add_argument("--points", type=int, default=365, help="每条折线的点数")
+    parser.add_argument("--repeat", type=int, default=5, help="重复次数（取中位数）")
+    args = parser.parse_args()
+
+    plotter = PlotGenerator(use_pyplot=False)
+    figures = build_figures(plotter, args.series, args.points)
+
+    print(f"{'图表':<6} | {'配置':<10} | {'dpi':>4} | {'量化':>4} | {'耗时(ms)':>9} | {'大小(KB)':>9} | {'像素':>10}")
+    for chart, fig in figures.items():
+        for name, profile in RENDER_PROFILES.items():
+            elapsed, result = measure(lambda: plotter.export(fig, {name: {"profile": profile}})[name], args.repeat)
+            colors = profile.quantize_colors or "-"
+            print(
+                f"{chart:<6} | {name:<10} | {profile.dpi:>4} | {colors:>4} | {elapsed * 1000:>9.1f} | "
+                f"{result.nbytes / 1024:>9.1f} | {result.width}x{result.height:<5}"
+            )
+        plotter.close_figure(fig)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+销售数据生成性能基准：逐行循环实现与向量化实现的对比
+
+运行: python test/benchmark_sales_data.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data import generate_sales_data
+
+# (产品数, 月份数)；逐行实现只在较小规模上运行
+SIZES = [(50, 12), (1000, 12), (5000, 36), (100000, 36)]
+LEGACY_MAX_ROWS = 200000
+
+
+def legacy_generate_sales_data(products=50, months=12):
+    """原逐行循环实现，仅用于对比"""
+    np.random.seed(42)
+    products_list = [f"Product_{i:03d}" for i in range(1, products + 1)]
+    months_list = pd.date_range("2024-01-01", periods=months, freq="M")
+    data = []
+    for product in products_list:
+        for month in months_list:
+            base_sales = np.random.randint(50, 500)
+            seasonal_factor = 1 + 0.3 * np.sin(2 * np.pi * month.month / 12)
+            random_factor = np.random.uniform(0.7, 1.3)
+            sales = int(base_sales * seasonal_factor * random_factor)
+            price = np.random.uniform(10, 100)
+            revenue = sales * price
+            data.append(
+                {
+                    "product": product,
+                    "month": month,
+                    "sales": sales,
+                    "price": round(price, 2),
+                    "revenue": round(revenue, 2),
+                    "category": np.random.choice(["Electronics", "Clothing", "Books", "Home"]),
+                    "region": np.random.choice(["North", "South", "East", "West"]),
+                }
+            )
+    return pd.DataFrame(data)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    print(f"{'产品×月份':>14} | {'行数':>9} | {'逐行(s)':>8} | {'向量化(s)':>9} | {'加速比':>7} | {'行/秒':>12}")
+    for products, months in SIZES:
+        n_rows = products * months
+        fast_time, fast = timed(generate_sales_data, products, months)
+        if n_rows <= LEGACY_MAX_ROWS:
+            legacy_time, legacy = timed(legacy_generate_sales_data, products, months)
+            assert legacy.dtypes.equals(fast.dtypes)
+            legacy_text, speedup_text = f"{legacy_time:>8.2f}", f"{legacy_time / fast_time:>6.0f}x"
+        else:
+            legacy_text, speedup_text = f"{'-':>8}", f"{'-':>7}"
+        print(
+            f"{f'{products}×{months}':>14} | {n_rows:>9} | {legacy_text} | {fast_time:>9.3f} | {speedup_text} | {n_rows / fast_time:>12,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
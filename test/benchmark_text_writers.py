@@ -0,0 +1,72 @@
+"""
+CSV / JSON 写入吞吐基准：pandas 原有写法与 CsvSink、JsonLinesSink（含 gzip、zstd 压缩）的对比
+
+吞吐按未压缩文本大小（pandas 输出的文件大小）计算
+
+运行: python test/benchmark_text_writers.py [--customers 2000000] [--workers 4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from src.data import generate_customer_data
+from src.writers import CsvSink, JsonLinesSink
+
+
+def measure(write, path):
+    """执行写入，返回 (耗时, 文件大小)"""
+    start = time.perf_counter()
+    write(path)
+    elapsed = time.perf_counter() - start
+    size = os.path.getsize(path)
+    os.remove(path)
+    return elapsed, size
+
+
+def sink_writer(df, sink_class, **options):
+    def write(path):
+        with sink_class(path, **options) as sink:
+            sink.write(df)
+
+    return write
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CSV / JSON 写入吞吐基准")
+    parser.add_argument("--customers", type=int, default=2_000_000, help="客户数量")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并发编码、压缩的线程数")
+    args = parser.parse_args()
+
+    df = generate_customer_data(customers=args.customers, seed=0)
+    print(f"行数: {len(df):,}，线程数: {args.workers}")
+    print(f"{'方式':<26} | {'耗时(s)':>7} | {'MB/s':>8} | {'文件(MB)':>9}")
+
+    cases = {
+        "csv": (
+            lambda path: df.to_csv(path, index=False, encoding="utf-8-sig"),
+            "pandas to_csv",
+            CsvSink,
+        ),
+        "json": (
+            lambda path: df.to_json(path, orient="records", date_format="iso"),
+            "pandas to_json records",
+            JsonLinesSink,
+        ),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, (pandas_write, pandas_label, sink_class) in cases.items():
+            elapsed, text_bytes = measure(pandas_write, os.path.join(directory, f"pandas.{name}"))
+            print(
+                f"{pandas_label:<26} | {elapsed:>7.2f} | {text_bytes / 1e6 / elapsed:>8.1f} | {text_bytes / 1e6:>9.1f}"
+            )
+            for compression in ("none", "gzip", "zstd"):
+                write = sink_writer(df, sink_class, compression=compression, max_workers=args.workers)
+                elapsed, size = measure(write, os.path.join(directory, f"sink.{name}.{compression}"))
+                label = f"{sink_class.__name__} {compression}"
+                print(f"{label:<26} | {elapsed:>7.2f} | {text_bytes / 1e6 / elapsed:>8.1f} | {size / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
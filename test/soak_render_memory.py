@@ -0,0 +1,63 @@
+"""
+渲染内存压测：反复调用 render()，用 tracemalloc 观察内存是否保持平稳
+
+matplotlib 内部的文字度量等缓存有固定上限，预热阶段会先增长到上限。
+tracemalloc 只统计开启后的分配，缓存条目轮换一遍之前读数会上升，
+因此以第一个采样点为基线，比较之后各采样点的内存是否持平。
+
+运行: python test/soak_render_memory.py [--renders 10000] [--warmup 500]
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+
+import pandas as pd
+
+from src.plot import PlotGenerator
+
+SAMPLE_EVERY = 500
+MAX_GROWTH_BYTES = 1024 * 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description="render() 内存压测")
+    parser.add_argument("--renders", type=int, default=10000, help="预热后的渲染次数")
+    parser.add_argument("--warmup", type=int, default=500, help="预热渲染次数")
+    args = parser.parse_args()
+
+    plotter = PlotGenerator(figsize=(4, 3), use_pyplot=False)
+    data = pd.DataFrame({"x": range(20), "sales": range(20), "profit": range(0, 40, 2)})
+
+    def render_once():
+        plotter.render("line_chart", data, "x", ["sales", "profit"], title="soak", ylabel="value", dpi=30)
+
+    print(f"预热 {args.warmup} 次...")
+    for _ in range(args.warmup):
+        render_once()
+    gc.collect()
+
+    tracemalloc.start()
+    baseline = None
+    print(f"{'渲染次数':>8} | {'当前内存(KB)':>12} | {'相对基线(KB)':>12} | {'耗时(s)':>8}")
+    start = time.perf_counter()
+    for i in range(1, args.renders + 1):
+        render_once()
+        if i % SAMPLE_EVERY == 0 or i == args.renders:
+            gc.collect()
+            current, _ = tracemalloc.get_traced_memory()
+            if baseline is None:
+                baseline = current
+            elapsed = time.perf_counter() - start
+            print(f"{i:>8} | {current / 1024:>12.1f} | {(current - baseline) / 1024:>12.1f} | {elapsed:>8.1f}")
+    tracemalloc.stop()
+
+    growth = current - baseline
+    if growth > MAX_GROWTH_BYTES:
+        raise SystemExit(f"内存增长 {growth / 1024:.1f} KB，超过上限 {MAX_GROWTH_BYTES / 1024:.0f} KB")
+    print(f"内存平稳：第 {SAMPLE_EVERY} 次到第 {args.renders} 次渲染共增长 {growth / 1024:.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
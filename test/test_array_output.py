@@ -0,0 +1,74 @@
+"""
+测试 RGBA 数组输出与批量数组渲染
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.plot import PlotGenerator
+
+
+def _decode(data: bytes) -> np.ndarray:
+    return np.asarray(Image.open(io.BytesIO(data)))
+
+
+def _specs():
+    df = pd.DataFrame({"x": range(20), "y": [i % 7 for i in range(20)]})
+    return [
+        {"chart_type": "donut_chart", "args": ({"A": 3, "B": 5, "C": 2},)},
+        {"chart_type": "line_chart", "args": (df, "x", ["y"])},
+        {"chart_type": "bar_chart", "args": (df, "x", "y")},
+    ]
+
+
+def test_figure_to_array():
+    """测试数组与 PNG 解码后的像素一致，默认返回画布缓冲区的零拷贝视图"""
+    print("测试数组输出...")
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = plotter.line_chart(pd.DataFrame({"x": range(10), "y": range(10)}), "x", ["y"])
+
+    result = plotter.figure_to_array(fig, dpi=50)
+    assert result.shape == (300, 500, 4) and (result.width, result.height, result.dpi) == (500, 300, 50)
+    assert np.shares_memory(result.pixels, np.asarray(fig.canvas.buffer_rgba()))
+    assert not result.pixels.flags.writeable
+    assert np.array_equal(result.pixels, _decode(plotter.figure_to_bytes(fig, dpi=50, bbox_inches=None)))
+    assert np.array_equal(np.asarray(result.to_image()), result.pixels)
+
+    expected = _decode(plotter.figure_to_bytes(fig, dpi=50))
+    tight = plotter.figure_to_array(fig, dpi=50, bbox_inches="tight", close_after_render=True)
+    assert tight.width < 500
+    assert np.array_equal(tight.pixels, expected)
+    print("   ✓ 像素一致")
+
+
+def test_render_array_batch():
+    """测试批量渲染到预分配数组，与逐个渲染的像素一致"""
+    plotter = PlotGenerator(use_pyplot=False, figsize=(4, 3))
+    specs = _specs()
+    batch = plotter.render_array_batch(specs, dpi=40)
+    assert batch.shape == (3, 120, 160, 4)
+    for index, spec in enumerate(specs):
+        fig = getattr(plotter, spec["chart_type"])(*spec["args"])
+        assert np.array_equal(batch[index], plotter.figure_to_array(fig, dpi=40, close_after_render=True).pixels)
+
+    # 预分配的 out 可以接收惰性任务序列，按任务数返回切片
+    out = np.zeros((5, 120, 160, 4), dtype=np.uint8)
+    filled = plotter.render_array_batch(iter(specs), dpi=40, out=out)
+    assert np.shares_memory(filled, out) and len(filled) == 3
+    assert np.array_equal(filled, batch) and not out[3:].any()
+
+    figures = [getattr(plotter, spec["chart_type"])(*spec["args"]) for spec in specs]
+    assert np.array_equal(plotter.figures_to_array(figures, dpi=40, close_after_render=True), batch)
+
+    with pytest.raises(ValueError):
+        plotter.render_array_batch(specs, dpi=40, out=np.zeros((3, 10, 10, 4), dtype=np.uint8))
+    with pytest.raises(ValueError):
+        plotter.render_array_batch(specs, dpi=40, out=np.zeros((2, 120, 160, 4), dtype=np.uint8))
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,89 @@
+"""
+测试柱状图单次聚合引擎
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from src.data import generate_sales_data
+from src.plot import PlotGenerator
+
+
+def _legacy_values(df, x_col, y_col, x_values, filters):
+    """按旧实现逐组合筛选 + groupby 计算数值，用于对照"""
+    mask = np.ones(len(df), dtype=bool)
+    for col, val in filters.items():
+        mask &= (df[col] == val).to_numpy()
+    aggregated = df[mask].groupby(x_col)[y_col].sum()
+    return [aggregated.get(x_val, 0) for x_val in x_values]
+
+
+def _long_sales_data():
+    """构造带分组、堆叠字段的长表"""
+    sales_data = generate_sales_data(products=12, months=6)
+    sales_data["月份"] = sales_data["month"].dt.strftime("%Y-%m")
+    return sales_data[["月份", "region", "category", "sales"]]
+
+
+def test_pivot_matches_groupby():
+    """测试聚合矩阵与逐组合 groupby 结果一致"""
+    print("测试聚合矩阵与 groupby 结果一致...")
+    df = _long_sales_data()
+
+    x_values, group_values, stack_values, matrix = PlotGenerator._pivot_bar_data(
+        df, "月份", "sales", "region", "category"
+    )
+    assert matrix.shape == (len(x_values), len(group_values), len(stack_values))
+    assert list(x_values) == list(df["月份"].unique())
+    assert list(group_values) == list(df["region"].unique())
+
+    for g_idx, group_val in enumerate(group_values):
+        for s_idx, stack_val in enumerate(stack_values):
+            expected = _legacy_values(df, "月份", "sales", x_values, {"region": group_val, "category": stack_val})
+            np.testing.assert_allclose(matrix[:, g_idx, s_idx], expected)
+
+    # 只分组 / 只堆叠 / 简单模式
+    _, _, stack_only, matrix = PlotGenerator._pivot_bar_data(df, "月份", "sales", group_col="region")
+    assert matrix.shape[2] == 1 and list(stack_only) == [None]
+    _, _, _, matrix = PlotGenerator._pivot_bar_data(df, "月份", "sales")
+    np.testing.assert_allclose(matrix[:, 0, 0], _legacy_values(df, "月份", "sales", x_values, {}))
+    print("   ✓ 聚合结果一致")
+
+
+def test_pivot_skips_missing_keys():
+    """测试缺失键不参与聚合、缺失数值按 0 处理"""
+    df = _long_sales_data().head(20).copy()
+    df.loc[df.index[0], "region"] = None
+    df.loc[df.index[1], "sales"] = np.nan
+
+    _, group_values, _, matrix = PlotGenerator._pivot_bar_data(df, "月份", "sales", group_col="region")
+    assert None not in list(group_values)
+    assert np.isclose(matrix.sum(), df["sales"].iloc[2:].sum())
+
+
+def test_bar_chart_modes_heights():
+    """测试四种模式下柱子高度来自聚合矩阵"""
+    print("测试四种柱状图模式...")
+    df = _long_sales_data()
+    plotter = PlotGenerator()
+
+    x_values, _, _, matrix = PlotGenerator._pivot_bar_data(df, "月份", "sales", "region", "category")
+    cases = [
+        ({}, matrix.sum(axis=(1, 2))),
+        ({"group_col": "region"}, matrix.sum(axis=2)),
+        ({"stack_col": "category"}, matrix.sum(axis=1)),
+        ({"group_col": "region", "stack_col": "category"}, matrix),
+    ]
+    for kwargs, expected in cases:
+        fig = plotter.bar_chart(df, x_col="月份", y_col="sales", **kwargs)
+        heights = [patch.get_height() for patch in fig.axes[0].patches if patch.get_width() > 0]
+        assert np.isclose(sum(heights), expected.sum())
+        plt.close(fig)
+    print("   ✓ 四种模式绘制正确")
+
+
+if __name__ == "__main__":
+    test_pivot_matches_groupby()
+    test_pivot_skips_missing_keys()
+    test_bar_chart_modes_heights()
+    print("\n所有测试完成！")
@@ -0,0 +1,78 @@
+"""
+测试柱状图集合绘制路径
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.collections import PolyCollection
+
+from src.plot import BAR_COLLECTION_THRESHOLD, PlotGenerator
+
+
+def _bar_data(n_x=30, n_groups=3, n_stacks=4):
+    """构造分组+堆叠长表"""
+    rng = np.random.default_rng(42)
+    index = pd.MultiIndex.from_product(
+        [[f"X{i:03d}" for i in range(n_x)], [f"G{g}" for g in range(n_groups)], [f"S{s}" for s in range(n_stacks)]],
+        names=["x", "group", "stack"],
+    )
+    df = index.to_frame(index=False)
+    df["value"] = rng.integers(1, 100, len(df))
+    return df
+
+
+def _render_rgba(fig):
+    """渲染为 RGBA 数组"""
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).astype(int)
+
+
+def test_collection_matches_patches():
+    """测试集合路径与逐系列 ax.bar 的渲染结果基本一致"""
+    print("测试集合路径渲染结果...")
+    df = _bar_data()
+    plotter = PlotGenerator()
+    kwargs = dict(x_col="x", y_col="value", group_col="group", stack_col="stack", title="集合绘制")
+
+    fig_patches = plotter.bar_chart(df, fast_render=False, **kwargs)
+    fig_fast = plotter.bar_chart(df, fast_render=True, **kwargs)
+
+    collections = [c for c in fig_fast.axes[0].collections if isinstance(c, PolyCollection)]
+    assert len(collections) == 1
+    assert len(fig_fast.axes[0].patches) == 0
+    assert fig_fast.axes[0].get_ylim() == fig_patches.axes[0].get_ylim()
+    assert [t.get_text() for t in fig_fast.axes[0].get_legend().get_texts()] == [
+        t.get_text() for t in fig_patches.axes[0].get_legend().get_texts()
+    ]
+
+    # 集合路径的图例放在坐标轴外侧，只比较柱子区域
+    fig_fast.axes[0].get_legend().remove()
+    fig_patches.axes[0].get_legend().remove()
+    diff = np.abs(_render_rgba(fig_fast) - _render_rgba(fig_patches))
+    # 只允许抗锯齿边缘的细微差异
+    assert (diff.max(axis=2) > 64).mean() < 0.01
+    plt.close(fig_patches)
+    plt.close(fig_fast)
+    print("   ✓ 渲染结果一致")
+
+
+def test_collection_auto_threshold():
+    """测试超过阈值自动切换到集合路径"""
+    plotter = PlotGenerator()
+    n_x = BAR_COLLECTION_THRESHOLD // 12 + 1
+    df = _bar_data(n_x=n_x)
+    fig = plotter.bar_chart(df, x_col="x", y_col="value", group_col="group", stack_col="stack")
+    assert len(fig.axes[0].patches) == 0
+    assert len(fig.axes[0].collections) == 1
+    plt.close(fig)
+
+    fig = plotter.bar_chart(_bar_data(n_x=5), x_col="x", y_col="value", stack_col="stack")
+    assert len(fig.axes[0].patches) == 5 * 4
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    test_collection_matches_patches()
+    test_collection_auto_threshold()
+    print("\n所有测试完成！")
@@ -0,0 +1,86 @@
+"""
+测试进程池批量渲染
+"""
+
+import os
+
+from src.batch import render_batch
+from src.data import generate_sales_data, generate_time_series_data
+from src.plot import PlotGenerator
+
+
+class _CrashOnUnpickle:
+    """在工作进程中反序列化时直接退出进程，模拟工作进程崩溃"""
+
+    def __reduce__(self):
+        return os._exit, (1,)
+
+
+def _specs():
+    """构造覆盖三种图表的任务，其中一个任务引用了不存在的列"""
+    ts_data = generate_time_series_data(days=30)
+    sales_data = generate_sales_data(products=6, months=3)
+    sales_data["月份"] = sales_data["month"].dt.strftime("%Y-%m")
+    return [
+        {"chart_type": "donut_chart", "args": ({"A": 3, "B": 5, "C": 2},), "dpi": 50},
+        {"chart_type": "line_chart", "args": (ts_data, "date", ["value"]), "dpi": 50},
+        {"chart_type": "bar_chart", "args": (sales_data,), "kwargs": {"x_col": "月份", "y_col": "sales"}, "dpi": 50},
+        {"chart_type": "bar_chart", "args": (sales_data,), "kwargs": {"x_col": "不存在", "y_col": "sales"}},
+        {"chart_type": "line_chart", "args": (ts_data, "date", ["value"]), "format": "svg"},
+    ]
+
+
+def test_render_batch_matches_serial():
+    """测试多进程批量渲染结果与单个渲染一致，单个任务出错不影响其他任务"""
+    print("测试批量渲染...")
+    specs = _specs()
+    results = list(render_batch(specs, workers=2))
+    assert sorted(r.index for r in results) == list(range(len(specs)))
+    # 任务描述不经工作进程回传，结果中就是调用方传入的对象
+    assert all(r.spec is specs[r.index] for r in results)
+
+    by_index = {r.index: r for r in results}
+    assert not by_index[3].ok and "不存在" in by_index[3].error
+    assert by_index[3].result is None
+
+    plotter = PlotGenerator(use_pyplot=False)
+    for index in (0, 1, 2, 4):
+        spec = specs[index]
+        expected = plotter.render(
+            spec["chart_type"],
+            *spec["args"],
+            format=spec.get("format", "png"),
+            dpi=spec.get("dpi", 300),
+            **spec.get("kwargs", {}),
+        )
+        assert by_index[index].ok
+        assert by_index[index].result.data == expected.data
+    print("   ✓ 批量渲染结果一致，错误已单独记录")
+
+
+def test_render_batch_serial_mode():
+    """测试 workers=1 时在当前进程顺序渲染，并支持惰性任务序列"""
+    specs = ({"chart_type": "donut_chart", "args": ({"A": i + 1, "B": 2},), "dpi": 40} for i in range(3))
+    results = list(render_batch(specs, workers=1))
+    assert [r.index for r in results] == [0, 1, 2]
+    assert all(r.ok and r.result.format == "png" for r in results)
+
+
+def test_render_batch_survives_worker_crash():
+    """测试工作进程崩溃时只有导致崩溃的任务失败，其余任务照常完成"""
+    print("测试工作进程崩溃...")
+    specs = [{"chart_type": "donut_chart", "args": ({"A": i + 1, "B": 2},), "dpi": 30} for i in range(12)]
+    specs[4] = {"chart_type": "donut_chart", "args": (_CrashOnUnpickle(),)}
+    results = list(render_batch(specs, workers=2))
+    assert sorted(r.index for r in results) == list(range(12))
+    failed = [r for r in results if not r.ok]
+    assert [r.index for r in failed] == [4] and "BrokenProcessPool" in failed[0].error
+    assert all(r.result.format == "png" for r in results if r.ok)
+    print("   ✓ 崩溃的任务单独记录")
+
+
+if __name__ == "__main__":
+    test_render_batch_matches_serial()
+    test_render_batch_serial_mode()
+    test_render_batch_survives_worker_crash()
+    print("\n所有测试完成！")
@@ -0,0 +1,83 @@
+"""
+测试紧凑类型输出
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data import (
+    generate_customer_data,
+    generate_sales_data,
+    generate_time_series_data,
+    iter_sales_data,
+    memory_report,
+    save_dataframe_batches,
+)
+
+
+def test_compact_values_match():
+    """测试紧凑模式只改变类型，取值与普通模式一致"""
+    print("测试紧凑类型...")
+    cases = [
+        (generate_sales_data, {"products": 300, "months": 12}),
+        (generate_customer_data, {"customers": 5000}),
+        (generate_time_series_data, {"days": 5000}),
+    ]
+    for generate, kwargs in cases:
+        original = generate(**kwargs)
+        compact = generate(compact=True, **kwargs)
+        assert list(compact.columns) == list(original.columns)
+        for col in original.columns:
+            if isinstance(compact[col].dtype, pd.CategoricalDtype):
+                assert original[col].dtype == object
+                assert (compact[col].astype(object) == original[col]).all()
+            elif compact[col].dtype.kind == "f":
+                # float32 在两位小数上与原值一致
+                np.testing.assert_allclose(compact[col], original[col], rtol=1e-6)
+            else:
+                assert (compact[col].to_numpy() == original[col].to_numpy()).all()
+        assert memory_report(original, compact).loc["total", "ratio"] > 1
+    print("   ✓ 取值一致")
+
+
+def test_compact_dtypes():
+    """测试各列的紧凑类型"""
+    sales = generate_sales_data(products=20, months=6, compact=True)
+    assert [str(dtype) for dtype in sales.dtypes] == [
+        "category",
+        "datetime64[ns]",
+        "int32",
+        "float32",
+        "float32",
+        "category",
+        "category",
+    ]
+    customers = generate_customer_data(customers=100, compact=True)
+    assert customers["age"].dtype == np.int8
+    assert customers["city"].dtype == "category" and customers["gender"].dtype == "category"
+
+
+def test_compact_batches_keep_categories(tmp_path, monkeypatch):
+    """测试分批输出的分类列在各批之间类型一致，可拼接、可流式写 Parquet"""
+    monkeypatch.chdir(tmp_path)
+    batches = list(iter_sales_data(products=8000, months=12, batch_rows=40_000, compact=True))
+    assert len({str(batch["product"].dtype) for batch in batches}) == 1
+    combined = pd.concat(batches, ignore_index=True)
+    assert combined["region"].dtype == "category"
+    assert combined.equals(generate_sales_data(products=8000, months=12, compact=True))
+
+    path = save_dataframe_batches(iter(batches), "compact_sales", "parquet")
+    assert pd.read_parquet(path)["product"].astype(object).equals(combined["product"].astype(object))
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    import pytest
+
+    test_compact_values_match()
+    test_compact_dtypes()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_compact_batches_keep_categories(Path(tmp_dir), pytest.MonkeyPatch())
+    print("\n所有测试完成！")
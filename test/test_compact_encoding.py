@@ -0,0 +1,89 @@
+"""
+测试紧凑位图编码：配色调色板量化、WebP、JPEG 质量
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.encoding import chart_palette, encode_image
+from src.plot import COLOR_PALETTE, PlotGenerator, RenderProfile
+
+
+def _encode(pixels, **options) -> bytes:
+    stream = io.BytesIO()
+    encode_image(pixels, stream, **options)
+    return stream.getvalue()
+
+
+def _bar_pixels(plotter):
+    df = pd.DataFrame({"月": np.repeat(list("ABCDEF"), 3), "组": np.tile(list("xyz"), 6), "值": np.arange(18) % 7 + 1})
+    fig = plotter.bar_chart(df, x_col="月", y_col="值", group_col="组")
+    return plotter.figure_to_array(fig, dpi=60, bbox_inches="tight", close_after_render=True).pixels
+
+
+def test_chart_palette():
+    """测试调色板包含配色纯色、黑白，且不超过 256 色"""
+    plotter = PlotGenerator(use_pyplot=False)
+    palette = plotter.chart_palette()
+    assert palette.dtype == np.uint8 and palette.shape[1] == 3 and len(palette) <= 256
+    colors = {tuple(int(COLOR_PALETTE[i][j : j + 2], 16) for j in (1, 3, 5)) for i in range(len(COLOR_PALETTE))}
+    entries = set(map(tuple, palette.tolist()))
+    assert colors <= entries and {(0, 0, 0), (255, 255, 255)} <= entries
+
+    # 配色很多时减少混合级数
+    many = np.random.default_rng(0).integers(0, 256, size=(100, 3))
+    assert len(chart_palette(many)) <= 256
+
+
+def test_palette_quantization():
+    """测试固定调色板量化：只使用调色板中的颜色，误差小，文件明显变小"""
+    print("测试调色板量化...")
+    plotter = PlotGenerator(use_pyplot=False)
+    pixels = _bar_pixels(plotter)
+    full = _encode(pixels)
+    quantized = _encode(pixels, palette=plotter.chart_palette())
+    image = Image.open(io.BytesIO(quantized))
+    assert image.mode == "P"
+    rgb = np.asarray(image.convert("RGB"))
+    used = set(map(tuple, np.unique(rgb.reshape(-1, 3), axis=0).tolist()))
+    assert used <= set(map(tuple, plotter.chart_palette().tolist()))
+    assert np.abs(rgb.astype(int) - pixels[..., :3]).mean() < 2
+    assert len(quantized) < 0.75 * len(full)
+
+    web = Image.open(
+        io.BytesIO(
+            plotter.render("bar_chart", pd.DataFrame({"c": list("ab"), "v": [1, 2]}), "c", "v", profile="web").data
+        )
+    )
+    assert web.mode == "P"
+    print("   ✓ 量化有效")
+
+
+def test_webp_and_jpeg():
+    """测试 WebP 无损/有损与 JPEG 质量参数"""
+    plotter = PlotGenerator(use_pyplot=False)
+    pixels = _bar_pixels(plotter)
+
+    lossless = Image.open(io.BytesIO(_encode(pixels, format="webp", lossless=True)))
+    assert lossless.format == "WEBP"
+    assert np.array_equal(np.asarray(lossless.convert("RGBA")), pixels)
+    assert len(_encode(pixels, format="webp", quality=30)) < len(_encode(pixels, format="webp", quality=95))
+    assert len(_encode(pixels, format="jpg", quality=30)) < len(_encode(pixels, format="jpg", quality=95))
+
+    profile = RenderProfile(dpi=60, format="webp", quality=80)
+    fig = plotter.donut_chart({"A": 3, "B": 5})
+    assert Image.open(io.BytesIO(plotter.figure_to_bytes(fig, profile=profile))).format == "WEBP"
+    plotter.close_figure(fig)
+
+    with pytest.raises(ValueError):
+        _encode(pixels, format="jpg", palette=plotter.chart_palette())
+    with pytest.raises(ValueError):
+        _encode(pixels, format="bmp")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
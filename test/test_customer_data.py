@@ -0,0 +1,54 @@
+"""
+测试可扩展的客户数据生成
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import format_customer_ids, generate_customer_data, iter_customer_data
+
+
+def test_large_customer_count():
+    """测试超过 datetime64[ns] 按天递增上限的客户数量"""
+    print("测试大规模客户数据...")
+    df = generate_customer_data(customers=300_000, compact=True, id_format="int")
+    assert len(df) == 300_000
+    assert df["customer_id"].is_monotonic_increasing and df["customer_id"].iloc[-1] == 300_000
+    assert df["registration_date"].min() >= pd.Timestamp("2020-01-01")
+    assert df["registration_date"].max() <= pd.Timestamp("2024-12-31")
+    print("   ✓ 生成 30 万客户")
+
+
+def test_registration_window():
+    """测试注册日期落在指定窗口内并覆盖整个窗口"""
+    df = generate_customer_data(customers=20_000, registration_start="2023-03-01", registration_end="2023-03-10")
+    dates = df["registration_date"]
+    assert dates.min() == pd.Timestamp("2023-03-01") and dates.max() == pd.Timestamp("2023-03-10")
+    assert dates.dt.normalize().equals(dates)
+
+    with pytest.raises(ValueError):
+        generate_customer_data(customers=10, registration_start="2024-01-02", registration_end="2024-01-01")
+    with pytest.raises(ValueError):
+        generate_customer_data(customers=10, id_format="hex")
+
+
+def test_id_formats():
+    """测试整数编号与格式化后的字符串编号一致，其余列不受编号格式影响"""
+    as_str = generate_customer_data(customers=2_000)
+    as_int = generate_customer_data(customers=2_000, id_format="int")
+    assert as_int["customer_id"].dtype == np.int64
+    assert list(format_customer_ids(as_int["customer_id"])) == list(as_str["customer_id"])
+    assert as_str["customer_id"].iloc[0] == "CUST_000001"
+    assert format_customer_ids([1_234_567])[0] == "CUST_1234567"
+    assert as_str.drop(columns="customer_id").equals(as_int.drop(columns="customer_id"))
+
+    streamed = pd.concat(iter_customer_data(customers=2_000, batch_rows=300, id_format="int"), ignore_index=True)
+    assert streamed.equals(as_int)
+
+
+if __name__ == "__main__":
+    test_large_customer_count()
+    test_registration_window()
+    test_id_formats()
+    print("\n所有测试完成！")
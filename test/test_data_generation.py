@@ -30,6 +30,33 @@ def test_sales_data():
     return df
 
 
+def test_sales_data_schema():
+    """测试销售数据的列、类型与取值范围"""
+    print("\n测试销售数据结构...")
+    products, months = 7, 5
+    df = generate_sales_data(products=products, months=months)
+    assert list(df.columns) == ["product", "month", "sales", "price", "revenue", "category", "region"]
+    assert [str(dtype) for dtype in df.dtypes] == [
+        "object",
+        "datetime64[ns]",
+        "int64",
+        "float64",
+        "float64",
+        "object",
+        "object",
+    ]
+    assert len(df) == products * months
+
+    # 行顺序：按产品、再按月份
+    assert df["product"].iloc[0] == "Product_001" and df["product"].iloc[-1] == f"Product_{products:03d}"
+    assert (df.groupby("product", sort=False)["month"].apply(lambda m: m.is_monotonic_increasing)).all()
+    assert df["price"].between(10, 100).all()
+    assert set(df["category"]) <= {"Electronics", "Clothing", "Books", "Home"}
+    assert set(df["region"]) <= {"North", "South", "East", "West"}
+    assert generate_sales_data(products=products, months=months).equals(df)
+    print("   ✓ 结构一致")
+
+
 def test_customer_data():
     """测试客户数据生成"""
     print("\n测试客户数据生成...")
@@ -61,6 +88,7 @@ if __name__ == "__main__":
     # 测试各种数据生成
     test_time_series()
     test_sales_data()
+    test_sales_data_schema()
     test_customer_data()
 
     # 测试保存功能
@@ -0,0 +1,63 @@
+"""
+测试基于 numpy.random.Generator 的可复现并行数据生成
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.data import (
+    DATA_BLOCK_ROWS,
+    generate_customer_data,
+    generate_sales_data,
+    generate_time_series_data,
+    iter_sales_data,
+)
+
+
+def test_global_rng_untouched():
+    """测试生成数据不再重置全局随机状态"""
+    np.random.seed(123)
+    expected = np.random.random(3)
+    np.random.seed(123)
+    generate_sales_data(products=10, months=3)
+    generate_time_series_data(days=30)
+    generate_customer_data(customers=30)
+    assert np.array_equal(np.random.random(3), expected)
+
+
+def test_seed_and_rng_arguments():
+    """测试 seed / rng 参数可复现"""
+    assert generate_sales_data(products=20, months=6, seed=1).equals(generate_sales_data(products=20, months=6, seed=1))
+    assert not generate_sales_data(products=20, months=6, seed=1).equals(
+        generate_sales_data(products=20, months=6, seed=2)
+    )
+
+    first = generate_customer_data(customers=50, rng=np.random.default_rng(9))
+    second = generate_customer_data(customers=50, rng=np.random.default_rng(9))
+    assert first.equals(second)
+
+    # 同一个 rng 连续调用得到不同的数据
+    rng = np.random.default_rng(9)
+    assert not generate_customer_data(customers=50, rng=rng).equals(generate_customer_data(customers=50, rng=rng))
+
+
+def test_parallel_bit_identical():
+    """测试不同进程数的结果逐位一致，且与分批生成一致"""
+    print("测试并行生成...")
+    products = DATA_BLOCK_ROWS * 3 // 12 + 7  # 跨越多个内部块
+    serial = generate_sales_data(products=products, months=12)
+    for workers in (2, 3):
+        assert generate_sales_data(products=products, months=12, workers=workers).equals(serial)
+    assert pd.concat(iter_sales_data(products=products, months=12, batch_rows=50_000), ignore_index=True).equals(serial)
+
+    days = DATA_BLOCK_ROWS * 2 + 1
+    series = generate_time_series_data(days=days, freq="min")
+    assert generate_time_series_data(days=days, freq="min", workers=2).equals(series)
+    print("   ✓ 结果与进程数无关")
+
+
+if __name__ == "__main__":
+    test_global_rng_untouched()
+    test_seed_and_rng_arguments()
+    test_parallel_bit_identical()
+    print("\n所有测试完成！")
@@ -0,0 +1,97 @@
+"""
+测试分批生成与流式保存
+"""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data import (
+    generate_customer_data,
+    generate_sales_data,
+    generate_time_series_data,
+    iter_customer_data,
+    iter_sales_data,
+    iter_time_series_data,
+    save_dataframe_batches,
+)
+
+
+def test_batches_independent_of_batch_size():
+    """测试相同种子的输出与批大小无关，不同种子输出不同"""
+    print("测试分批生成可复现...")
+    for make in (
+        lambda **kw: iter_sales_data(products=2000, months=36, **kw),
+        lambda **kw: iter_time_series_data(days=150_000, freq="h", **kw),
+        lambda **kw: iter_customer_data(customers=50_000, **kw),
+    ):
+        batches = list(make(batch_rows=30_000))
+        assert all(len(batch) == 30_000 for batch in batches[:-1])
+        small = pd.concat(batches, ignore_index=True)
+        large = pd.concat(make(batch_rows=1_000_000), ignore_index=True)
+        assert small.equals(large)
+        assert not pd.concat(make(batch_rows=30_000, seed=7), ignore_index=True).equals(small)
+    print("   ✓ 输出只取决于种子")
+
+
+def test_batches_match_full_generators():
+    """测试分批生成与一次性生成的结构和统计特征一致"""
+    cases = [
+        (iter_sales_data(products=500, months=24), generate_sales_data(products=500, months=24), "sales"),
+        (iter_time_series_data(days=20_000), generate_time_series_data(days=20_000), "value"),
+        (iter_customer_data(customers=20_000), generate_customer_data(customers=20_000), "income"),
+    ]
+    for batches, full, numeric_col in cases:
+        streamed = pd.concat(batches, ignore_index=True)
+        assert list(streamed.columns) == list(full.columns)
+        assert streamed.dtypes.equals(full.dtypes)
+        assert len(streamed) == len(full)
+        assert np.isclose(streamed[numeric_col].mean(), full[numeric_col].mean(), rtol=0.02)
+
+    # 确定性的列完全一致
+    streamed = pd.concat(iter_sales_data(products=50, months=12), ignore_index=True)
+    full = generate_sales_data(products=50, months=12)
+    assert streamed[["product", "month"]].equals(full[["product", "month"]])
+    streamed = pd.concat(iter_time_series_data(days=1000, freq="W"), ignore_index=True)
+    assert streamed["date"].equals(generate_time_series_data(days=1000, freq="W")["date"])
+
+
+def test_streaming_save(tmp_path, monkeypatch):
+    """测试流式保存的内容完整，峰值内存与总行数无关"""
+    print("测试流式保存...")
+    monkeypatch.chdir(tmp_path)
+    expected = pd.concat(iter_sales_data(products=100, months=12, batch_rows=250), ignore_index=True)
+
+    path = save_dataframe_batches(iter_sales_data(products=100, months=12, batch_rows=250), "sales", "parquet")
+    assert pd.read_parquet(path).equals(expected)
+    path = save_dataframe_batches(iter_sales_data(products=100, months=12, batch_rows=250), "sales", "csv")
+    assert len(pd.read_csv(path)) == len(expected)
+    path = save_dataframe_batches(iter_sales_data(products=100, months=12, batch_rows=250), "sales", "jsonl")
+    assert path == "data/sales.jsonl"
+    assert len(pd.read_json(path, lines=True)) == len(expected)
+    # json 在 save_dataframe 中是 records 数组，分批保存不能用同一个名称输出 JSON Lines
+    with pytest.raises(ValueError):
+        save_dataframe_batches(iter_sales_data(products=100, months=12, batch_rows=250), "sales", "json")
+
+    # 约 5.5 个内部块：峰值内存只与块大小、批大小有关，明显小于完整数据
+    products = 30_000
+    full_bytes = pd.concat(iter_sales_data(products=products, months=12)).memory_usage(deep=True).sum()
+    tracemalloc.start()
+    save_dataframe_batches(iter_sales_data(products=products, months=12, batch_rows=20_000), "peak", "parquet")
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    assert peak < 0.5 * full_bytes
+    print("   ✓ 流式保存内存有界")
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    test_batches_independent_of_batch_size()
+    test_batches_match_full_generators()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_streaming_save(Path(tmp_dir), pytest.MonkeyPatch())
+    print("\n所有测试完成！")
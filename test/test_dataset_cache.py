@@ -0,0 +1,74 @@
+"""
+测试生成数据集的磁盘缓存
+"""
+
+import os
+
+import numpy as np
+
+from src.data import generate_customer_data, generate_sales_data, generate_time_series_data
+from src.dataset_cache import DatasetCache
+
+
+def test_hit_after_miss(tmp_path):
+    """测试相同参数第二次命中缓存，读回内容一致且为内存映射"""
+    print("测试数据集缓存...")
+    cache = DatasetCache(str(tmp_path))
+    first = cache.get_or_generate(generate_sales_data, products=300, months=12, compact=True)
+    second = cache.get_or_generate(generate_sales_data, 300, months=12, compact=True, workers=2)
+    assert second.equals(first)
+    assert not second["sales"].to_numpy().flags.writeable
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    # 参数、种子或生成函数不同时重新生成
+    cache.get_or_generate(generate_sales_data, products=300, months=12)
+    cache.get_or_generate(generate_sales_data, products=300, months=12, compact=True, seed=1)
+    cache.get_or_generate(generate_time_series_data, days=300)
+    assert cache.stats()["misses"] == 4
+
+    # 新实例（模拟新进程）复用磁盘上的条目
+    reopened = DatasetCache(str(tmp_path))
+    assert reopened.stats()["entries"] == 4
+    assert reopened.get_or_generate(generate_time_series_data, days=300).equals(generate_time_series_data(days=300))
+    assert reopened.stats()["hits"] == 1
+    print("   ✓ 缓存命中正确")
+
+
+def test_bypass_unseeded(tmp_path):
+    """测试 seed=None 或传入 rng 时不缓存"""
+    cache = DatasetCache(str(tmp_path))
+    cache.get_or_generate(generate_customer_data, customers=100, seed=None)
+    cache.get_or_generate(generate_customer_data, customers=100, rng=np.random.default_rng(0))
+    assert cache.stats() == {"hits": 0, "misses": 0, "bypasses": 2, "evictions": 0, "entries": 0, "bytes": 0}
+
+
+def test_eviction_under_budget(tmp_path):
+    """测试超出磁盘预算时淘汰最久未访问的条目"""
+    cache = DatasetCache(str(tmp_path))
+    cache.get_or_generate(generate_time_series_data, days=2000)
+    size = cache.stats()["bytes"]
+
+    cache = DatasetCache(str(tmp_path), max_bytes=int(size * 2.5))
+    cache.get_or_generate(generate_time_series_data, days=2000, seed=1)
+    cache.get_or_generate(generate_time_series_data, days=2000)  # 访问最早的条目
+    cache.get_or_generate(generate_time_series_data, days=2000, seed=2)
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["entries"] == 2
+    assert len([name for name in os.listdir(tmp_path) if name.endswith(".feather")]) == 2
+
+    # seed=1 是最久未访问的，已被淘汰
+    cache.get_or_generate(generate_time_series_data, days=2000, seed=1)
+    assert cache.stats()["misses"] == 3
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and not os.listdir(tmp_path)
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    for test in (test_hit_after_miss, test_bypass_unseeded, test_eviction_under_budget):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            test(Path(tmp_dir))
+    print("\n所有测试完成！")
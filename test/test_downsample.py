@@ -0,0 +1,123 @@
+"""
+测试折线图降采样
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.downsample import downsample_indices, lttb_indices, m4_indices
+from src.plot import PlotGenerator
+
+
+def _sensor_series(n=200_000):
+    """构造带噪声的长序列"""
+    rng = np.random.default_rng(42)
+    x = np.arange(n, dtype=float)
+    y = np.sin(x / 5000) * 10 + rng.normal(0, 1, n)
+    return x, y
+
+
+def test_lttb_indices():
+    """测试 LTTB 输出点数和首尾点"""
+    print("测试 LTTB 降采样...")
+    x, y = _sensor_series()
+    idx = lttb_indices(x, y, 1000)
+    assert len(idx) == 1000
+    assert idx[0] == 0 and idx[-1] == len(x) - 1
+    assert np.all(np.diff(idx) > 0)
+    # 点数不足时原样返回
+    np.testing.assert_array_equal(lttb_indices(x[:10], y[:10], 50), np.arange(10))
+    print("   ✓ LTTB 正常")
+
+
+def test_m4_keeps_extremes():
+    """测试 M4 保留每个像素列的极值"""
+    print("测试 M4 降采样...")
+    x, y = _sensor_series()
+    n_buckets = 500
+    idx = m4_indices(x, y, n_buckets)
+    assert len(idx) <= 4 * n_buckets
+    assert y[idx].max() == y.max() and y[idx].min() == y.min()
+
+    bucket = np.minimum((x / (x[-1] - x[0]) * n_buckets).astype(int), n_buckets - 1)
+    expected_max = pd.Series(y).groupby(bucket).max().to_numpy()
+    kept_max = pd.Series(y[idx]).groupby(bucket[idx]).max().to_numpy()
+    np.testing.assert_array_equal(kept_max, expected_max)
+    print("   ✓ M4 正常")
+
+
+def test_nan_gaps_preserved():
+    """测试 NaN 缺口处仍保留断点"""
+    x, y = _sensor_series(50_000)
+    y[20_000:21_000] = np.nan
+    for method in ("lttb", "m4"):
+        idx = downsample_indices(x, y, 800, method)
+        assert np.isnan(y[idx]).sum() == 1
+        gap = np.flatnonzero(np.isnan(y[idx]))[0]
+        assert idx[gap - 1] < 20_000 and idx[gap + 1] >= 21_000
+
+
+def test_sparse_nan_gaps():
+    """测试稀疏 NaN：输出点数仍受像素宽度约束，M4 保留有效点的极值"""
+    x, y = _sensor_series()
+    y[::10] = np.nan
+    finite = np.flatnonzero(np.isfinite(y))
+    # 每个像素列最多保留首尾两点（LTTB）或四点（M4），另加一个缺口标记
+    for method, limit in (("lttb", 3 * 1000), ("m4", 5 * 1000)):
+        idx = downsample_indices(x, y, 1000, method)
+        assert len(idx) <= limit
+        assert np.all(np.diff(idx) > 0)
+        # 缺口标记互不相邻，且不在首尾
+        nan_pos = np.flatnonzero(np.isnan(y[idx]))
+        assert 0 < len(nan_pos) and np.all(np.diff(nan_pos) > 1)
+        assert nan_pos[0] > 0 and nan_pos[-1] < len(idx) - 1
+        if method == "m4":
+            assert finite[np.argmin(y[finite])] in idx and finite[np.argmax(y[finite])] in idx
+
+
+def test_non_monotonic_warns():
+    """测试 X 非单调时给出警告并返回全部下标"""
+    x, y = _sensor_series(10_000)
+    x[5000] = -1
+    with pytest.warns(UserWarning):
+        idx = downsample_indices(x, y, 100)
+    assert np.array_equal(idx, np.arange(len(y)))
+
+
+def test_line_chart_downsample():
+    """测试 line_chart 的 downsample 参数"""
+    print("测试 line_chart 降采样...")
+    n = 300_000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(
+        {
+            "time": pd.date_range("2024-01-01", periods=n, freq="s"),
+            "温度": rng.normal(0, 1, n).cumsum(),
+            "湿度": rng.normal(0, 1, n).cumsum(),
+        }
+    )
+    plotter = PlotGenerator()
+    target = int(plotter.figsize[0] * 100)
+
+    fig = plotter.line_chart(df, "time", ["温度", "湿度"], downsample="lttb", downsample_dpi=100)
+    assert [len(line.get_xdata()) for line in fig.axes[0].lines] == [target, target]
+    plt.close(fig)
+
+    fig = plotter.line_chart(df, "time", ["温度", "湿度"], downsample="m4", downsample_dpi=100, fast_render=True)
+    segments = fig.axes[0].collections[0].get_segments()
+    assert all(len(seg) <= 4 * target for seg in segments)
+    assert segments[0][:, 1].max() == df["温度"].max()
+    plt.close(fig)
+    print("   ✓ 降采样绘制正常")
+
+
+if __name__ == "__main__":
+    test_lttb_indices()
+    test_m4_keeps_extremes()
+    test_nan_gaps_preserved()
+    test_sparse_nan_gaps()
+    test_non_monotonic_warns()
+    test_line_chart_downsample()
+    print("\n所有测试完成！")
@@ -0,0 +1,55 @@
+"""
+测试流式 Excel 写入
+"""
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from src.data import generate_sales_data, iter_sales_data, save_dataframe, save_dataframe_batches
+from src.writers import ExcelSink
+
+
+def test_split_across_sheets(tmp_path):
+    """测试超过行数上限时拆分工作表，每个工作表都有表头，内容可完整读回"""
+    print("测试 Excel 分表...")
+    expected = generate_sales_data(products=30, months=4)
+    expected.loc[3, "price"] = float("nan")
+    path = str(tmp_path / "sales.xlsx")
+    with ExcelSink(path, sheet_name="sales", max_rows=50) as sink:
+        for start in range(0, len(expected), 17):
+            sink.write(expected.iloc[start : start + 17])
+
+    # 每表 49 行数据 + 1 行表头
+    assert sink.sheet_names == ["sales", "sales_2", "sales_3"]
+    workbook = load_workbook(path, read_only=True)
+    assert [next(workbook[name].values) for name in sink.sheet_names] == [tuple(expected.columns)] * 3
+    workbook.close()
+
+    sheets = pd.read_excel(path, sheet_name=None)
+    assert [len(sheet) for sheet in sheets.values()] == [49, 49, 22]
+    result = pd.concat(sheets.values(), ignore_index=True)
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert pd.isna(result.loc[3, "price"])
+    print("   ✓ 分表内容完整")
+
+
+def test_save_dataframe_excel(tmp_path, monkeypatch):
+    """测试 save_dataframe / save_dataframe_batches 的 excel 格式保存为 .xlsx"""
+    monkeypatch.chdir(tmp_path)
+    df = generate_sales_data(products=20, months=3, compact=True)
+    path = save_dataframe(df, "sales", "excel")
+    assert path == "data/sales.xlsx"
+    assert len(pd.read_excel(path)) == len(df)
+
+    path = save_dataframe_batches(
+        iter_sales_data(products=20, months=3, batch_rows=25), "batches", "excel", max_rows=40
+    )
+    assert list(pd.read_excel(path, sheet_name=None)) == ["Sheet1", "Sheet1_2"]
+
+    with pytest.raises(ValueError):
+        ExcelSink(str(tmp_path / "bad.xlsx"), max_rows=2_000_000)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,75 @@
+"""
+测试 Feather 保存与内存映射读取
+"""
+
+import numpy as np
+import pytest
+
+from src.data import (
+    generate_sales_data,
+    generate_time_series_data,
+    iter_sales_data,
+    load_dataframe,
+    save_dataframe,
+    save_dataframe_batches,
+)
+from src.plot import PlotGenerator
+
+
+def test_feather_roundtrip(tmp_path, monkeypatch):
+    """测试 feather 保存后可完整读回（整表与分批、普通与紧凑类型）"""
+    print("测试 Feather 读写...")
+    monkeypatch.chdir(tmp_path)
+    for compact in (False, True):
+        df = generate_sales_data(products=200, months=12, compact=compact)
+        save_dataframe(df, "sales", "feather")
+        assert load_dataframe("sales").equals(df)
+
+        save_dataframe_batches(
+            iter_sales_data(products=200, months=12, batch_rows=500, compact=compact), "batches", "feather"
+        )
+        assert load_dataframe("batches").equals(df)
+        assert load_dataframe("batches", memory_map=False).equals(df)
+
+    save_dataframe(df, "zstd", "feather", compression="zstd")
+    assert load_dataframe("zstd").equals(df)
+    print("   ✓ Feather 内容一致")
+
+
+def test_memory_mapped_zero_copy(tmp_path, monkeypatch):
+    """测试列投影与零拷贝：数值列直接引用映射的文件内容"""
+    monkeypatch.chdir(tmp_path)
+    df = generate_time_series_data(days=5000, freq="h", compact=True)
+    save_dataframe(df, "series", "feather")
+
+    loaded = load_dataframe("series", columns=["date", "value"])
+    assert list(loaded.columns) == ["date", "value"]
+    for col in ("date", "value"):
+        values = loaded[col].to_numpy()
+        assert not values.flags.writeable and not values.flags.owndata
+    np.testing.assert_array_equal(loaded["value"].to_numpy(), df["value"].to_numpy())
+
+    # 绘图只读取数据，不会触发拷贝或写入只读数组
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = plotter.line_chart(loaded, x_col="date", y_cols=["value"], downsample="m4")
+    plotter.close_figure(fig)
+    fig = plotter.bar_chart(load_dataframe("series", columns=["region", "value"]), x_col="region", y_col="value")
+    plotter.close_figure(fig)
+
+    with pytest.raises(ValueError):
+        load_dataframe("series", format="excel")
+
+
+def test_load_other_formats(tmp_path, monkeypatch):
+    """测试 parquet、csv 的列投影读取"""
+    monkeypatch.chdir(tmp_path)
+    df = generate_sales_data(products=20, months=3)
+    for format in ("parquet", "csv"):
+        save_dataframe(df, "sales", format)
+        loaded = load_dataframe("sales", format=format, columns=["product", "sales"])
+        assert list(loaded.columns) == ["product", "sales"]
+        assert loaded["sales"].tolist() == df["sales"].tolist()
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
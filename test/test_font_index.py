@@ -0,0 +1,106 @@
+"""
+测试持久化字体索引
+"""
+
+import json
+import os
+
+import matplotlib as mpl
+import matplotlib.font_manager as fm
+
+from src import fonts
+from src.plot import PlotGenerator
+
+
+def _reset(monkeypatch, tmp_path):
+    """使用临时缓存目录并清空进程内缓存"""
+    monkeypatch.setenv(fonts.FONT_CACHE_DIR_ENV, str(tmp_path))
+    monkeypatch.setattr(fonts, "_RESOLVED", {})
+
+
+def test_index_persisted_and_reused(monkeypatch, tmp_path):
+    """测试首次解析写入磁盘索引，之后的进程不再遍历系统字体"""
+    print("测试字体索引复用...")
+    _reset(monkeypatch, tmp_path)
+    candidates = ["不存在的字体", "DejaVu Sans"]
+    assert fonts.resolve_chinese_font(candidates) == "DejaVu Sans"
+
+    with open(tmp_path / fonts.FONT_INDEX_FILENAME, encoding="utf-8") as f:
+        index = json.load(f)
+    assert index["key"] == fonts.font_index_key()
+    assert index["fonts"]["|".join(candidates)] == "DejaVu Sans"
+
+    # 模拟新进程：清空进程内缓存，且禁止访问 ttflist
+    class _NoScan:
+        def __iter__(self):
+            raise AssertionError("不应遍历系统字体")
+
+    monkeypatch.setattr(fonts, "_RESOLVED", {})
+    monkeypatch.setattr(fm.fontManager, "ttflist", _NoScan())
+    assert fonts.resolve_chinese_font(candidates) == "DejaVu Sans"
+    print("   ✓ 字体索引命中")
+
+
+def test_index_invalidated_by_key_change(monkeypatch, tmp_path):
+    """测试索引键变化（字体目录更新、matplotlib 升级）时重新解析"""
+    _reset(monkeypatch, tmp_path)
+    assert fonts.resolve_chinese_font(["DejaVu Sans"]) == "DejaVu Sans"
+
+    monkeypatch.setattr(fonts, "_RESOLVED", {})
+    monkeypatch.setattr(mpl, "__version__", "0.0.0")
+    scanned = []
+    original = fm.fontManager.ttflist
+    monkeypatch.setattr(fm.fontManager, "ttflist", _Recorder(original, scanned))
+    assert fonts.resolve_chinese_font(["DejaVu Sans"]) == "DejaVu Sans"
+    assert scanned
+
+
+def test_index_key_tracks_fontlist(monkeypatch, tmp_path):
+    """测试索引键只取决于 matplotlib 字体列表缓存文件，不遍历字体目录"""
+
+    def _no_walk(*args, **kwargs):
+        raise AssertionError("不应遍历字体目录")
+
+    fontlist = tmp_path / "fontlist.json"
+    fontlist.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(fonts, "_fontlist_path", lambda: str(fontlist))
+    monkeypatch.setattr(os, "walk", _no_walk)
+    key = fonts.font_index_key()
+    assert fonts.font_index_key() == key
+
+    # 字体列表重建（安装新字体后 matplotlib 重新扫描）时索引失效
+    stat = fontlist.stat()
+    os.utime(fontlist, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert fonts.font_index_key() != key
+
+
+class _Recorder(list):
+    """记录是否被遍历的字体列表"""
+
+    def __init__(self, items, log):
+        super().__init__(items)
+        self._log = log
+
+    def __iter__(self):
+        self._log.append(True)
+        return super().__iter__()
+
+
+def test_bundled_font_file(monkeypatch, tmp_path):
+    """测试指定字体文件时直接注册使用，不解析系统字体"""
+    _reset(monkeypatch, tmp_path)
+    font_path = os.path.join(mpl.get_data_path(), "fonts", "ttf", "DejaVuSerif.ttf")
+
+    def _fail(*args, **kwargs):
+        raise AssertionError("不应解析系统字体")
+
+    monkeypatch.setattr("src.plot.resolve_chinese_font", _fail)
+    plotter = PlotGenerator(use_pyplot=False, font_path=font_path)
+    assert plotter.rc_params["font.sans-serif"] == ["DejaVu Serif"]
+    assert not os.path.exists(tmp_path / fonts.FONT_INDEX_FILENAME)
+
+
+if __name__ == "__main__":
+    import pytest
+
+    raise SystemExit(pytest.main([__file__, "-q"]))
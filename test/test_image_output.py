@@ -0,0 +1,91 @@
+"""
+测试图片字节、data URI 与流式 base64 输出
+"""
+
+import base64
+import io
+import itertools
+
+import pandas as pd
+import pytest
+
+from src.encoding import Base64Writer, data_uri_prefix
+from src.plot import PlotGenerator
+
+
+def _line_figure(plotter):
+    df = pd.DataFrame({"x": range(30), "y": [i * i for i in range(30)]})
+    return plotter.line_chart(df, x_col="x", y_cols=["y"])
+
+
+class _Socket:
+    """只有 sendall 方法的类 socket 对象"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def sendall(self, data):
+        self.chunks.append(bytes(data))
+
+
+def test_outputs_consistent():
+    """测试各输出方式的图片内容一致"""
+    print("测试图片输出...")
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = _line_figure(plotter)
+    png = plotter.figure_to_bytes(fig, dpi=80)
+    assert png.startswith(b"\x89PNG")
+
+    view = plotter.figure_to_buffer(fig, dpi=80)
+    assert isinstance(view, memoryview) and view.readonly
+    assert view == png
+    assert base64.b64decode(plotter.figure_to_base64(fig, dpi=80)) == png
+
+    uri = plotter.figure_to_data_uri(fig, dpi=80)
+    assert uri.startswith("data:image/png;base64,")
+    assert base64.b64decode(uri.split(",", 1)[1]) == png
+
+    stream = io.BytesIO()
+    written = plotter.write_base64(fig, stream, dpi=80, data_uri=True)
+    assert stream.getvalue().decode("ascii") == uri
+    assert written == len(uri)
+
+    result = plotter.render("line_chart", pd.DataFrame({"x": range(30), "y": range(30)}), dpi=80)
+    assert result.to_data_uri() == "data:image/png;base64," + result.to_base64()
+    sock = _Socket()
+    assert result.write_base64(sock) == len(result.to_base64())
+    assert b"".join(sock.chunks).decode("ascii") == result.to_base64()
+    plotter.close_figure(fig)
+    print("   ✓ 输出一致")
+
+
+def test_streaming_vector_formats():
+    """测试 svg、pdf 流式编码（pdf 后端依赖 tell 记录偏移）"""
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = _line_figure(plotter)
+    for format in ("svg", "pdf"):
+        expected = plotter.figure_to_bytes(fig, format=format)
+        sock = _Socket()
+        plotter.write_base64(fig, sock, format=format)
+        assert base64.b64decode(b"".join(sock.chunks)) == expected
+    plotter.close_figure(fig)
+
+
+def test_base64_writer_chunks():
+    """测试任意大小的分块写入都得到标准 base64"""
+    data = bytes(range(256)) * 3000
+    stream = io.BytesIO()
+    sizes = itertools.cycle([1, 2, 3, 5, 7, 200_000])
+    with Base64Writer(stream, prefix=data_uri_prefix("jpg")) as writer:
+        start = 0
+        while start < len(data):
+            size = next(sizes)
+            writer.write(data[start : start + size])
+            start += size
+    assert stream.getvalue() == b"data:image/jpeg;base64," + base64.b64encode(data)
+    with pytest.raises(ValueError):
+        data_uri_prefix("bmp")
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,69 @@
+"""
+测试 src 包的延迟导入
+"""
+
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _run(code):
+    """在新进程中执行代码并返回标准输出"""
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "MPLBACKEND": "Agg"},
+    )
+    return proc.stdout.strip().splitlines()[-1]
+
+
+def test_import_src_is_lightweight():
+    """测试 import src 不加载 pandas、NumPy、matplotlib"""
+    print("测试延迟导入...")
+    loaded = _run(
+        "import sys, src; src.__version__; print([m for m in ('pandas', 'numpy', 'matplotlib') if m in sys.modules])"
+    )
+    assert loaded == "[]"
+
+    loaded = _run(
+        "import sys, src; src.generate_sales_data; print('matplotlib' in sys.modules, 'pandas' in sys.modules)"
+    )
+    assert loaded == "False True"
+    print("   ✓ 按需加载子模块")
+
+
+def test_lazy_attributes():
+    """测试公开名称可以正常访问，且与子模块中的对象相同"""
+    import src
+    from src.plot import PlotGenerator
+
+    assert src.PlotGenerator is PlotGenerator
+    assert set(src.__all__) <= set(dir(src))
+    try:
+        src.not_a_name  # noqa: B018
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("未知名称应抛出 AttributeError")
+
+
+def test_import_plot_keeps_rcparams():
+    """测试导入 src.plot 不修改全局 rcParams，创建 pyplot 模式生成器时才应用默认样式"""
+    code = (
+        "import matplotlib as mpl; mpl.rcParams['lines.linewidth'] = 7; import src.plot;"
+        "a = mpl.rcParams['lines.linewidth']; src.plot.PlotGenerator();"
+        "print(a, mpl.rcParams['lines.linewidth'])"
+    )
+    assert _run(code) == "7.0 1.5"
+
+
+if __name__ == "__main__":
+    test_import_src_is_lightweight()
+    test_lazy_attributes()
+    test_import_plot_keeps_rcparams()
+    print("\n所有测试完成！")
@@ -0,0 +1,81 @@
+"""
+测试折线图 LineCollection 绘制路径
+"""
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from matplotlib.collections import LineCollection
+
+from src.plot import PlotGenerator
+
+
+def _series_data(n_series=100, n_points=100):
+    """构造多系列时间序列宽表"""
+    rng = np.random.default_rng(42)
+    df = pd.DataFrame({"date": pd.date_range("2024-01-01", periods=n_points, freq="D")})
+    values = rng.normal(0, 1, size=(n_points, n_series)).cumsum(axis=0)
+    y_cols = [f"s{i:03d}" for i in range(n_series)]
+    return pd.concat([df, pd.DataFrame(values, columns=y_cols)], axis=1), y_cols
+
+
+def _render_rgba(fig):
+    """渲染为 RGBA 数组"""
+    fig.canvas.draw()
+    return np.asarray(fig.canvas.buffer_rgba()).astype(int)
+
+
+def test_collection_used_for_many_series():
+    """测试系列较多时自动使用单个 LineCollection"""
+    print("测试 100 系列自动使用 LineCollection...")
+    df, y_cols = _series_data()
+    plotter = PlotGenerator()
+    fig = plotter.line_chart(df, "date", y_cols, "100 系列")
+    ax = fig.axes[0]
+
+    collections = [c for c in ax.collections if isinstance(c, LineCollection)]
+    assert len(collections) == 1
+    assert len(collections[0].get_segments()) == 100
+    assert len(ax.lines) == 0
+    # 图例仍为均匀抽样的 10 项
+    idx = np.linspace(0, len(y_cols) - 1, 10, dtype=int)
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == [y_cols[i] for i in idx]
+    plt.close(fig)
+    print("   ✓ 使用单个 LineCollection")
+
+
+def test_collection_matches_plot():
+    """测试集合路径与逐系列 ax.plot 渲染一致"""
+    df, y_cols = _series_data(n_series=40, n_points=60)
+    plotter = PlotGenerator()
+    fig_plot = plotter.line_chart(df, "date", y_cols, fast_render=False)
+    fig_fast = plotter.line_chart(df, "date", y_cols, fast_render=True)
+
+    assert fig_fast.axes[0].get_xlim() == fig_plot.axes[0].get_xlim()
+    assert fig_fast.axes[0].get_ylim() == fig_plot.axes[0].get_ylim()
+    assert [t.get_text() for t in fig_fast.axes[0].get_xticklabels()] == [
+        t.get_text() for t in fig_plot.axes[0].get_xticklabels()
+    ]
+
+    diff = np.abs(_render_rgba(fig_fast) - _render_rgba(fig_plot))
+    assert (diff.max(axis=2) > 64).mean() < 0.01
+    plt.close(fig_plot)
+    plt.close(fig_fast)
+
+
+def test_collection_categorical_x():
+    """测试分类 X 轴与少量系列的集合路径"""
+    df = pd.DataFrame({"月份": ["一月", "二月", "三月"], "销售额": [1, 3, 2], "利润": [0.5, np.nan, 1.0]})
+    plotter = PlotGenerator()
+    fig = plotter.line_chart(df, "月份", ["销售额", "利润"], fast_render=True)
+    ax = fig.axes[0]
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == ["销售额", "利润"]
+    np.testing.assert_allclose(ax.collections[0].get_segments()[0][:, 0], [0, 1, 2])
+    plt.close(fig)
+
+
+if __name__ == "__main__":
+    test_collection_used_for_many_series()
+    test_collection_matches_plot()
+    test_collection_categorical_x()
+    print("\n所有测试完成！")
@@ -0,0 +1,91 @@
+"""
+测试一次绘制导出多种格式和分辨率
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.plot import PlotGenerator
+from src.raster import downscale_area
+
+
+def _line_figure(plotter):
+    df = pd.DataFrame({"x": range(30), "y": [i * i for i in range(30)]})
+    return plotter.line_chart(df, x_col="x", y_cols=["y"], title="多输出")
+
+
+def test_export_matches_savefig():
+    """测试最高分辨率与 savefig 逐字节一致，其余输出尺寸与 savefig 相差不超过 1 像素"""
+    print("测试多输出导出...")
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = _line_figure(plotter)
+    results = plotter.export(
+        fig,
+        {
+            "thumb": {"dpi": 40},
+            "full": {"dpi": 120},
+            "photo": {"format": "jpg", "dpi": 120},
+            "vector": {"format": "svg"},
+        },
+    )
+    assert results["full"].data == plotter.figure_to_bytes(fig, dpi=120)
+    for name, dpi in (("thumb", 40), ("photo", 120)):
+        reference = Image.open(io.BytesIO(plotter.figure_to_bytes(fig, format=results[name].format, dpi=dpi)))
+        image = Image.open(io.BytesIO(results[name].data))
+        assert image.size == (results[name].width, results[name].height)
+        # 边界框按最高分辨率测量，低分辨率下文字取整可能相差 1 像素
+        assert all(abs(a - b) <= 1 for a, b in zip(image.size, reference.size))
+    assert Image.open(io.BytesIO(results["photo"].data)).format == "JPEG"
+    assert results["vector"].data.startswith(b"<?xml") and results["vector"].width is None
+    assert results["full"].to_data_uri().startswith("data:image/png;base64,")
+
+    with pytest.raises(ValueError):
+        plotter.export(fig, {"bad": {"quality": 90}})
+    plotter.close_figure(fig)
+    print("   ✓ 输出一致")
+
+
+def test_export_draws_once(monkeypatch):
+    """测试 tight 边界框与位图只绘制一次，较低分辨率不重新绘制"""
+    plotter = PlotGenerator(use_pyplot=False)
+    fig = _line_figure(plotter)
+    draws = []
+    original_draw = fig.draw
+    monkeypatch.setattr(fig, "draw", lambda renderer: draws.append(renderer) or original_draw(renderer))
+
+    outputs = {f"png{dpi}": {"dpi": dpi} for dpi in (30, 60, 90, 120)}
+    outputs["vector"] = {"format": "svg"}
+    plotter.export(fig, outputs)
+    # 边界框 1 次 + 位图 1 次 + SVG 1 次；逐个 savefig 需要 2 × 5 次
+    assert len(draws) == 3
+
+    result = plotter.render_many("bar_chart", pd.DataFrame({"c": ["a", "b"], "v": [1, 2]}), "c", "v", outputs=outputs)
+    assert set(result) == set(outputs) and result["png30"].chart_type == "bar_chart"
+    plotter.close_figure(fig)
+
+
+def test_downscale_area():
+    """测试面积平均缩放：整数倍等于块均值，透明像素不使颜色变暗"""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, size=(60, 90, 4), dtype=np.uint8)
+    image[..., 3] = 255
+    expected = image.astype(float).reshape(20, 3, 30, 3, 4).mean(axis=(1, 3))
+    assert np.array_equal(downscale_area(image, 30, 20), np.rint(expected))
+
+    # 非整数倍缩放保持平均亮度
+    assert abs(downscale_area(image, 37, 23).mean() - image.mean()) < 1
+
+    transparent = np.zeros((4, 4, 4), dtype=np.uint8)
+    transparent[:, :2] = (255, 0, 0, 255)
+    half = downscale_area(transparent, 1, 1)[0, 0]
+    assert tuple(half) == (255, 0, 0, 128)
+    with pytest.raises(ValueError):
+        downscale_area(image, 100, 20)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,103 @@
+"""
+测试流式分区 Parquet 写入
+"""
+
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from src.data import generate_sales_data, iter_sales_data, save_dataframe, save_dataframe_batches
+from src.writers import ParquetSink
+
+
+def _read_sorted(path, **kwargs):
+    """读取并按产品、月份排序，便于与原数据比较"""
+    df = pd.read_parquet(path, **kwargs)
+    return df.sort_values(["product", "month"]).reset_index(drop=True)
+
+
+def test_partitioned_roundtrip(tmp_path):
+    """测试 hive 分区写出后可完整读回，并可按分区筛选"""
+    print("测试分区写入...")
+    expected = generate_sales_data(products=400, months=6)
+    root = str(tmp_path / "sales")
+    with ParquetSink(root, partition_cols=["region", "month"], row_group_size=500, max_workers=4) as sink:
+        for batch in iter_sales_data(products=400, months=6, batch_rows=700):
+            sink.write(batch)
+    assert sink.rows_written == len(expected)
+    assert len(sink.files) == 4 * 6
+    assert os.path.isdir(os.path.join(root, "region=North", "month=2024-01-31"))
+
+    result = _read_sorted(root)
+    result["region"] = result["region"].astype(object)
+    result["month"] = pd.to_datetime(result["month"].astype(str)).astype(expected["month"].dtype)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_like=True)
+
+    north = pd.read_parquet(root, filters=[("region", "=", "North")])
+    assert len(north) == (expected["region"] == "North").sum()
+    print("   ✓ 分区数据可完整读回")
+
+
+def test_row_groups_and_compression(tmp_path):
+    """测试行组大小与压缩算法"""
+    path = str(tmp_path / "sales.parquet")
+    with ParquetSink(path, row_group_size=1000, compression="zstd", compression_level=5) as sink:
+        for batch in iter_sales_data(products=250, months=12, batch_rows=333):
+            sink.write(batch)
+    metadata = pq.ParquetFile(path).metadata
+    assert metadata.num_rows == 3000
+    assert [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)] == [1000, 1000, 1000]
+    assert metadata.row_group(0).column(0).compression == "ZSTD"
+    assert _read_sorted(path).equals(generate_sales_data(products=250, months=12))
+
+    with pytest.raises(ValueError):
+        ParquetSink(path, compression="lzma")
+
+
+def test_pending_bytes_budget(tmp_path):
+    """测试分区多、行组大时，待写出数据超过上限后提前写出较小的行组"""
+    expected = generate_sales_data(products=2000, months=12)
+    root = str(tmp_path / "sales")
+    budget = 64 * 1024
+    with ParquetSink(
+        root, partition_cols=["region", "month"], row_group_size=250_000, max_pending_bytes=budget
+    ) as sink:
+        for batch in iter_sales_data(products=2000, months=12, batch_rows=2000):
+            sink.write(batch)
+            assert sink.pending_bytes <= budget
+        # 没有一个分区攒满行组，但数据已陆续写出
+        assert 0 < sink.rows_written < len(expected)
+    assert sink.rows_written == len(expected)
+    assert len(_read_sorted(root)) == len(expected)
+
+    # 不限制时与原先一样，关闭前不写出
+    with ParquetSink(
+        str(tmp_path / "unbounded"), partition_cols=["region", "month"], row_group_size=250_000, max_pending_bytes=None
+    ) as sink:
+        for batch in iter_sales_data(products=2000, months=12, batch_rows=2000):
+            sink.write(batch)
+        assert sink.rows_written == 0 and sink.pending_bytes > budget
+
+    with pytest.raises(ValueError):
+        ParquetSink(root, max_pending_bytes=0)
+
+
+def test_save_dataframe_parquet_options(tmp_path, monkeypatch):
+    """测试 save_dataframe / save_dataframe_batches 的 Parquet 参数"""
+    monkeypatch.chdir(tmp_path)
+    df = generate_sales_data(products=30, months=4, compact=True)
+    save_dataframe(df, "by_region", "parquet", partition_cols=["region"])
+    assert sorted(os.listdir("data/by_region.parquet")) == [f"region={r}" for r in sorted(df["region"].unique())]
+
+    path = save_dataframe_batches(
+        iter_sales_data(products=30, months=4, batch_rows=25), "plain", "parquet", compression="gzip"
+    )
+    assert len(pd.read_parquet(path)) == len(df)
+    with pytest.raises(ValueError):
+        save_dataframe(df, "bad", "csv", partition_cols=["region"])
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
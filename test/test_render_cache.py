@@ -0,0 +1,120 @@
+"""
+测试渲染缓存
+"""
+
+import matplotlib as mpl
+import numpy as np
+import pandas as pd
+
+import src.plot
+from src.plot import SVG_HASH_SALT, PlotGenerator
+from src.render_cache import RenderCache, fingerprint_data
+
+
+def _line_data(n=50, seed=0):
+    """构造折线图数据（含一列不参与绘图的备注）"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "day": np.arange(n),
+            "a": rng.normal(size=n).cumsum(),
+            "b": rng.normal(size=n).cumsum(),
+            "note": [f"n{i}" for i in range(n)],
+        }
+    )
+
+
+def test_fingerprint_uses_only_plotted_columns():
+    """测试指纹只依赖实际用到的列"""
+    df = _line_data()
+    changed = df.copy()
+    changed["note"] = "changed"
+    assert fingerprint_data(df, ["day", "a"]) == fingerprint_data(changed, ["day", "a"])
+    assert fingerprint_data(df) != fingerprint_data(changed)
+
+    changed.loc[3, "a"] += 1e-9
+    assert fingerprint_data(df, ["day", "a"]) != fingerprint_data(changed, ["day", "a"])
+    assert fingerprint_data({"A": 1, "B": 2}) != fingerprint_data({"A": 1, "B": 3})
+
+
+def test_render_cache_hits():
+    """测试相同数据和参数命中缓存、任一参数变化则重新渲染"""
+    print("测试渲染缓存命中...")
+    cache = RenderCache()
+    plotter = PlotGenerator(use_pyplot=False, render_cache=cache)
+    df = _line_data()
+
+    first = plotter.render("line_chart", df, x_col="day", y_cols=["a"], dpi=50)
+    second = plotter.render("line_chart", df.assign(note="x"), "day", ["a"], dpi=50)
+    assert second is first
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+    for kwargs in ({"dpi": 60}, {"format": "svg"}, {"title": "另一个标题"}, {"y_cols": ["a", "b"]}):
+        params = {"x_col": "day", "y_cols": ["a"], "dpi": 50, **kwargs}
+        assert plotter.render("line_chart", df, **params) is not first
+    assert cache.stats()["misses"] == 5
+
+    # 缓存内容与直接渲染的字节一致
+    uncached = PlotGenerator(use_pyplot=False).render("line_chart", df, x_col="day", y_cols=["a"], dpi=50)
+    assert uncached.data == first.data
+    print("   ✓ 缓存命中正确")
+
+
+def test_deterministic_vector_output():
+    """测试 SVG / PDF 输出字节稳定"""
+    plotter = PlotGenerator(use_pyplot=False)
+    data = {"A": 3, "B": 5, "C": 2}
+    for fmt in ("svg", "pdf"):
+        first = plotter.render("donut_chart", data, format=fmt)
+        second = plotter.render("donut_chart", data, format=fmt)
+        assert first.data == second.data
+
+
+def test_deterministic_svg_pyplot_mode(monkeypatch):
+    """测试 pyplot 模式下首次应用默认样式后 SVG 输出仍然稳定"""
+    monkeypatch.setattr(src.plot, "_default_style_applied", False)
+    with mpl.rc_context():
+        plotter = PlotGenerator()
+        assert mpl.rcParams["svg.hashsalt"] == SVG_HASH_SALT
+        first = plotter.render("donut_chart", {"A": 3, "B": 5, "C": 2}, format="svg")
+        second = plotter.render("donut_chart", {"A": 3, "B": 5, "C": 2}, format="svg")
+        assert first.data == second.data
+
+
+def test_memory_and_disk_eviction(tmp_path):
+    """测试内存按字节预算淘汰、磁盘二级缓存回填"""
+    df = _line_data()
+    probe = PlotGenerator(use_pyplot=False).render("line_chart", df, x_col="day", y_cols=["a"], dpi=40)
+    cache = RenderCache(max_bytes=int(probe.nbytes * 2.5), disk_dir=str(tmp_path), disk_max_bytes=10 * 1024 * 1024)
+    plotter = PlotGenerator(use_pyplot=False, render_cache=cache)
+
+    results = [plotter.render("line_chart", df, x_col="day", y_cols=["a"], title=f"T{i}", dpi=40) for i in range(4)]
+    stats = cache.stats()
+    assert stats["evictions"] >= 2
+    assert stats["memory_bytes"] <= cache.max_bytes
+    assert stats["disk_entries"] == 4
+
+    # 被内存淘汰的条目从磁盘读回
+    again = plotter.render("line_chart", df, x_col="day", y_cols=["a"], title="T0", dpi=40)
+    assert again.data == results[0].data
+    assert cache.stats()["disk_hits"] == 1
+
+    # 新实例从磁盘目录恢复索引；超出磁盘预算时淘汰最久未访问的文件
+    reopened = RenderCache(disk_dir=str(tmp_path), disk_max_bytes=int(probe.nbytes * 2.5))
+    assert reopened.stats()["disk_entries"] == 2
+    assert reopened.stats()["disk_evictions"] == 2
+
+
+if __name__ == "__main__":
+    import tempfile
+    from pathlib import Path
+
+    import pytest
+
+    test_fingerprint_uses_only_plotted_columns()
+    test_render_cache_hits()
+    test_deterministic_vector_output()
+    test_deterministic_svg_pyplot_mode(pytest.MonkeyPatch())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_memory_and_disk_eviction(Path(tmp_dir))
+    print("\n所有测试完成！")
@@ -0,0 +1,82 @@
+"""
+测试渲染结果对象与 Figure 生命周期管理
+"""
+
+import gc
+import weakref
+
+import matplotlib.pyplot as plt
+import pandas as pd
+
+from src.plot import PlotGenerator, RenderResult
+
+RENDERS = 20
+
+
+def _line_data():
+    """构造小型折线数据"""
+    return pd.DataFrame({"x": range(20), "销售额": range(20), "利润": range(0, 40, 2)})
+
+
+def test_render_result():
+    """测试 render 返回编码字节与元数据且不遗留 Figure"""
+    print("测试 render 结果对象...")
+    before = plt.get_fignums()
+    plotter = PlotGenerator()
+    result = plotter.render("line_chart", _line_data(), "x", ["销售额", "利润"], format="png", dpi=50)
+
+    assert isinstance(result, RenderResult)
+    assert result.data.startswith(b"\x89PNG")
+    assert result.nbytes == len(result.data)
+    assert result.width > 0 and result.height > 0
+    assert result.chart_type == "line_chart"
+    assert result.to_base64()
+    assert plt.get_fignums() == before
+    assert plotter.current_fig is None
+
+    svg = plotter.render("donut_chart", {"A": 1, "B": 2}, format="svg")
+    assert svg.width is None and svg.data.lstrip().startswith(b"<?xml")
+    print("   ✓ 渲染结果正常")
+
+
+def test_close_after_render_and_context():
+    """测试 close_after_render 与上下文管理器释放 Figure"""
+    before = plt.get_fignums()
+    plotter = PlotGenerator()
+
+    fig = plotter.line_chart(_line_data(), "x", ["销售额"])
+    plotter.figure_to_base64(fig, dpi=50, close_after_render=True)
+    assert plt.get_fignums() == before
+
+    with plotter.chart_context("donut_chart", {"A": 1, "B": 2}) as fig:
+        assert plt.fignum_exists(fig.number)
+    assert plt.get_fignums() == before
+
+
+def test_figures_released_after_render():
+    """测试 render 后 Figure 可被回收（tracemalloc 长时间压测见 test/soak_render_memory.py）"""
+    print("测试 Figure 释放...")
+    plotter = PlotGenerator(use_pyplot=False)
+    created = []
+    original = plotter._setup_figure
+
+    def tracking_setup(figsize=None):
+        fig, ax = original(figsize)
+        created.append(weakref.ref(fig))
+        return fig, ax
+
+    plotter._setup_figure = tracking_setup
+    for _ in range(RENDERS):
+        plotter.render("line_chart", _line_data(), "x", ["销售额"], dpi=30)
+    gc.collect()
+
+    assert len(created) == RENDERS
+    assert all(ref() is None for ref in created)
+    print("   ✓ Figure 已全部释放")
+
+
+if __name__ == "__main__":
+    test_render_result()
+    test_close_after_render_and_context()
+    test_figures_released_after_render()
+    print("\n所有测试完成！")
@@ -0,0 +1,78 @@
+"""
+测试渲染配置（thumbnail / web / retina / print）
+"""
+
+import base64
+import io
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from src.plot import RENDER_PROFILES, PlotGenerator, RenderProfile
+from src.render_cache import RenderCache
+
+
+def _data():
+    return pd.DataFrame({"x": range(30), "y": [i * i for i in range(30)]})
+
+
+def _open(data: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(data))
+
+
+def test_profiles_per_call():
+    """测试按名称选用配置：分辨率、格式、量化与压缩级别生效"""
+    print("测试渲染配置...")
+    plotter = PlotGenerator(use_pyplot=False, render_profiles={"email": RenderProfile(dpi=60, format="jpg")})
+    fig = plotter.line_chart(_data(), "x", ["y"])
+
+    web = _open(plotter.figure_to_bytes(fig, profile="web"))
+    assert web.mode == "P" and 600 < web.width <= 800
+    assert round(web.info["dpi"][0]) == RENDER_PROFILES["web"].dpi
+    thumbnail = _open(plotter.figure_to_bytes(fig, profile="thumbnail"))
+    assert thumbnail.mode == "P" and thumbnail.width < 300 and len(thumbnail.getcolors()) <= 64
+    assert plotter.figure_to_bytes(fig, profile="print") == plotter.figure_to_bytes(fig, dpi=300)
+
+    # 压缩级别只影响文件大小
+    fast = RenderProfile(dpi=80, compress_level=1)
+    small = RenderProfile(dpi=80, compress_level=9)
+    fast_png, small_png = plotter.figure_to_bytes(fig, profile=fast), plotter.figure_to_bytes(fig, profile=small)
+    assert len(small_png) < len(fast_png)
+    assert _open(small_png).tobytes() == _open(fast_png).tobytes()
+
+    uri = plotter.figure_to_data_uri(fig, profile="email")
+    assert uri.startswith("data:image/jpeg;base64,")
+    assert _open(base64.b64decode(uri.split(",", 1)[1])).format == "JPEG"
+    stream = io.BytesIO()
+    plotter.write_base64(fig, stream, profile="web")
+    assert base64.b64decode(stream.getvalue()) == plotter.figure_to_bytes(fig, profile="web")
+
+    with pytest.raises(ValueError):
+        plotter.figure_to_bytes(fig, profile="poster")
+    plotter.close_figure(fig)
+    print("   ✓ 配置生效")
+
+
+def test_profiles_in_render_and_export(tmp_path, monkeypatch):
+    """测试 render、save_figure、export 支持配置，缓存按配置区分"""
+    monkeypatch.chdir(tmp_path)
+    plotter = PlotGenerator(use_pyplot=False, render_cache=RenderCache())
+    web = plotter.render("line_chart", _data(), "x", ["y"], profile="web")
+    retina = plotter.render("line_chart", _data(), "x", ["y"], profile="retina")
+    assert (web.dpi, retina.dpi) == (80, 160) and retina.width > web.width
+    assert plotter.render("line_chart", _data(), "x", ["y"], profile="web") is web
+
+    fig = plotter.bar_chart(_data(), "x", "y")
+    path = plotter.save_figure(fig, "bars", profile="thumbnail")
+    assert path.endswith(".png") and _open(open(path, "rb").read()).mode == "P"
+
+    results = plotter.export(fig, {name: {"profile": name} for name in RENDER_PROFILES})
+    assert [results[name].dpi for name in RENDER_PROFILES] == [30, 80, 160, 300]
+    assert results["print"].data == plotter.figure_to_bytes(fig, profile="print")
+    assert _open(results["web"].data).mode == "P"
+    plotter.close_figure(fig)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,106 @@
+"""
+测试 CSV 与 JSON Lines 流式写入
+"""
+
+import gzip
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data import (
+    generate_customer_data,
+    generate_time_series_data,
+    iter_sales_data,
+    save_dataframe,
+    save_dataframe_batches,
+)
+from src.writers import CsvSink, JsonLinesSink
+
+
+def test_csv_matches_pandas(tmp_path):
+    """测试 Arrow CSV 写入读回后与 pandas to_csv 一致"""
+    print("测试 CSV 写入...")
+    for df in (
+        generate_customer_data(customers=500),
+        generate_time_series_data(days=200, freq="h", compact=True),
+        pd.DataFrame({"mixed": [1, "a,b", None], "when": pd.to_datetime(["2024-01-01", None, "2024-01-02"])}),
+    ):
+        expected_path = tmp_path / "expected.csv"
+        df.to_csv(expected_path, index=False, encoding="utf-8-sig")
+        path = str(tmp_path / "out.csv")
+        with CsvSink(path, chunk_rows=64, max_workers=3) as sink:
+            sink.write(df.iloc[:100])
+            sink.write(df.iloc[100:])
+        with open(path, "rb") as f:
+            assert f.read(3) == b"\xef\xbb\xbf"
+        assert pd.read_csv(path).equals(pd.read_csv(expected_path))
+    print("   ✓ CSV 内容一致")
+
+
+def test_compressed_outputs(tmp_path):
+    """测试 gzip / zstd 压缩：每块独立压缩，拼接后仍是合法文件"""
+    df = generate_customer_data(customers=1000)
+    path = str(tmp_path / "customers.csv.gz")
+    with CsvSink(path, compression="gzip", compression_level=9, chunk_rows=300, max_workers=2) as sink:
+        sink.write(df)
+    with gzip.open(path) as f:
+        assert pd.read_csv(f).equals(pd.read_csv(pd.io.common.StringIO(df.to_csv(index=False))))
+
+    path = str(tmp_path / "customers.jsonl.zst")
+    with JsonLinesSink(path, compression="zstd", chunk_rows=300) as sink:
+        sink.write(df)
+    with pa.CompressedInputStream(pa.OSFile(path), "zstd") as f:
+        lines = f.read().decode("utf-8").splitlines()
+    assert len(lines) == len(df)
+    assert (
+        pd.read_json(pd.io.common.StringIO("\n".join(lines)), lines=True)["customer_id"].tolist()
+        == df["customer_id"].tolist()
+    )
+
+    with pytest.raises(ValueError):
+        CsvSink(str(tmp_path / "bad.csv"), compression="snappy")
+
+
+def test_save_dataframe_text_options(tmp_path, monkeypatch):
+    """测试 save_dataframe / save_dataframe_batches 的压缩参数与 jsonl 格式"""
+    monkeypatch.chdir(tmp_path)
+    expected = pd.concat(iter_sales_data(products=40, months=6), ignore_index=True)
+
+    path = save_dataframe_batches(
+        iter_sales_data(products=40, months=6, batch_rows=50), "sales", "csv", compression="gzip"
+    )
+    assert path == "data/sales.csv.gz"
+    assert len(pd.read_csv(path)) == len(expected)
+
+    path = save_dataframe(expected, "sales", "jsonl", compression="gzip")
+    assert path == "data/sales.jsonl.gz"
+    assert len(pd.read_json(path, lines=True)) == len(expected)
+
+    with pytest.raises(ValueError):
+        save_dataframe(expected, "sales", "json", compression="gzip")
+
+
+def test_save_dataframe_default_csv(tmp_path, monkeypatch):
+    """测试不指定参数时 csv 仍使用 pandas 输出，整表与分批保存的内容一致"""
+    monkeypatch.chdir(tmp_path)
+    df = pd.DataFrame(
+        {
+            "名称": ["甲", "乙"],
+            "启用": [True, False],
+            "时间": [pd.Timestamp("2024-01-01 10:00:00.5"), pd.Timestamp("2024-01-02")],
+        }
+    )
+    path = save_dataframe(df, "plain", "csv")
+    with open(path, encoding="utf-8-sig") as f:
+        text = f.read()
+    assert text == df.to_csv(index=False)
+    assert "True" in text and "10:00:00.500" in text and '"' not in text
+
+    path = save_dataframe_batches([df, df], "plain_batches", "csv")
+    with open(path, encoding="utf-8-sig") as f:
+        assert f.read() == pd.concat([df, df]).to_csv(index=False)
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-q"]))
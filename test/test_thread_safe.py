@@ -0,0 +1,111 @@
+"""
+测试不经过 pyplot 的多线程并发渲染
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import matplotlib as mpl
+import matplotlib.pyplot as plt
+import pandas as pd
+import pytest
+
+from src.data import generate_sales_data, generate_time_series_data
+from src.plot import PlotGenerator
+
+N_THREADS = 8
+ROUNDS = 4
+
+
+def _chart_specs():
+    """构造覆盖三种图表的渲染任务"""
+    ts_data = generate_time_series_data(days=60)
+    sales_data = generate_sales_data(products=8, months=4)
+    sales_data["月份"] = sales_data["month"].dt.strftime("%Y-%m")
+    return [
+        ("donut_chart", (sales_data["category"].value_counts(), "品类占比"), {}),
+        ("line_chart", (ts_data, "date", ["value"], "时间序列趋势"), {}),
+        ("bar_chart", (sales_data,), {"x_col": "月份", "y_col": "sales", "group_col": "region", "title": "分组"}),
+        ("bar_chart", (sales_data,), {"x_col": "月份", "y_col": "sales", "stack_col": "category", "title": "堆叠"}),
+    ]
+
+
+def _render(plotter, spec):
+    """渲染单个任务为 PNG base64"""
+    chart, args, kwargs = spec
+    fig = getattr(plotter, chart)(*args, **kwargs)
+    return plotter.figure_to_base64(fig, dpi=72)
+
+
+def test_pyplot_free_figures():
+    """测试非 pyplot 模式不注册图形、不修改全局 rcParams"""
+    print("测试非 pyplot 模式...")
+    before_figs = plt.get_fignums()
+    before_rc = dict(mpl.rcParams)
+
+    plotter = PlotGenerator(use_pyplot=False)
+    for spec in _chart_specs():
+        assert _render(plotter, spec)
+
+    assert plt.get_fignums() == before_figs
+    assert dict(mpl.rcParams) == before_rc
+    print("   ✓ 未注册 pyplot 图形，全局 rcParams 未改变")
+
+
+def test_threaded_render_matches_serial():
+    """测试多线程并发渲染结果与串行渲染逐字节一致"""
+    print(f"测试 {N_THREADS} 线程并发渲染...")
+    plotter = PlotGenerator(use_pyplot=False)
+    specs = _chart_specs()
+    serial = [_render(plotter, spec) for spec in specs]
+
+    tasks = [i % len(specs) for i in range(len(specs) * ROUNDS * 2)]
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        results = list(executor.map(lambda i: _render(plotter, specs[i]), tasks))
+
+    for i, result in zip(tasks, results):
+        assert result == serial[i]
+    print(f"   ✓ {len(tasks)} 次并发渲染结果一致")
+
+
+def test_threaded_generators_with_different_rc():
+    """测试不同 rcParams 的生成器并发渲染互不干扰"""
+    plain = PlotGenerator(use_pyplot=False)
+    styled = PlotGenerator(use_pyplot=False, rc_params={"axes.linewidth": 3.0})
+
+    data = pd.DataFrame({"x": range(10), "y": range(10)})
+    expected = {id(p): p.figure_to_base64(p.line_chart(data, "x", ["y"]), dpi=50) for p in (plain, styled)}
+    assert expected[id(plain)] != expected[id(styled)]
+
+    plotters = [plain, styled] * (N_THREADS * 2)
+    with ThreadPoolExecutor(max_workers=N_THREADS) as executor:
+        results = list(executor.map(lambda p: p.figure_to_base64(p.line_chart(data, "x", ["y"]), dpi=50), plotters))
+    for plotter, result in zip(plotters, results):
+        assert result == expected[id(plotter)]
+
+
+def test_nested_generators_with_different_rc():
+    """测试在一个生成器的渲染过程中调用 rcParams 不同的生成器时报错，而不是死锁"""
+    outer = PlotGenerator(use_pyplot=False)
+    inner = PlotGenerator(use_pyplot=False, rc_params={"axes.linewidth": 3.0})
+    same = PlotGenerator(use_pyplot=False)
+    data = pd.DataFrame({"x": range(10), "y": range(10)})
+
+    def nested(plotter):
+        with outer._render_context():
+            return plotter.line_chart(data, "x", ["y"])
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # 参数相同的生成器可以嵌套
+        same.close_figure(executor.submit(nested, same).result(timeout=60))
+        with pytest.raises(RuntimeError):
+            executor.submit(nested, inner).result(timeout=60)
+        # 报错后上下文已退出，其他参数集合仍可使用
+        inner.close_figure(executor.submit(inner.line_chart, data, "x", ["y"]).result(timeout=60))
+
+
+if __name__ == "__main__":
+    test_pyplot_free_figures()
+    test_threaded_render_matches_serial()
+    test_threaded_generators_with_different_rc()
+    test_nested_generators_with_different_rc()
+    print("\n所有测试完成！")